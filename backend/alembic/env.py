@@ -21,6 +21,8 @@ from app.models.evaluation import Evaluation  # noqa: F401
 from app.models.investment_strategy import InvestmentStrategy  # noqa: F401
 from app.models.key_point import KeyPoint  # noqa: F401
 from app.models.paper_trade import PaperAccount, PaperHolding, PaperTrade  # noqa: F401
+from app.models.stock_score import StockScore, LatestStockScore  # noqa: F401
+from app.models.scoring_run import ScoringRun  # noqa: F401
 
 # Set target metadata
 target_metadata = Base.metadata
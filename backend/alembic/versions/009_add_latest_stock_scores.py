@@ -0,0 +1,61 @@
+"""add latest_stock_scores table
+
+Revision ID: 009_add_latest_stock_scores
+Revises: 008_add_paper_trade
+Create Date: 2026-10-19 00:00:00.000000
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '009_add_latest_stock_scores'
+down_revision: Union[str, None] = '008_add_paper_trade'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = (
+    'id, symbol, name, sector, scored_at, total_score, rating, fundamental_score, '
+    'technical_score, kurotenko_score, kurotenko_criteria, per, pbr, roe, dividend_yield, '
+    'revenue_growth, ma_score, rsi_score, macd_score, close_price, data_quality'
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'latest_stock_scores',
+        sa.Column('symbol', sa.String(length=10), nullable=False, comment='銘柄コード'),
+        sa.Column('id', sa.Integer(), nullable=False, comment='元の stock_scores.id'),
+        sa.Column('name', sa.String(length=100), nullable=True, comment='銘柄名'),
+        sa.Column('sector', sa.String(length=100), nullable=True, comment='セクター'),
+        sa.Column('scored_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('total_score', sa.Float(), nullable=True),
+        sa.Column('rating', sa.String(length=20), nullable=True),
+        sa.Column('fundamental_score', sa.Float(), nullable=True),
+        sa.Column('technical_score', sa.Float(), nullable=True),
+        sa.Column('kurotenko_score', sa.Float(), nullable=True),
+        sa.Column('kurotenko_criteria', sa.JSON(), nullable=True),
+        sa.Column('per', sa.Float(), nullable=True),
+        sa.Column('pbr', sa.Float(), nullable=True),
+        sa.Column('roe', sa.Float(), nullable=True),
+        sa.Column('dividend_yield', sa.Float(), nullable=True),
+        sa.Column('revenue_growth', sa.Float(), nullable=True),
+        sa.Column('ma_score', sa.Float(), nullable=True),
+        sa.Column('rsi_score', sa.Float(), nullable=True),
+        sa.Column('macd_score', sa.Float(), nullable=True),
+        sa.Column('close_price', sa.Float(), nullable=True, comment='終値（バッチ取得時点）'),
+        sa.Column('data_quality', sa.String(length=20), nullable=False, server_default='ok'),
+        sa.PrimaryKeyConstraint('symbol'),
+    )
+    # 既存履歴から銘柄ごとの最新行を移す
+    op.execute(
+        f"""
+        INSERT INTO latest_stock_scores ({_COLUMNS})
+        SELECT DISTINCT ON (symbol) {_COLUMNS}
+        FROM stock_scores
+        ORDER BY symbol, scored_at DESC, id DESC
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('latest_stock_scores')
@@ -0,0 +1,95 @@
+"""partition stock_scores by scored_at month
+
+Revision ID: 010_partition_stock_scores
+Revises: 009_add_latest_stock_scores
+Create Date: 2026-10-19 00:00:00.000000
+
+stock_scores を scored_at の月単位で RANGE パーティション化し、
+(symbol, scored_at DESC) の複合インデックスと、有効データのみの部分インデックスを張る。
+パーティションの PK は分割キーを含む必要があるため (id, scored_at) になる。
+以降の月のパーティションはバッチ / 保持ジョブが
+`score_retention_service.ensure_partitions` で先行作成する。
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '010_partition_stock_scores'
+down_revision: Union[str, None] = '009_add_latest_stock_scores'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 2
+VALID_QUALITY_PREDICATE = "data_quality NOT IN ('fetch_error', 'missing_tv')"
+
+
+def _add_months(d: date, months: int) -> date:
+    y, m = divmod(d.month - 1 + months, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def _create_partition(month: date) -> None:
+    nxt = _add_months(month, 1)
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS stock_scores_y{month:%Y}m{month:%m} "
+        f"PARTITION OF stock_scores "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{nxt.isoformat()} 00:00:00+00')"
+    )
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    op.execute("ALTER TABLE stock_scores RENAME TO stock_scores_legacy")
+    op.execute("ALTER TABLE stock_scores_legacy RENAME CONSTRAINT stock_scores_pkey TO stock_scores_legacy_pkey")
+    op.execute("ALTER INDEX ix_stock_scores_symbol RENAME TO ix_stock_scores_legacy_symbol")
+    op.execute(
+        """
+        CREATE TABLE stock_scores (
+            LIKE stock_scores_legacy INCLUDING DEFAULTS INCLUDING COMMENTS,
+            PRIMARY KEY (id, scored_at)
+        ) PARTITION BY RANGE (scored_at)
+        """
+    )
+
+    oldest = conn.execute(sa.text("SELECT min(scored_at) FROM stock_scores_legacy")).scalar()
+    today = datetime.now(timezone.utc).date().replace(day=1)
+    month = (oldest.astimezone(timezone.utc).date().replace(day=1) if oldest else today)
+    while month <= _add_months(today, MONTHS_AHEAD):
+        _create_partition(month)
+        month = _add_months(month, 1)
+
+    op.execute("INSERT INTO stock_scores SELECT * FROM stock_scores_legacy")
+    op.execute("ALTER SEQUENCE stock_scores_id_seq OWNED BY stock_scores.id")
+    op.execute("DROP TABLE stock_scores_legacy")
+
+    # 親テーブルに作成すると全パーティション（今後作られるものも含む）に伝播する
+    op.execute(
+        "CREATE INDEX ix_stock_scores_symbol_scored_at "
+        "ON stock_scores (symbol, scored_at DESC)"
+    )
+    op.execute(
+        "CREATE INDEX ix_stock_scores_valid_symbol_scored_at "
+        f"ON stock_scores (symbol, scored_at DESC) WHERE {VALID_QUALITY_PREDICATE}"
+    )
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE stock_scores RENAME TO stock_scores_partitioned")
+    op.execute(
+        "ALTER TABLE stock_scores_partitioned RENAME CONSTRAINT stock_scores_pkey TO stock_scores_partitioned_pkey"
+    )
+    op.execute("DROP INDEX ix_stock_scores_symbol_scored_at")
+    op.execute("DROP INDEX ix_stock_scores_valid_symbol_scored_at")
+    op.execute(
+        """
+        CREATE TABLE stock_scores (
+            LIKE stock_scores_partitioned INCLUDING DEFAULTS INCLUDING COMMENTS,
+            PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute("INSERT INTO stock_scores SELECT * FROM stock_scores_partitioned")
+    op.execute("ALTER SEQUENCE stock_scores_id_seq OWNED BY stock_scores.id")
+    op.execute("DROP TABLE stock_scores_partitioned CASCADE")
+    op.create_index('ix_stock_scores_symbol', 'stock_scores', ['symbol'], unique=False)
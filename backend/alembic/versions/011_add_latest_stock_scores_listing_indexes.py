@@ -0,0 +1,38 @@
+"""add listing indexes to latest_stock_scores
+
+Revision ID: 011_latest_scores_listing_idx
+Revises: 010_partition_stock_scores
+Create Date: 2026-10-19 00:00:00.000000
+
+GET /api/v1/scores のキーセットページング（sort_col DESC, symbol ASC）と
+サーバー側フィルタ用のインデックス。ソート軸ごとに、一覧が読む行
+（有効データかつソート値が NULL でない）だけを持つ部分インデックスにする。
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = '011_latest_scores_listing_idx'
+down_revision: Union[str, None] = '010_partition_stock_scores'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SORT_COLUMNS = ('total_score', 'fundamental_score', 'technical_score', 'kurotenko_score')
+VALID_QUALITY_PREDICATE = "data_quality NOT IN ('fetch_error', 'missing_tv')"
+
+
+def upgrade() -> None:
+    for col in SORT_COLUMNS:
+        op.execute(
+            f"CREATE INDEX ix_latest_stock_scores_{col}_symbol "
+            f"ON latest_stock_scores ({col} DESC, symbol) "
+            f"WHERE {VALID_QUALITY_PREDICATE} AND {col} IS NOT NULL"
+        )
+    op.create_index('ix_latest_stock_scores_sector', 'latest_stock_scores', ['sector'])
+    op.create_index('ix_latest_stock_scores_rating', 'latest_stock_scores', ['rating'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_latest_stock_scores_rating', table_name='latest_stock_scores')
+    op.drop_index('ix_latest_stock_scores_sector', table_name='latest_stock_scores')
+    for col in SORT_COLUMNS:
+        op.execute(f"DROP INDEX ix_latest_stock_scores_{col}_symbol")
@@ -0,0 +1,63 @@
+"""add scoring_runs and run_id generations
+
+Revision ID: 012_add_scoring_runs
+Revises: 011_latest_scores_listing_idx
+Create Date: 2026-10-19 00:00:00.000000
+
+バッチ実行ごとの世代テーブル scoring_runs と、stock_scores / latest_stock_scores の
+run_id 列を追加する。既存の latest_stock_scores の内容は source='legacy' の
+公開済み世代として登録する（履歴側の既存行は run_id NULL のまま）。
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '012_add_scoring_runs'
+down_revision: Union[str, None] = '011_latest_scores_listing_idx'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scoring_runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('source', sa.String(length=20), nullable=False, comment='SCORING_DATA_SOURCE'),
+        sa.Column('status', sa.String(length=20), nullable=False, comment='running/published/superseded/failed'),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('published_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=True, comment='対象銘柄数'),
+        sa.Column('processed', sa.Integer(), nullable=True, comment='成功数（再開時はスキップ分を含む）'),
+        sa.Column('failed', sa.Integer(), nullable=True, comment='失敗数'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'uq_scoring_runs_published', 'scoring_runs', ['status'],
+        unique=True, postgresql_where=sa.text("status = 'published'"),
+    )
+
+    op.add_column('stock_scores', sa.Column('run_id', sa.Integer(), nullable=True, comment='scoring_runs.id'))
+    op.add_column('latest_stock_scores', sa.Column('run_id', sa.Integer(), nullable=True, comment='scoring_runs.id'))
+    # 親テーブルに作成すると全パーティションに伝播する
+    op.create_index('ix_stock_scores_run_id_symbol', 'stock_scores', ['run_id', 'symbol'])
+
+    op.execute(
+        """
+        WITH legacy AS (
+            INSERT INTO scoring_runs (source, status, started_at, published_at, total)
+            SELECT 'legacy', 'published', min(scored_at), now(), count(*)
+            FROM latest_stock_scores
+            HAVING count(*) > 0
+            RETURNING id
+        )
+        UPDATE latest_stock_scores SET run_id = legacy.id FROM legacy
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_scores_run_id_symbol', table_name='stock_scores')
+    op.drop_column('latest_stock_scores', 'run_id')
+    op.drop_column('stock_scores', 'run_id')
+    op.drop_index('uq_scoring_runs_published', table_name='scoring_runs')
+    op.drop_table('scoring_runs')
@@ -0,0 +1,129 @@
+"""MACD の逐次（インクリメンタル）計算 - screener モードのクロス検出用
+
+TV Screener の断面値では「直近3本でのクロス」を判定できないため、銘柄ごとに
+小さな状態（EMA 値・直近の MACD/Signal ペア）を保持し、日次 snapshot の `close` を
+1 本ずつ畳み込んで `technical._calc_macd_state` と同じ判定を再現する。
+
+EMA の漸化式は `ta.trend.MACD`（`ewm(span, adjust=False, min_periods=span)`）と
+完全に一致させている:
+    - EMA12/EMA26 は最初の終値をシードに 1 本目から更新
+    - MACD は 26 本目から有効、Signal は最初の有効 MACD をシードに 34 本目から有効
+    - 判定は 35 本以上蓄積してから（`_calc_macd_state` の len < 35 ガードと同じ）
+
+状態は JSON 化可能な dict で、1 本あたり O(1) で更新できる。
+
+判定が hybrid（約 1 年分の history から再計算）と一致するのは、状態を同じ history から
+`seed_from_closes` で作った場合だけ。空の状態から積み始めると EMA の初期値が違う
+（最初に積んだ close）ため、しばらく値がずれ、MIN_BARS 本たまるまではフラグ自体が None になる。
+バッチは初めて見る銘柄・途切れた状態を stock_prices から seed する（scoring_service）。
+"""
+from __future__ import annotations
+
+from typing import Any, Iterable, Optional
+
+FAST = 12
+SLOW = 26
+SIGNAL = 9
+MIN_BARS = 35  # technical._calc_macd_state と同じ最低本数
+_PAIR_WINDOW = 4  # 直近3本のクロス判定に必要な (macd, signal) の本数
+
+_ALPHA_FAST = 2.0 / (FAST + 1)
+_ALPHA_SLOW = 2.0 / (SLOW + 1)
+_ALPHA_SIGNAL = 2.0 / (SIGNAL + 1)
+
+
+def new_state() -> dict[str, Any]:
+    """空の状態を返す。"""
+    return {
+        "n": 0,
+        "ema_fast": None,
+        "ema_slow": None,
+        "signal": None,
+        "pairs": [],
+        "as_of": None,
+        "prev": None,
+    }
+
+
+def advance(state: dict[str, Any], close: float) -> dict[str, Any]:
+    """終値 1 本を畳み込んだ新しい状態を返す（引数の state は変更しない）。"""
+    n = state["n"] + 1
+    if state["ema_fast"] is None:
+        ema_fast = ema_slow = close
+    else:
+        ema_fast = state["ema_fast"] + _ALPHA_FAST * (close - state["ema_fast"])
+        ema_slow = state["ema_slow"] + _ALPHA_SLOW * (close - state["ema_slow"])
+
+    signal = state["signal"]
+    pairs = list(state["pairs"])
+    if n >= SLOW:
+        macd = ema_fast - ema_slow
+        signal = macd if signal is None else signal + _ALPHA_SIGNAL * (macd - signal)
+        if n >= SLOW + SIGNAL - 1:
+            pairs.append([macd, signal])
+            pairs = pairs[-_PAIR_WINDOW:]
+
+    return {
+        **state,
+        "n": n,
+        "ema_fast": ema_fast,
+        "ema_slow": ema_slow,
+        "signal": signal,
+        "pairs": pairs,
+    }
+
+
+def seed_from_closes(closes: Iterable[float], as_of: Optional[str] = None) -> dict[str, Any]:
+    """終値系列（古い順）から状態を組み立てる。yfinance 履歴 / stock_prices からの初期化用。"""
+    state = new_state()
+    for close in closes:
+        if close is None or close != close:  # None/NaN はスキップ
+            continue
+        state = advance(state, float(close))
+    state["as_of"] = as_of
+    return state
+
+
+def update_for_day(state: Optional[dict[str, Any]], close: Optional[float], day: str) -> Optional[dict[str, Any]]:
+    """日付 `day` の終値で状態を更新する。
+
+    同じ日に再実行された場合は前日時点の状態（`prev`）からやり直すため、
+    バッチを何度回しても 1 日 1 本しか積まれない。close が None なら更新しない。
+    """
+    if close is None:
+        return state
+    if state is None:
+        state = new_state()
+    if state.get("as_of") == day:
+        prev = state.get("prev")
+        if prev is None:
+            # prev を持たない同日状態（seed 直後など）はすでに当日分を含む
+            return state
+        base = prev
+    else:
+        base = state
+    updated = advance(base, float(close))
+    updated["as_of"] = day
+    updated["prev"] = {k: v for k, v in base.items() if k != "prev"}
+    return updated
+
+
+def macd_flags(state: Optional[dict[str, Any]]) -> Optional[tuple[bool, bool]]:
+    """(recent_cross, macd_above) を返す。蓄積本数が足りなければ None。
+
+    判定ロジックは `technical._calc_macd_state` と同一。
+    """
+    if state is None or state["n"] < MIN_BARS or not state["pairs"]:
+        return None
+    pairs = state["pairs"]
+    macd_above = pairs[-1][0] > pairs[-1][1]
+    recent_cross = False
+    for i in range(1, 4):
+        if i + 1 > len(pairs):
+            break
+        cur_macd, cur_signal = pairs[-i]
+        prev_macd, prev_signal = pairs[-(i + 1)]
+        if cur_macd > cur_signal and prev_macd <= prev_signal:
+            recent_cross = True
+            break
+    return recent_cross, macd_above
@@ -12,6 +12,9 @@
     - None         → +3 （現行: default=3）
   トレードオフ: クロスタイミングのボーナス/ペナルティが消えるが、
   多数派（非クロス）の挙動を保存することで score 分布シフトを最小化。
+- ただし `macd_flags`（`macd_incremental.macd_flags` の出力）を渡した場合は、
+  ローカルに蓄積した終値から求めたクロス判定で現行 `score_macd` と同一の
+  15/8/0/3 を返す（最大 50 に復帰）。
 """
 from __future__ import annotations
 
@@ -55,21 +58,38 @@ def score_macd_from_tv(macd: float | None, signal: float | None) -> int:
     return 3
 
 
-def calc_technical_score_from_tv(features: dict[str, Any]) -> dict[str, Any]:
+def score_macd_with_cross(recent_cross: bool, macd_above: bool) -> int:
+    """technical.score_macd と同じ閾値（ta を import しないよう本モジュールに複製）。"""
+    if recent_cross and macd_above:
+        return 15
+    if not recent_cross and macd_above:
+        return 8
+    if recent_cross and not macd_above:
+        return 0
+    return 3
+
+
+def calc_technical_score_from_tv(
+    features: dict[str, Any],
+    macd_flags: tuple[bool, bool] | None = None,
+) -> dict[str, Any]:
     """TV 断面フィーチャーから technical_score を算出。
 
     Args:
         features: tv_screener_adapter.tv_row_to_technical_features の出力
+        macd_flags: (recent_cross, macd_above)。ローカル蓄積が足りない銘柄は None
     Returns:
-        {technical_score (0-43), ma_score, rsi_score, macd_score}
+        {technical_score (0-50), ma_score, rsi_score, macd_score}
 
-        ※ 現行 calc_technical_score の最大値は 50 だが、本関数は MACD の
-          クロスボーナスを落とすため実質最大 20+15+8=43。
-          合計範囲が狭まる影響は Phase 1 差分検証で合格ライン確認する。
+        ※ macd_flags が None の場合は MACD のクロスボーナスを落とすため
+          実質最大 20+15+8=43。
     """
     ma_s = score_ma_from_tv(features.get("close"), features.get("sma25"), features.get("sma75"))
     rsi_s = score_rsi_from_tv(features.get("rsi"))
-    macd_s = score_macd_from_tv(features.get("macd"), features.get("macd_signal"))
+    if macd_flags is not None:
+        macd_s = score_macd_with_cross(*macd_flags)
+    else:
+        macd_s = score_macd_from_tv(features.get("macd"), features.get("macd_signal"))
     return {
         "technical_score": float(ma_s + rsi_s + macd_s),
         "ma_score": float(ma_s),
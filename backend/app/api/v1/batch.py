@@ -12,7 +12,6 @@ GCP_PROJECT_ID が未設定のローカル開発では、同プロセス内で
 import asyncio
 import logging
 
-import requests
 from fastapi import APIRouter, HTTPException
 
 from app.core.config import settings
@@ -38,6 +37,8 @@ def _trigger_cloud_run_job() -> dict:
     サービスアカウント `1061707373577-compute@...` に `roles/run.invoker` を
     付与しておけば追加設定なしで起動できる。
     """
+    import requests
+
     try:
         from google.auth import default as google_auth_default
         from google.auth.transport.requests import Request as GoogleAuthRequest
@@ -1,13 +1,16 @@
-"""ChartAnalysis API routes"""
+"""ChartAnalysis API routes
+
+ChartAnalysisService（pandas / pandas_ta）はハンドラ内で import する（起動時に読み込まない）。
+"""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 from typing import Optional
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.models.chart_analysis import ChartAnalysis
 from app.schemas.chart_analysis import ChartAnalysisCreate, ChartAnalysisResponse
-from app.services.chart_analysis_service import ChartAnalysisService
+from app.services.analysis_axes_service import invalidate_axes_cache
 
 router = APIRouter()
 
@@ -19,15 +22,24 @@ router = APIRouter()
 )
 async def generate_chart_analysis(
     symbol: str,
-    timeframe: str = Query("1D", description="時間足（現状は 1D 固定）"),
+    timeframe: str = Query("1D", description="時間足（1D / 1W / 1M）"),
     db: AsyncSession = Depends(get_db),
 ):
     """
     指標計算 + ヒューリスティックで分析を自動生成し保存する。
 
+    週足・月足はキャッシュ済みの日足から集約するため、追加の外部取得は発生しない。
+
     - **symbol**: 銘柄コード（例: 7203）
-    - **timeframe**: 時間足（デフォルト 1D）
+    - **timeframe**: 時間足（1D / 1W / 1M、デフォルト 1D）
     """
+    from app.services.chart_analysis_service import ChartAnalysisService, TIMEFRAME_LABELS
+
+    if timeframe not in TIMEFRAME_LABELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"timeframe must be one of {sorted(TIMEFRAME_LABELS)}",
+        )
     service = ChartAnalysisService(db)
     try:
         return await service.generate_and_save(symbol, timeframe)
@@ -61,6 +73,7 @@ async def create_chart_analysis(
     db.add(analysis)
     await db.commit()
     await db.refresh(analysis)
+    await invalidate_axes_cache([analysis.symbol])
     return analysis
 
 
@@ -68,7 +81,7 @@ async def create_chart_analysis(
 async def get_latest_chart_analysis(
     symbol: str,
     timeframe: Optional[str] = Query(None, description="時間足でフィルタ"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     銘柄の最新チャート分析を取得
@@ -97,7 +110,7 @@ async def list_chart_analyses(
     symbol: str,
     timeframe: Optional[str] = Query(None, description="時間足でフィルタ"),
     limit: int = Query(20, ge=1, le=100, description="取得件数"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     銘柄のチャート分析履歴を取得
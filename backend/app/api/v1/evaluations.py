@@ -1,10 +1,12 @@
-"""Evaluation API routes"""
+"""Evaluation API routes
+
+EvaluationService（pandas / pandas_ta）はハンドラ内で import する（起動時に読み込まない）。
+"""
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from app.core.database import get_db
-from app.services.evaluation_service import EvaluationService
 from app.schemas.evaluation import EvaluationResult
 from app.core.exceptions import StockNotFoundError
 
@@ -23,6 +25,8 @@ async def create_evaluation(
     - **stock_code**: 銘柄コード（例: 7203）
     - **period**: 評価期間（1d, 1w, 1m, 3m, 6m, 1y）
     """
+    from app.services.evaluation_service import EvaluationService
+
     service = EvaluationService(db)
     try:
         evaluation = await service.evaluate_stock(stock_code, period)
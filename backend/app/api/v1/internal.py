@@ -0,0 +1,53 @@
+"""内部運用 API（OpenAPI スキーマには載せない）
+
+認証が無いので settings.INTERNAL_API_ENABLED が True のときだけ応答する（既定は 404）。
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core import database
+from app.core.config import settings
+from app.core.db_pool import pool_stats
+
+
+def require_internal_api() -> None:
+    """INTERNAL_API_ENABLED でなければ存在しないものとして 404 を返す"""
+    if not settings.INTERNAL_API_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+router = APIRouter(dependencies=[Depends(require_internal_api)])
+
+
+@router.get("/db-pool")
+async def get_db_pool_stats():
+    """コネクションプールの使用状況（チェックアウト中 / overflow / 待ち回数・時間 / タイムアウト）
+
+    async: API の書き込み用エンジン、async_read: 読み取り用エンジン（DATABASE_READ_URL
+    未設定時は async と同じ）、sync: バッチの同期エンジン（このプロセスで未使用なら null）。
+    """
+    return {
+        "pgbouncer": settings.DB_PGBOUNCER,
+        "async": pool_stats(database.engine),
+        "async_read": pool_stats(database.read_engine) if database.read_engine is not database.engine else None,
+        "sync": pool_stats(database.sync_engine),
+    }
+
+
+@router.get("/cache-stats")
+async def get_cache_stats():
+    """2 段キャッシュ（プロセス内 LRU → Redis）の段ごとのヒット数・ヒット率
+
+    このプロセスで作られた TieredCache ごとに返す。local.size はいま載っている件数。
+    """
+    from app.core.tiered_cache import cache_stats
+
+    return cache_stats()
+
+
+@router.get("/startup")
+async def get_startup_profile():
+    """起動時間の内訳（import 開始から起動完了までの区間ごとの ms、起動時に読み込み済みの重い依存）"""
+    from app.core import startup_profile
+
+    return startup_profile.report()
@@ -3,10 +3,12 @@
 from datetime import date as date_cls
 from typing import Union
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core import http_cache
+from app.core.database import get_db, get_read_db
+from app.core.responses import FastJSONResponse
 from app.schemas.paper_trade import (
     AccountUninitialized,
     AccountInitialized,
@@ -81,22 +83,36 @@ async def get_summary(db: AsyncSession = Depends(get_db)):
 
 @router.get("/chart", response_model=list[ChartPoint])
 async def get_chart(
-    db: AsyncSession = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
     from_date: date_cls | None = Query(None, alias="from"),
     to_date: date_cls | None = Query(None, alias="to"),
 ):
-    return await svc.reconstruct_chart(db, from_date=from_date, to_date=to_date)
+    """日次の資産推移。ETag（最終取引 ID + 最新株価日）が一致すれば再構築せずに 304 を返す。"""
+    version = await svc.chart_version(db)
+    etag = None
+    if version is not None:
+        # to 省略時は当日までなので日付が変われば別の版
+        etag = http_cache.make_etag("chart", *version, from_date, to_date or date_cls.today())
+        if http_cache.etag_matches(request, etag):
+            return http_cache.not_modified(etag)
+    points = await svc.reconstruct_chart(db, from_date=from_date, to_date=to_date)
+    # ChartPoint と同じキーの dict（内部で計算した値）なので、点ごとの検証をせずに書き出す
+    response = FastJSONResponse(points)
+    if etag:
+        http_cache.set_etag(response, etag)
+    return response
 
 
 @router.get("/performance", response_model=list[PerformanceItem])
-async def get_performance(db: AsyncSession = Depends(get_db)):
+async def get_performance(db: AsyncSession = Depends(get_read_db)):
     return await svc.list_performance(db)
 
 
 @router.get("/symbols/{symbol}/analytics", response_model=AnalyticsResponse)
 async def get_symbol_analytics(
     symbol: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     from_date: date_cls | None = Query(None, alias="from"),
     to_date: date_cls | None = Query(None, alias="to"),
 ):
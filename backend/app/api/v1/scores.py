@@ -2,63 +2,195 @@
 
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core import http_cache
+from app.core.database import get_read_db
+from app.core.responses import model_rows
 from app.schemas.stock_score import StockScoreResponse, AnalysisAxesResponse
-from app.services import score_service
+from app.services import score_cache_service, score_export_service, score_service
 from app.services.analysis_axes_service import get_analysis_axes
 from app.services.profile_scoring_service import list_scores_with_profile
 
 router = APIRouter()
 
 _VALID_PROFILES = {"growth", "balanced", "income", "auto"}
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
 
 
 @router.get("", response_model=List[StockScoreResponse])
 async def list_scores(
+    request: Request,
     sort: str = Query("total_score", description="ソートカラム"),
     limit: int = Query(100, ge=1, le=500),
     profile: Optional[str] = Query(None, description="growth|balanced|income|auto"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=f"前ページの {NEXT_CURSOR_HEADER} ヘッダの値"),
+    sector: Optional[str] = Query(None, description="セクター（完全一致）"),
+    rating: Optional[List[str]] = Query(None, description="レーティング（複数指定可）"),
+    min_total_score: Optional[float] = Query(None),
+    max_total_score: Optional[float] = Query(None),
+    min_per: Optional[float] = Query(None),
+    max_per: Optional[float] = Query(None),
+    min_pbr: Optional[float] = Query(None),
+    max_pbr: Optional[float] = Query(None),
+    min_kurotenko_criteria: Optional[int] = Query(None, ge=0, le=score_service.KUROTENKO_CRITERIA_TOTAL),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """全銘柄スコア一覧（最新スコアのみ）。
 
-    profile 指定時はプロファイルに基づいて phase_score を計算し、そのスコアで降順ソートする。
+    (ソート値, symbol) のキーセットページング: 次ページがある場合はレスポンスヘッダ
+    `X-Next-Cursor` にカーソルを返すので、`cursor` に渡して続きを取得する。
+    フィルタ（sector / rating / スコア・PER・PBR の範囲 / 黒点子の最低充足数）は SQL で適用する。
+
+    profile 指定時はプロファイルに基づいて phase_score を計算し、そのスコアで降順ソートする
+    （フィルタは適用、ページングは非対応）。
     profile=auto はポートフォリオ進捗率から自動選択（Phase 4 で有効化）。
+
+    応答は公開中のスコアリング世代ごとに Redis にキャッシュする（score_cache_service）。
+    ETag も世代とパラメータから作るので、If-None-Match が一致すれば 304 を返す。
     """
+    filters = score_service.ScoreFilters(
+        sector=sector,
+        ratings=rating or [],
+        min_total_score=min_total_score,
+        max_total_score=max_total_score,
+        min_per=min_per,
+        max_per=max_per,
+        min_pbr=min_pbr,
+        max_pbr=max_pbr,
+        min_kurotenko_criteria=min_kurotenko_criteria,
+    )
+
     if profile is None:
-        return await score_service.list_scores(db, sort=sort, limit=limit)
+        if sort not in score_service.SORTABLE_COLUMNS:
+            sort = "total_score"
+        after = None
+        if cursor:
+            try:
+                after = score_service.decode_cursor(cursor, sort)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        profile_key = None
+    else:
+        if profile not in _VALID_PROFILES:
+            raise HTTPException(status_code=400, detail=f"profile must be one of {_VALID_PROFILES}")
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor は profile 指定時には使えません")
+        # auto の場合、現在のポートフォリオ進捗率を取得する（Phase 3 の portfolio_service 登場後に有効化）
+        progress_rate = None
+        profile_key = profile
+        if profile == "auto":
+            try:
+                from app.services.portfolio_service import get_progress_rate
+                progress_rate = await get_progress_rate(db)
+            except ImportError:
+                progress_rate = 0.0
+            # 結果は進捗率そのものではなく判定されたフェーズで決まる
+            from app.analyzer.phase_scorer import get_phase
+            profile_key = f"auto:{get_phase(progress_rate)}"
+
+    # 公開世代が同じなら同じ結果なので、304 かシリアライズ済みの応答をそのまま返す
+    generation = await score_cache_service.current_generation(db)
+    key = etag = None
+    if generation is not None:
+        params = score_cache_service.list_params(sort, limit, profile_key, cursor, filters)
+        key = score_cache_service.cache_key(generation, params)
+        etag = http_cache.make_etag(key)
+        if http_cache.etag_matches(request, etag):
+            return http_cache.not_modified(etag)
+        cached = await score_cache_service.get_cached(key)
+        if cached is not None:
+            return _scores_response(*cached, etag=etag)
 
-    if profile not in _VALID_PROFILES:
-        raise HTTPException(status_code=400, detail=f"profile must be one of {_VALID_PROFILES}")
+    if profile is None:
+        rows = await score_service.list_scores(db, sort=sort, limit=limit, filters=filters, after=after)
+        body = score_cache_service.serialize_scores(rows)
+        next_cursor = score_service.next_cursor(rows, sort, limit)
+    else:
+        enriched = await list_scores_with_profile(
+            db, profile, limit=limit, progress_rate=progress_rate, filters=filters
+        )
+        # スコア行に profile_* を載せて返す（信頼できる内部データなので行ごとの検証はしない）
+        out = model_rows([item["score"] for item in enriched], StockScoreResponse)
+        for row, item in zip(out, enriched):
+            row["profile_score"] = item["profile_score"]
+            row["profile_name"] = item["profile_name"]
+            row["current_phase"] = item["current_phase"]
+            row["adjusted_total_score"] = item.get("adjusted_total_score")
+        body = score_cache_service.serialize_scores(out)
+        next_cursor = None
+
+    if key is not None:
+        await score_cache_service.set_cached(key, body, next_cursor)
+    return _scores_response(body, next_cursor, etag=etag)
+
+
+def _scores_response(body: bytes, next_cursor: Optional[str], etag: Optional[str] = None) -> Response:
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    response = Response(content=body, media_type="application/json", headers=headers)
+    if etag:
+        http_cache.set_etag(response, etag)
+    return response
+
+
+@router.get("/export")
+async def export_scores(
+    format: str = Query("ndjson", description="ndjson|arrow"),
+    fields: Optional[str] = Query(None, description="出力する列（カンマ区切り、省略時は全列）"),
+    include_invalid: bool = Query(False, description="fetch_error / missing_tv の行も含める"),
+    chunk_size: int = Query(score_export_service.DEFAULT_CHUNK_SIZE, ge=50, le=5000),
+    sector: Optional[str] = Query(None, description="セクター（完全一致）"),
+    rating: Optional[List[str]] = Query(None, description="レーティング（複数指定可）"),
+    min_total_score: Optional[float] = Query(None),
+    max_total_score: Optional[float] = Query(None),
+    min_per: Optional[float] = Query(None),
+    max_per: Optional[float] = Query(None),
+    min_pbr: Optional[float] = Query(None),
+    max_pbr: Optional[float] = Query(None),
+    min_kurotenko_criteria: Optional[int] = Query(None, ge=0, le=score_service.KUROTENKO_CRITERIA_TOTAL),
+):
+    """最新スコア全件を NDJSON / Arrow IPC stream でストリーミング出力する（オフライン分析用）。
 
-    # auto の場合、現在のポートフォリオ進捗率を取得する（Phase 3 の portfolio_service 登場後に有効化）
-    progress_rate = None
-    if profile == "auto":
+    サーバーサイドカーソルから chunk_size 行ずつ読んでそのまま書き出すため、
+    件数に依らずメモリ使用量は一定。`fields` で列を絞れる。並びは symbol 昇順。
+    """
+    if format not in score_export_service.EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400, detail=f"format must be one of {set(score_export_service.EXPORT_FORMATS)}"
+        )
+    try:
+        columns = score_export_service.resolve_columns(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format == "arrow":
         try:
-            from app.services.portfolio_service import get_progress_rate
-            progress_rate = await get_progress_rate(db)
+            import pyarrow  # noqa: F401
         except ImportError:
-            progress_rate = 0.0
-
-    enriched = await list_scores_with_profile(db, profile, limit=limit, progress_rate=progress_rate)
-
-    # StockScoreResponse に profile_* を載せて返す
-    out: List[StockScoreResponse] = []
-    for item in enriched:
-        resp = StockScoreResponse.model_validate(item["score"])
-        resp.profile_score = item["profile_score"]
-        resp.profile_name = item["profile_name"]
-        resp.current_phase = item["current_phase"]
-        resp.adjusted_total_score = item.get("adjusted_total_score")
-        out.append(resp)
-    return out
+            raise HTTPException(status_code=501, detail="pyarrow がインストールされていません")
+
+    filters = score_service.ScoreFilters(
+        sector=sector,
+        ratings=rating or [],
+        min_total_score=min_total_score,
+        max_total_score=max_total_score,
+        min_per=min_per,
+        max_per=max_per,
+        min_pbr=min_pbr,
+        max_pbr=max_pbr,
+        min_kurotenko_criteria=min_kurotenko_criteria,
+    )
+    extension = "arrows" if format == "arrow" else "ndjson"
+    return StreamingResponse(
+        score_export_service.stream_export(format, columns, filters, include_invalid, chunk_size),
+        media_type=score_export_service.EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="stock_scores.{extension}"'},
+    )
 
 
 @router.get("/{symbol}", response_model=StockScoreResponse)
-async def get_score(symbol: str, db: AsyncSession = Depends(get_db)):
+async def get_score(symbol: str, db: AsyncSession = Depends(get_read_db)):
     """銘柄の最新スコアを返す"""
     score = await score_service.get_score(db, symbol)
     if not score:
@@ -67,6 +199,6 @@ async def get_score(symbol: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/{symbol}/axes", response_model=AnalysisAxesResponse)
-async def get_axes(symbol: str, db: AsyncSession = Depends(get_db)):
+async def get_axes(symbol: str, db: AsyncSession = Depends(get_read_db)):
     """銘柄の全分析軸集約を返す"""
     return await get_analysis_axes(symbol, db)
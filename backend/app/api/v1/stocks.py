@@ -1,16 +1,73 @@
-"""Stock API routes"""
+"""Stock API routes
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+StockService（pandas）はハンドラ内で import する（起動時に読み込まない）。
+"""
+
+from contextlib import aclosing
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional
+from typing import Optional, Tuple
+from app.core import database, http_cache
 from app.core.database import get_db
-from app.services.stock_service import StockService
-from app.schemas.stock import StockInfo, StockPriceResponse, StockPriceData
+from app.core.responses import dumps
+from app.schemas.stock import StockInfo, StockPriceBatchRequest, StockPriceResponse, StockPriceData
 from app.core.exceptions import StockNotFoundError
 
 router = APIRouter()
 
 
+def _prices_etag(code: str, period: Optional[str], version: Tuple[float, date]) -> str:
+    # 期間は当日起点なので日付が変われば別の版
+    return http_cache.make_etag("prices", code, period or "1y", date.today(), *version)
+
+
+@router.post("/prices:batch")
+async def get_stock_prices_batch(body: StockPriceBatchRequest):
+    """
+    複数銘柄の株価データを一括取得（NDJSON で銘柄ごとに 1 行ずつ返す）
+
+    - **codes**: 銘柄コードのリスト（重複は除く。最大 PRICES_BATCH_MAX_CODES 件）
+    - **period**: 期間（1d, 1w, 1m, 3m, 6m, 1y, 2y, 5y）
+
+    キャッシュ・DB で揃う銘柄を先に返し、外部 API が要る銘柄は取得できた順に続ける。
+    各行は GET /{code}/prices と同じ形。取得できなかった銘柄は
+    `{"stock_code": ..., "error": {"status_code": ..., "detail": ...}}` の行になる。
+    """
+    from app.services.stock_service import StockService
+    from app.utils.price_frame import frame_to_prices
+
+    codes = list(dict.fromkeys(body.codes))
+
+    async def lines():
+        # StreamingResponse の生成中もセッションが生きている必要があるため、
+        # リクエストスコープの get_db ではなく自前でセッションを開く（取得した株価は DB に保存する）
+        async with database.AsyncSessionLocal() as session:
+            service = StockService(session)
+            names = await service.get_stock_names(codes)
+            # 切断時は StreamingResponse がこの generator を取り消す。取得側も閉じて残りの取得を止める
+            async with aclosing(service.iter_price_frames(codes, period=body.period)) as frames:
+                async for code, frame, error in frames:
+                    if error is not None:
+                        yield dumps({
+                            "stock_code": code,
+                            "error": {
+                                "status_code": getattr(error, "status_code", 500),
+                                "detail": getattr(error, "detail", None) or f"エラーが発生しました: {error}",
+                            },
+                        }) + b"\n"
+                        continue
+                    yield StockPriceResponse.model_construct(
+                        stock_code=code,
+                        stock_name=names[code],
+                        period=body.period,
+                        prices=frame_to_prices(frame),
+                    ).model_dump_json().encode() + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/{code}", response_model=StockInfo)
 async def get_stock(
     code: str,
@@ -21,6 +78,8 @@ async def get_stock(
     
     - **code**: 銘柄コード（例: 7203）
     """
+    from app.services.stock_service import StockService
+
     try:
         service = StockService(db)
         stock_info = await service.get_stock_info(code)
@@ -42,6 +101,8 @@ async def get_stock(
 
 @router.get("/{code}/prices", response_model=StockPriceResponse)
 async def get_stock_prices(
+    request: Request,
+    response: Response,
     code: str,
     period: Optional[str] = Query("1y", description="期間（1d, 1w, 1m, 3m, 6m, 1y）"),
     db: AsyncSession = Depends(get_db),
@@ -51,15 +112,30 @@ async def get_stock_prices(
     
     - **code**: 銘柄コード（例: 7203）
     - **period**: 期間（1d, 1w, 1m, 3m, 6m, 1y）
+
+    ETag は (銘柄, 期間, 当日, 正準系列の refreshed_at, 最終バー日) から作る。
+    キャッシュ済みの系列が期間を満たし、If-None-Match が一致すれば本体を実行せずに 304 を返す。
     """
+    from app.services.stock_service import StockService
+
     try:
         service = StockService(db)
+        version = await service.get_price_version(code, period)
+        if version is not None:
+            etag = _prices_etag(code, period, version)
+            if http_cache.etag_matches(request, etag):
+                return http_cache.not_modified(etag)
+
         # 銘柄情報を取得（銘柄名を取得するため）
         stock_info = await service.get_stock_info(code)
 
         # 株価データを取得
         prices = await service.get_stock_prices(code, period=period)
 
+        # 取得後の系列はローカル LRU にあるので、版の読み直しは DB にも Redis にも行かない
+        version = await service.get_price_version(code, period)
+        if version is not None:
+            http_cache.set_etag(response, _prices_etag(code, period, version))
         return StockPriceResponse(
             stock_code=code,
             stock_name=stock_info.name,
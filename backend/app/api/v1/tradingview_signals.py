@@ -5,7 +5,7 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.schemas.tradingview_signal import TradingViewSignalCreate, TradingViewSignalResponse
 from app.services import tradingview_signal_service
 
@@ -23,7 +23,7 @@ async def create_signal(
 
 
 @router.get("/{symbol}", response_model=TradingViewSignalResponse)
-async def get_signal(symbol: str, db: AsyncSession = Depends(get_db)):
+async def get_signal(symbol: str, db: AsyncSession = Depends(get_read_db)):
     """銘柄の最新 TradingView シグナルを返す"""
     signal = await tradingview_signal_service.get_signal(db, symbol)
     if not signal:
@@ -32,6 +32,6 @@ async def get_signal(symbol: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("", response_model=List[TradingViewSignalResponse])
-async def list_signals(db: AsyncSession = Depends(get_db)):
+async def list_signals(db: AsyncSession = Depends(get_read_db)):
     """全銘柄の最新 TradingView シグナル一覧（ランキングページ用）"""
     return await tradingview_signal_service.list_signals(db)
@@ -0,0 +1,192 @@
+"""JSON レスポンスの圧縮（gzip / Brotli）ミドルウェア
+
+Starlette の GZipMiddleware は Content-Type を問わず圧縮するが、ここでは JSON
+（application/json, *+json, application/x-ndjson）のうち COMPRESSION_MINIMUM_SIZE バイト以上のものだけを圧縮する。
+小さい応答は圧縮しても得にならず、Arrow 等のバイナリは既に詰まっているため。
+
+- Accept-Encoding に br があり brotli が入っていれば Brotli、なければ gzip
+- 本文が 1 メッセージで届けばサイズを見て判断し、ストリーミング応答は逐次圧縮する。
+  NDJSON は行ごとに届くこと自体に意味があるので、チャンクごとに同期フラッシュする
+- 圧縮した応答の ETag は弱い ETag（W/"..."）にする。表現（エンコーディング）ごとに
+  本文が変わるため。If-None-Match は弱い比較なので 304 判定はそのまま効く
+"""
+
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - Brotli は任意
+    brotli = None
+
+JSON_MEDIA_TYPES = ("application/json", "application/x-ndjson")
+# ストリーミング時にチャンクごとにフラッシュする（1 行ずつ届ける）形式
+LINE_MEDIA_TYPES = ("application/x-ndjson",)
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def is_json(content_type: str) -> bool:
+    media_type = _media_type(content_type)
+    return media_type in JSON_MEDIA_TYPES or media_type.endswith("+json")
+
+
+def accepted_encodings(accept_encoding: str) -> set:
+    """Accept-Encoding から q=0 でないエンコーディング名の集合を返す。"""
+    out = set()
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            out.add(name.strip())
+    return out
+
+
+class _Compressor:
+    """gzip / br の逐次圧縮器（compress → flush の順に呼ぶ）"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def sync_flush(self) -> bytes:
+        """ここまでの入力を出し切る（ストリームは続けられる）"""
+        if self.encoding == "br":
+            return self._obj.flush()
+        return self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+def compress(data: bytes, encoding: str, level: int) -> bytes:
+    compressor = _Compressor(encoding, level)
+    return compressor.compress(data) + compressor.flush()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_level: int = 4,
+        use_brotli: bool = True,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_level = brotli_level
+        self.use_brotli = use_brotli and brotli is not None
+
+    def choose_encoding(self, scope: Scope) -> Optional[str]:
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if self.use_brotli and "br" in accepted:
+            return "br"
+        if "gzip" in accepted:
+            return "gzip"
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = self.choose_encoding(scope) if scope["type"] == "http" else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        level = self.brotli_level if encoding == "br" else self.gzip_level
+        await _CompressionResponder(self.app, encoding, level, self.minimum_size)(scope, receive, send)
+
+
+class _CompressionResponder:
+    """1 リクエスト分の応答を見て、対象なら圧縮して送る"""
+
+    def __init__(self, app: ASGIApp, encoding: str, level: int, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.line_stream = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.start = message
+            self.passthrough = (
+                not is_json(headers.get("content-type", ""))
+                or "content-encoding" in headers
+                or message["status"] in (204, 304)
+            )
+            self.line_stream = _media_type(headers.get("content-type", "")) in LINE_MEDIA_TYPES
+            if self.passthrough:
+                await self.send(message)
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start["headers"])
+
+        if self.compressor is None:
+            if not more_body and len(body) < self.minimum_size:
+                # 小さい応答はそのまま
+                await self.send(self.start)
+                await self.send(message)
+                self.passthrough = True
+                return
+            self.compressor = _Compressor(self.encoding, self.level)
+            self._set_encoding_headers(headers)
+            if more_body:
+                # ストリーミング: 長さは分からないので chunked で逐次送る
+                del headers["content-length"]
+            else:
+                data = self.compressor.compress(body) + self.compressor.flush()
+                headers["content-length"] = str(len(data))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": data})
+                return
+            await self.send(self.start)
+
+        data = self.compressor.compress(body)
+        if not more_body:
+            data += self.compressor.flush()
+        elif self.line_stream:
+            data += self.compressor.sync_flush()
+        if data or not more_body:
+            await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
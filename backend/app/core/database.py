@@ -1,21 +1,68 @@
 """Database configuration"""
 
+from typing import Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from app.core.config import settings
+from app.core.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool
+from app.core.query_stats import install_query_hooks
+
+
+def _pool_kwargs(pool_size: int, max_overflow: int) -> dict:
+    """プールの大きさと寿命（DB_POOL_* 設定）"""
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+
+def _statement_cache_args() -> dict:
+    """asyncpg の prepared statement キャッシュ設定（connect_args）
 
+    PgBouncer の transaction / statement プーリングではサーバー接続が入れ替わるため、
+    キャッシュを無効にし、prepared statement 名も接続をまたいで衝突しないよう一意にする。
+    """
+    if settings.DB_PGBOUNCER:
+        from uuid import uuid4
 
-def _build_engine_kwargs() -> dict:
-    """接続 URL を解析し、SSL の有無に応じたエンジン引数を返す"""
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+
+
+def _build_engine_kwargs(
+    db_url: str,
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+) -> dict:
+    """接続 URL を解析し、SSL の有無・プール設定に応じたエンジン引数を返す"""
     from urllib.parse import urlparse, urlencode, parse_qs, urlunparse
 
-    db_url = settings.DATABASE_URL
-    kwargs: dict = {"echo": settings.DEBUG, "future": True, "pool_pre_ping": True}
+    kwargs: dict = {
+        "echo": settings.DEBUG,
+        "future": True,
+        "poolclass": InstrumentedAsyncQueuePool,
+        **_pool_kwargs(
+            settings.DB_POOL_SIZE if pool_size is None else pool_size,
+            settings.DB_MAX_OVERFLOW if max_overflow is None else max_overflow,
+        ),
+    }
+    connect_args = _statement_cache_args()
 
     if "ssl=false" in db_url.lower():
         clean_url = db_url.replace("?ssl=false", "").replace("&ssl=false", "")
         kwargs["url"] = clean_url
-        kwargs["connect_args"] = {"ssl": False}
+        connect_args["ssl"] = False
     else:
         # asyncpg は sslmode=/channel_binding= を URL パラメータとして受け付けない
         parsed = urlparse(db_url)
@@ -25,22 +72,63 @@ def _build_engine_kwargs() -> dict:
         clean_query = urlencode({k: v[0] for k, v in params.items()})
         kwargs["url"] = urlunparse(parsed._replace(query=clean_query))
         if sslmode == "require":
-            kwargs["connect_args"] = {"ssl": True}
+            connect_args["ssl"] = True
 
+    kwargs["connect_args"] = connect_args
     return kwargs
 
 
-_engine_kwargs = _build_engine_kwargs()
+def _session_factory(bind) -> async_sessionmaker:
+    return async_sessionmaker(
+        bind,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False,
+    )
+
+
+# 書き込み用（プライマリ）
+_engine_kwargs = _build_engine_kwargs(settings.DATABASE_URL)
 engine = create_async_engine(**_engine_kwargs)
 
+# 読み取り用: DATABASE_READ_URL（リードレプリカ等）があれば別エンジン、なければプライマリを共有
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(
+        **_build_engine_kwargs(
+            settings.DATABASE_READ_URL,
+            pool_size=settings.DB_READ_POOL_SIZE,
+            max_overflow=settings.DB_READ_MAX_OVERFLOW,
+        )
+    )
+else:
+    read_engine = engine
+
+install_query_hooks(engine)
+install_query_hooks(read_engine)
+
 # セッション作成
-AsyncSessionLocal = async_sessionmaker(
-    engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-    autocommit=False,
-    autoflush=False,
-)
+AsyncSessionLocal = _session_factory(engine)
+ReadSessionLocal = _session_factory(read_engine)
+
+# バッチ（psycopg2）用の同期エンジン。初回利用時に作り、プロセス内で使い回す
+sync_engine = None
+
+
+def get_sync_engine():
+    """バッチ / 保持ジョブ用の同期エンジン（API と同じ DB_POOL_* 設定で作る）"""
+    global sync_engine
+    if sync_engine is None:
+        from sqlalchemy import create_engine
+
+        sync_engine = create_engine(
+            settings.DATABASE_URL.replace("+asyncpg", "+psycopg2"),
+            poolclass=InstrumentedQueuePool,
+            **_pool_kwargs(settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+        )
+        install_query_hooks(sync_engine)
+    return sync_engine
+
 
 # Base class for models
 Base = declarative_base()
@@ -56,3 +144,17 @@ async def get_db() -> AsyncSession:
                 await session.close()
     except Exception as e:
         raise e
+
+
+async def get_read_db() -> AsyncSession:
+    """Dependency for getting a read-only database session
+
+    参照系エンドポイント（ランキング・分析・チャート等）用。DATABASE_READ_URL を設定すると
+    レプリカへ振り分けられるため、このセッションで書き込みをしてはいけない
+    （レプリカの遅延分だけ直前の書き込みが見えないことがある）。
+    """
+    async with ReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
@@ -0,0 +1,71 @@
+"""コネクションプールの計測
+
+QueuePool / AsyncAdaptedQueuePool を薄く継承し、チェックアウト時に
+プールが埋まっていて待たされた回数・待ち時間・タイムアウト回数を数える。
+pool_stats() は engine の現在の使用状況とこれらの累計を dict で返す
+（/api/v1/internal/db-pool 用。プールサイズの見積もりに使う）。
+"""
+
+import time
+from typing import Optional
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+
+class _WaitTrackingMixin:
+    """チェックアウト待ちを数える（dispose で作り直されたプールは 0 から数え直す）"""
+
+    def _wait_counters(self) -> dict:
+        counters = getattr(self, "_kabu_wait_counters", None)
+        if counters is None:
+            counters = {"checkouts": 0, "waits": 0, "wait_seconds": 0.0, "timeouts": 0}
+            self._kabu_wait_counters = counters
+        return counters
+
+    def _do_get(self):
+        counters = self._wait_counters()
+        counters["checkouts"] += 1
+        # 空きも overflow の余地も無い → 返却待ちになる
+        exhausted = self.checkedin() == 0 and 0 <= self._max_overflow <= self.overflow()
+        if not exhausted:
+            return super()._do_get()
+        counters["waits"] += 1
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            counters["timeouts"] += 1
+            raise
+        finally:
+            counters["wait_seconds"] += time.perf_counter() - started
+
+
+class InstrumentedQueuePool(_WaitTrackingMixin, QueuePool):
+    """同期エンジン（バッチ / psycopg2）用"""
+
+
+class InstrumentedAsyncQueuePool(_WaitTrackingMixin, AsyncAdaptedQueuePool):
+    """非同期エンジン（API / asyncpg）用"""
+
+
+def pool_stats(engine) -> Optional[dict]:
+    """engine のプール使用状況を返す（engine が None なら None）。"""
+    if engine is None:
+        return None
+    pool = getattr(engine, "sync_engine", engine).pool
+    stats: dict = {"pool_class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout=pool.timeout(),
+        )
+    if isinstance(pool, _WaitTrackingMixin):
+        counters = dict(pool._wait_counters())
+        counters["wait_seconds"] = round(counters["wait_seconds"], 6)
+        stats.update(counters)
+    return stats
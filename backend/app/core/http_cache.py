@@ -0,0 +1,44 @@
+"""条件付き GET（ETag / If-None-Match）
+
+ETag は応答本文ではなく、本文を一意に決める安価な「版」（スコア世代、最終株価日、
+最終取引 ID など）から作る。版が一致すれば DB の本体クエリもシリアライズも行わずに
+304 を返せる。
+
+ブラウザが毎回再検証するよう `Cache-Control: no-cache` を併せて付ける。
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+ETAG_CACHE_CONTROL = "no-cache"
+
+
+def make_etag(*parts: Any) -> str:
+    """版を表す値の並びから強い ETag（引用符付き）を作る。"""
+    raw = "\x1f".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match が etag に一致するか（RFC 9110 の弱い比較、`*` 対応）。"""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = ETAG_CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,121 @@
+"""リクエスト単位の SQL クエリ数 / DB 時間の計測
+
+エンジンの before/after_cursor_execute で発行文を数え、track_queries() で開いた
+コレクタ（ContextVar）に積む。HTTP ミドルウェアがリクエストごとにコレクタを開き、
+
+    - DEBUG 時はレスポンスヘッダ X-DB-Query-Count / X-DB-Time-Ms に出す
+    - 件数・時間がしきい値を超えたら警告ログを出す
+    - 同一 SQL が DB_REPEATED_QUERY_THRESHOLD 回以上発行されたら N+1 として併記する
+
+コレクタは入れ子にできる（テストの track_queries() の内側でリクエストを処理すると
+両方に数えられる）。コレクタが無いスレッド（バッチ）では計測しない。
+"""
+
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Tuple
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+_START_KEY = "query_stats_start"
+
+
+class QueryStats:
+    """1 区間（リクエスト等）の発行文数と累計 DB 時間"""
+
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.seconds += elapsed
+        self.statements[statement] += 1
+
+    @property
+    def milliseconds(self) -> float:
+        return self.seconds * 1000
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """threshold 回以上発行された同一 SQL（N+1 の疑い）を多い順に返す。"""
+        return [(sql, n) for sql, n in self.statements.most_common() if n >= threshold]
+
+
+_collectors: ContextVar[Tuple[QueryStats, ...]] = ContextVar("query_stats_collectors", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """この with ブロック内（同じコンテキスト）で発行された SQL を数える。"""
+    stats = QueryStats()
+    token = _collectors.set(_collectors.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _collectors.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _collectors.get():
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = _collectors.get()
+    starts = conn.info.get(_START_KEY)
+    if not collectors or not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    for stats in collectors:
+        stats.record(statement, elapsed)
+
+
+def install_query_hooks(engine) -> None:
+    """engine（同期 / 非同期）に計測フックを付ける（冪等）。"""
+    target = getattr(engine, "sync_engine", engine)
+    if not event.contains(target, "before_cursor_execute", _before_cursor_execute):
+        event.listen(target, "before_cursor_execute", _before_cursor_execute)
+        event.listen(target, "after_cursor_execute", _after_cursor_execute)
+
+
+def report(label: str, stats: QueryStats) -> None:
+    """しきい値超過 / N+1 の疑いがあれば警告ログを出す。"""
+    repeated = stats.repeated(settings.DB_REPEATED_QUERY_THRESHOLD)
+    if (
+        stats.count <= settings.DB_QUERY_COUNT_LOG_THRESHOLD
+        and stats.milliseconds <= settings.DB_QUERY_TIME_LOG_THRESHOLD_MS
+        and not repeated
+    ):
+        return
+    message = "DB クエリ過多: %s queries=%d db_ms=%.1f"
+    args = [label, stats.count, stats.milliseconds]
+    for sql, n in repeated[:3]:
+        message += "\n  N+1 の疑い (%d 回): %s"
+        args += [n, " ".join(sql.split())[:200]]
+    logger.warning(message, *args)
+
+
+async def query_stats_middleware(request, call_next):
+    """リクエストごとにクエリ数と DB 時間を集計する HTTP ミドルウェア
+
+    StreamingResponse の本文生成中に発行された文はヘッダには含まれない。
+    """
+    with track_queries() as stats:
+        response = await call_next(request)
+    if settings.DEBUG:
+        response.headers[QUERY_COUNT_HEADER] = str(stats.count)
+        response.headers[QUERY_TIME_HEADER] = f"{stats.milliseconds:.1f}"
+    report(f"{request.method} {request.url.path}", stats)
+    return response
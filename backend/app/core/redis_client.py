@@ -5,6 +5,8 @@ from app.core.config import settings
 
 # Redis接続プール
 redis_client: redis.Redis = None
+# バイナリ値（キャッシュのコーデック出力）用。応答を str にデコードしない
+redis_binary_client: redis.Redis = None
 
 
 async def get_redis() -> redis.Redis:
@@ -19,9 +21,37 @@ async def get_redis() -> redis.Redis:
     return redis_client
 
 
+async def get_redis_binary() -> redis.Redis:
+    """Get Redis client that returns raw bytes"""
+    global redis_binary_client
+    if redis_binary_client is None:
+        redis_binary_client = await redis.from_url(settings.REDIS_URL, decode_responses=False)
+    return redis_binary_client
+
+
 async def close_redis():
     """Close Redis connection"""
-    global redis_client
+    global redis_client, redis_binary_client
     if redis_client:
         await redis_client.close()
         redis_client = None
+    if redis_binary_client:
+        await redis_binary_client.close()
+        redis_binary_client = None
+
+
+def scan_delete_sync(client, match: str, batch_size: int = 500) -> int:
+    """同期クライアントで match に一致するキーを SCAN しながら batch_size 件ずつ削除する。
+
+    削除件数を返す（例外は呼び出し側で扱う）。
+    """
+    deleted = 0
+    batch = []
+    for key in client.scan_iter(match=match, count=batch_size):
+        batch.append(key)
+        if len(batch) >= batch_size:
+            deleted += client.delete(*batch)
+            batch = []
+    if batch:
+        deleted += client.delete(*batch)
+    return deleted
@@ -0,0 +1,117 @@
+"""キャッシュミス時の取得の合流（singleflight）
+
+キャッシュが切れた直後に同じ銘柄へ同時にリクエストが来ると、全員が外部 API
+（yfinance）を叩きにいく。SingleFlight.do は同じキーの取得を 1 本にまとめる:
+
+- プロセス内: 実行中の取得があればそのタスクの結果を待つ（asyncio）
+- プロセス間: 先頭のプロセスだけが Redis の短命ロック（SET NX PX）を取って取得し、
+  他のプロセスは probe（キャッシュ読み出し）をポーリングして書き込まれた結果を使う。
+  ロックが消えても結果が無い / 待ち時間を超えた場合は自分で取得する
+
+Redis が使えない場合はプロセス内の合流だけ行う。取得は独立したタスクで走らせるので、
+最初に呼んだリクエストが切断されても待っている他のリクエストには影響しない。
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+LOCK_KEY_FMT = "singleflight:{key}"
+
+# 自分のトークンのときだけ消す（期限切れ後に他プロセスが取り直したロックを消さない）
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """同じキーの同時取得を 1 回にまとめる"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # leader: 自分で取得 / shared: プロセス内で合流 / remote_hit: 他プロセスの結果を使用
+        # remote_fallback: 他プロセスを待ったが結果が無く自分で取得
+        self.stats: Counter = Counter()
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        probe: Optional[Callable[[], Awaitable[Any]]] = None,
+    ) -> Tuple[Any, bool]:
+        """fn() の結果と、他の呼び出しと共有した結果かどうかを返す。
+
+        probe は他プロセスの取得結果（キャッシュ）を読む関数で、無ければ None を返す。
+        probe を渡さなければプロセス間の合流は行わない。
+        共有した結果を書き換える場合、呼び出し側でコピーすること。
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["shared"] += 1
+            return await asyncio.shield(task), True
+
+        task = asyncio.ensure_future(self._run(key, fn, probe))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task), False
+
+    async def _run(self, key: str, fn, probe) -> Any:
+        if probe is None or settings.SINGLEFLIGHT_LOCK_TTL_SEC <= 0:
+            self.stats["leader"] += 1
+            return await fn()
+
+        lock_key = LOCK_KEY_FMT.format(key=key)
+        token = uuid.uuid4().hex
+        try:
+            redis = await get_redis()
+            acquired = await redis.set(lock_key, token, nx=True, px=int(settings.SINGLEFLIGHT_LOCK_TTL_SEC * 1000))
+        except Exception:
+            # Redis接続エラーの場合はプロセス内の合流だけ
+            redis, acquired = None, True
+
+        if acquired:
+            self.stats["leader"] += 1
+            try:
+                return await fn()
+            finally:
+                if redis is not None:
+                    try:
+                        await redis.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+                    except Exception:
+                        pass
+
+        result = await self._wait_remote(redis, lock_key, probe)
+        if result is not None:
+            self.stats["remote_hit"] += 1
+            return result
+        self.stats["remote_fallback"] += 1
+        return await fn()
+
+    async def _wait_remote(self, redis, lock_key: str, probe) -> Any:
+        """他プロセスの取得完了（probe が結果を返す / ロック解放）を待つ。"""
+        deadline = time.monotonic() + settings.SINGLEFLIGHT_WAIT_TIMEOUT_SEC
+        while time.monotonic() < deadline:
+            await asyncio.sleep(settings.SINGLEFLIGHT_POLL_INTERVAL_SEC)
+            result = await probe()
+            if result is not None:
+                return result
+            try:
+                if not await redis.exists(lock_key):
+                    # 解放済みなのに結果が無い（相手の取得失敗）。最後にもう一度だけ見る
+                    return await probe()
+            except Exception:
+                return None
+        logger.debug("singleflight %s: %s の待機がタイムアウト", self.name, lock_key)
+        return None
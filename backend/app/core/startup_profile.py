@@ -0,0 +1,81 @@
+"""起動時間の内訳（コールドスタートの計測）
+
+app.main の import 開始から lifespan の起動完了までを区間ごとに記録し、起動時に
+1 回だけログに出す（/api/v1/internal/startup でも取れる）。
+
+- phase(name): with ブロックの所要時間と、その間に新しく読み込まれた重い依存
+  （pandas / pandas_ta / yfinance など HEAVY_MODULES）を記録する
+- report(): 区間ごとの ms と、起動完了時点で読み込み済みの重い依存
+
+ルーターは重いサービスを関数内で import するので、起動時に HEAVY_MODULES が
+読み込まれていれば、どこかでモジュール先頭の import が増えたということ。
+"""
+
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 起動時に読み込みたくない（最初に使うときに読み込む）依存
+HEAVY_MODULES = (
+    "pandas",
+    "numpy",
+    "pandas_ta",
+    "ta",
+    "yfinance",
+    "tradingview_ta",
+    "tradingview_screener",
+    "requests",
+    "google.auth",
+)
+
+# app.core.startup_profile の import 時刻 ≒ app.main の import 開始
+BOOT_STARTED = time.perf_counter()
+
+_phases: List[dict] = []
+_ready_ms: Optional[float] = None
+
+
+def loaded_heavy_modules() -> List[str]:
+    return [name for name in HEAVY_MODULES if name in sys.modules]
+
+
+@contextmanager
+def phase(name: str):
+    """with ブロックの所要時間と、その間に読み込まれた重い依存を記録する"""
+    before = set(loaded_heavy_modules())
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append({
+            "name": name,
+            "ms": round((time.perf_counter() - t0) * 1000, 1),
+            "heavy_imports": [m for m in loaded_heavy_modules() if m not in before],
+        })
+
+
+def mark_ready() -> None:
+    """起動完了（lifespan の startup 完了）を記録し、内訳をログに出す"""
+    global _ready_ms
+    _ready_ms = round((time.perf_counter() - BOOT_STARTED) * 1000, 1)
+    data = report()
+    lines = [f"  {p['name']:<28} {p['ms']:>8.1f} ms" + (f"  +{','.join(p['heavy_imports'])}" if p["heavy_imports"] else "")
+             for p in data["phases"]]
+    logger.info(
+        "起動完了 %.1f ms（import 開始から）\n%s\n  起動時に読み込み済みの重い依存: %s",
+        _ready_ms,
+        "\n".join(lines),
+        ", ".join(data["heavy_modules_loaded"]) or "なし",
+    )
+
+
+def report() -> Dict[str, object]:
+    return {
+        "ready_ms": _ready_ms,
+        "phases": list(_phases),
+        "heavy_modules_loaded": loaded_heavy_modules(),
+    }
@@ -0,0 +1,203 @@
+"""プロセス内 LRU + Redis の 2 段キャッシュ
+
+Redis のヒットでも往復 1 回と文字列のデコード（json.loads → オブジェクト再構築）がかかる。
+TieredCache は前段にプロセス内の LRU（件数上限 + 短い TTL）を置き、デコード済みの
+オブジェクトをそのまま持つ:
+
+    get: ローカル → Redis（ヒットしたらデコードしてローカルに載せる）→ None
+    get_remote: Redis だけを読む（ヒットしたらローカルを置き換える）
+    set: ローカルと Redis の両方に書く（Redis には encode した文字列）
+
+ローカルの TTL は Redis の TTL と local_ttl の短い方。他プロセスの書き込みは見えないので、
+古さの上限は local_ttl になる。ローカルの値は呼び出し間で共有されるため、可変な
+オブジェクトは get の copy で複製して返す。
+
+binary=True のキャッシュは bytes を返す Redis クライアントを使う（encode は bytes を返す）。
+
+段ごとのヒット数は stats() で取れる（/api/v1/internal/cache-stats）。
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from app.core.redis_client import get_redis, get_redis_binary
+
+_registry: Dict[str, "TieredCache"] = {}
+
+
+class LocalLRU:
+    """件数上限 + TTL 付きの LRU（スレッドセーフではない。イベントループ内で使う）"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is not None:
+            expires_at, value = item
+            if expires_at > time.monotonic():
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _ratio(hits: int, misses: int) -> Optional[float]:
+    total = hits + misses
+    return round(hits / total, 4) if total else None
+
+
+class TieredCache:
+    """プロセス内 LRU（デコード済みオブジェクト）→ Redis（文字列）の 2 段キャッシュ"""
+
+    def __init__(self, name: str, local_maxsize: int, local_ttl: float, binary: bool = False):
+        self.name = name
+        self.binary = binary
+        self.local = LocalLRU(local_maxsize, local_ttl)
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.redis_errors = 0
+        _registry[name] = self
+
+    async def _redis(self):
+        return await (get_redis_binary() if self.binary else get_redis())
+
+    async def get(
+        self,
+        key: str,
+        decode: Callable[[Union[str, bytes]], Any],
+        copy: Optional[Callable[[Any], Any]] = None,
+    ) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            return copy(value) if copy else value
+        return await self.get_remote(key, decode, copy)
+
+    async def get_remote(
+        self,
+        key: str,
+        decode: Callable[[Union[str, bytes]], Any],
+        copy: Optional[Callable[[Any], Any]] = None,
+    ) -> Optional[Any]:
+        """ローカルを見ずに Redis から読み、ヒットしたらローカルを置き換える。
+
+        他プロセスの書き込みを待つとき（singleflight の probe）に使う。ローカルには
+        古い値が残っていることがあるため get では見えない。
+        """
+        try:
+            redis = await self._redis()
+            raw = await redis.get(key)
+        except Exception:
+            # Redis接続エラーの場合はスキップ
+            self.redis_errors += 1
+            return None
+        if not raw:
+            self.redis_misses += 1
+            return None
+        try:
+            value = decode(raw)
+        except Exception:
+            # 旧形式などデコードできない値はミス扱い
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        self.local.set(key, value)
+        return copy(value) if copy else value
+
+    async def get_many(
+        self,
+        keys: List[str],
+        decode: Callable[[Union[str, bytes]], Any],
+        copy: Optional[Callable[[Any], Any]] = None,
+    ) -> Dict[str, Any]:
+        """複数キーを 1 回の MGET で引く（ローカルにあるキーは Redis に問い合わせない）。
+
+        見つかったキーだけを持つ dict を返す。
+        """
+        found: Dict[str, Any] = {}
+        remote = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is not None:
+                found[key] = copy(value) if copy else value
+            else:
+                remote.append(key)
+        if not remote:
+            return found
+        try:
+            redis = await self._redis()
+            raws = await redis.mget(remote)
+        except Exception:
+            # Redis接続エラーの場合はスキップ
+            self.redis_errors += 1
+            return found
+        for key, raw in zip(remote, raws):
+            try:
+                value = decode(raw) if raw else None
+            except Exception:
+                # 旧形式などデコードできない値はミス扱い
+                value = None
+            if value is None:
+                self.redis_misses += 1
+                continue
+            self.redis_hits += 1
+            self.local.set(key, value)
+            found[key] = copy(value) if copy else value
+        return found
+
+    async def set(self, key: str, value: Any, encode: Callable[[Any], Union[str, bytes]], ttl: int) -> None:
+        self.local.set(key, value, ttl)
+        try:
+            redis = await self._redis()
+            await redis.setex(key, ttl, encode(value))
+        except Exception:
+            # Redis接続エラーの場合はスキップ
+            self.redis_errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "local": {
+                "hits": self.local.hits,
+                "misses": self.local.misses,
+                "hit_ratio": _ratio(self.local.hits, self.local.misses),
+                "size": len(self.local),
+                "maxsize": self.local.maxsize,
+                "ttl_sec": self.local.ttl,
+            },
+            "redis": {
+                "hits": self.redis_hits,
+                "misses": self.redis_misses,
+                "errors": self.redis_errors,
+                "hit_ratio": _ratio(self.redis_hits, self.redis_misses),
+            },
+        }
+
+
+def cache_stats() -> Dict[str, dict]:
+    """このプロセスで作られた TieredCache ごとの段別ヒット数"""
+    return {name: cache.stats() for name, cache in _registry.items()}
@@ -39,9 +39,13 @@ except Exception:
     _YF_SESSION = None
 
 
-def fetch_stock_data(symbol: str) -> Optional[dict]:
+def fetch_stock_data(symbol: str, period: str = "1y") -> Optional[dict]:
     """symbol の yfinance データを取得して返す。失敗時は None。
 
+    Args:
+        symbol: 銘柄コード（例: 7203.T）
+        period: 履歴期間（yfinance の period 文字列。既定 1y）
+
     Returns:
         {"symbol": str, "history": pd.DataFrame, "info": dict} or None
     """
@@ -51,7 +55,7 @@ def fetch_stock_data(symbol: str) -> Optional[dict]:
         try:
             _throttle_yfinance()
             ticker = yf.Ticker(symbol, session=_YF_SESSION)
-            history = ticker.history(period="1y")
+            history = ticker.history(period=period)
             if history.empty:
                 logger.warning("%s: 履歴データが空", symbol)
                 return None
@@ -0,0 +1,35 @@
+"""stock_scores の保持ジョブ（パーティション作成 + 古い行の週次間引き）
+
+使用例:
+    python -m app.jobs.score_retention          # 直近のカットオフ付近のみ（日次運用）
+    python -m app.jobs.score_retention --full   # 全期間を間引く（初回・取りこぼし回収）
+
+Cloud Run Jobs / cron からバッチスコアリングの後に 1 日 1 回起動する想定。
+"""
+
+import argparse
+import logging
+import sys
+
+from app.core.logging import setup_logging
+from app.services.score_retention_service import run_score_retention_sync
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--full", action="store_true", help="全期間を対象に間引く")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    logger = logging.getLogger(__name__)
+    try:
+        result = run_score_retention_sync(full=args.full)
+        logger.info("score retention: 完了 %s", result)
+        return 0
+    except Exception as e:
+        logger.exception("score retention: 失敗 - %s", e)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,26 @@
-"""FastAPI application entry point"""
-
-from contextlib import asynccontextmanager
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from app.core.config import settings
-from app.core.logging import setup_logging
-from app.core.exceptions import KabuTradeException
-from app.core.redis_client import get_redis, close_redis
+"""FastAPI application entry point
+
+起動を軽くするため、ルーターは重いサービス（pandas / pandas_ta / yfinance 等）を
+ハンドラ内で import する。起動時間の内訳は app.core.startup_profile が記録する。
+"""
+
+# 起動時間の計測の起点（最初に import する）
+from app.core import startup_profile
+
+with startup_profile.phase("import:core"):
+    import importlib
+    import importlib.util
+    from contextlib import asynccontextmanager
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+    from app.core.compression import CompressionMiddleware
+    from app.core.config import settings
+    from app.core.logging import setup_logging
+    from app.core.exceptions import KabuTradeException
+    from app.core.redis_client import get_redis, close_redis
+    from app.core.responses import FastJSONResponse
+    from app.core.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, query_stats_middleware
 
 # ロギング設定
 setup_logging()
@@ -21,10 +34,13 @@ async def lifespan(app: FastAPI):
     Service 側に APScheduler 等のスケジューラは持たない。
     定期実行は Cloud Scheduler → Cloud Run Jobs で行う。
     """
-    try:
-        await get_redis()
-    except Exception as e:
-        print(f"⚠ Redis接続エラー（無視）: {e}")
+    with startup_profile.phase("lifespan:redis"):
+        try:
+            await get_redis()
+        except Exception as e:
+            print(f"⚠ Redis接続エラー（無視）: {e}")
+    if settings.STARTUP_PROFILE_LOG:
+        startup_profile.mark_ready()
     yield
     try:
         await close_redis()
@@ -39,6 +55,8 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    # 標準 json より速い orjson で書き出す
+    default_response_class=FastJSONResponse,
 )
 
 # CORS設定
@@ -48,8 +66,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # ブラウザから読めるようにするレスポンスヘッダ（/scores のキーセットページング、条件付き GET、
+    # DEBUG 時のクエリ統計）
+    expose_headers=["X-Next-Cursor", "ETag", QUERY_COUNT_HEADER, QUERY_TIME_HEADER],
 )
 
+# リクエストごとの SQL クエリ数 / DB 時間（しきい値超過・N+1 の疑いはログに出す）
+app.middleware("http")(query_stats_middleware)
+
+# 大きな JSON 応答（株価・資産推移・分析など）の gzip / Brotli 圧縮
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_level=settings.COMPRESSION_BROTLI_LEVEL,
+        use_brotli=settings.COMPRESSION_BROTLI,
+    )
+
 
 # グローバルエラーハンドラー
 @app.exception_handler(KabuTradeException)
@@ -83,47 +117,43 @@ async def health_check():
     return {"status": "healthy"}
 
 
-# APIルーターのインポート
-from app.api.v1 import stocks
+def _include_router(module: str, prefix: str, tag: str, **kwargs) -> None:
+    """app.api.v1.<module> の router を登録する（import 時間を起動プロファイルに記録）"""
+    with startup_profile.phase(f"router:{module}"):
+        router = importlib.import_module(f"app.api.v1.{module}").router
+        app.include_router(router, prefix=prefix, tags=[tag], **kwargs)
+
 
-app.include_router(stocks.router, prefix="/api/v1/stocks", tags=["stocks"])
+# APIルーターの登録（各ルーターは重いサービスをハンドラ内で import する）
+_include_router("stocks", "/api/v1/stocks", "stocks")
 
-# 評価機能（Phase 2）- pandas_taがインストールされている場合のみ
-try:
-    from app.api.v1 import evaluations
-    app.include_router(evaluations.router, prefix="/api/v1/evaluations", tags=["evaluations"])
-except ImportError:
-    # pandas_taがインストールされていない場合は評価機能をスキップ
-    pass
+# 評価機能（Phase 2）- pandas_taがインストールされている場合のみ（import せずに有無だけ見る）
+if importlib.util.find_spec("pandas_ta") is not None:
+    _include_router("evaluations", "/api/v1/evaluations", "evaluations")
 
 # チャート分析機能
-from app.api.v1 import chart_analysis
-app.include_router(chart_analysis.router, prefix="/api/v1/chart-analysis", tags=["chart-analysis"])
+_include_router("chart_analysis", "/api/v1/chart-analysis", "chart-analysis")
 
 # バッチスコアリング機能
-from app.api.v1 import batch
-app.include_router(batch.router, prefix="/api/v1/batch", tags=["batch"])
+_include_router("batch", "/api/v1/batch", "batch")
 
 # スコアAPI
-from app.api.v1 import scores
-app.include_router(scores.router, prefix="/api/v1/scores", tags=["scores"])
+_include_router("scores", "/api/v1/scores", "scores")
 
 # TradingView シグナル API
-from app.api.v1 import tradingview_signals
-app.include_router(tradingview_signals.router, prefix="/api/v1/tradingview-signals", tags=["tradingview-signals"])
+_include_router("tradingview_signals", "/api/v1/tradingview-signals", "tradingview-signals")
 
 # ポートフォリオ API
-from app.api.v1 import portfolio
-app.include_router(portfolio.router, prefix="/api/v1/portfolio", tags=["portfolio"])
+_include_router("portfolio", "/api/v1/portfolio", "portfolio")
 
 # 将来価値シミュレータ API
-from app.api.v1 import advisor
-app.include_router(advisor.router, prefix="/api/v1/advisor", tags=["advisor"])
+_include_router("advisor", "/api/v1/advisor", "advisor")
 
 # ペーパートレード API
-from app.api.v1 import paper_trade
-app.include_router(paper_trade.router, prefix="/api/v1/paper-trade", tags=["paper-trade"])
+_include_router("paper_trade", "/api/v1/paper-trade", "paper-trade")
+
+# 内部運用 API（プール統計など）
+_include_router("internal", "/api/v1/internal", "internal", include_in_schema=False)
 
 # 将来の拡張用
-# from app.api.v1 import strategies
-# app.include_router(strategies.router, prefix="/api/v1/strategies", tags=["strategies"])
+# _include_router("strategies", "/api/v1/strategies", "strategies")
@@ -0,0 +1,42 @@
+"""ScoringRun model - バッチスコアリングの実行世代"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Index, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+RUN_RUNNING = "running"
+RUN_PUBLISHED = "published"
+RUN_SUPERSEDED = "superseded"
+RUN_FAILED = "failed"
+
+
+class ScoringRun(Base):
+    """ScoringRun model - 1 回のバッチ実行（世代）
+
+    バッチは実行ごとに 1 行作り、stock_scores の各行に run_id として書く。
+    完走時に 1 トランザクションで latest_stock_scores をこの世代に差し替え、
+    status を published にする（公開中の世代は常に 1 つ。直前の世代は superseded）。
+    """
+
+    __tablename__ = "scoring_runs"
+    __table_args__ = (
+        # 公開中の世代は高々 1 行（参照は WHERE status = 'published' の 1 行引き）
+        Index(
+            "uq_scoring_runs_published",
+            "status",
+            unique=True,
+            postgresql_where=text("status = 'published'"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String(20), nullable=False, comment="SCORING_DATA_SOURCE")
+    status = Column(String(20), nullable=False, default=RUN_RUNNING, comment="running/published/superseded/failed")
+    started_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    published_at = Column(DateTime(timezone=True), nullable=True)
+    total = Column(Integer, nullable=True, comment="対象銘柄数")
+    processed = Column(Integer, nullable=True, comment="成功数（再開時はスキップ分を含む）")
+    failed = Column(Integer, nullable=True, comment="失敗数")
+
+    def __repr__(self):
+        return f"<ScoringRun(id={self.id}, status={self.status})>"
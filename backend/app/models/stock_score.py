@@ -1,17 +1,13 @@
 """StockScore model - バッチスコアリング結果"""
 
-from sqlalchemy import Column, Integer, Float, String, DateTime, JSON
+from sqlalchemy import Column, Integer, Float, String, DateTime, JSON, Index, text
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 
-class StockScore(Base):
-    """StockScore model - 全銘柄バッチスコアリング結果"""
+class StockScoreColumns:
+    """stock_scores / latest_stock_scores 共通のスコア列"""
 
-    __tablename__ = "stock_scores"
-
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    symbol = Column(String(10), nullable=False, index=True, comment="銘柄コード（例: 7203.T）")
     name = Column(String(100), nullable=True, comment="銘柄名")
     sector = Column(String(100), nullable=True, comment="セクター")
     scored_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), comment="スコア算出日時")
@@ -31,6 +27,70 @@ class StockScore(Base):
     macd_score = Column(Float, nullable=True)
     close_price = Column(Float, nullable=True, comment="終値（バッチ取得時点）")
     data_quality = Column(String(20), nullable=False, default="ok", comment="ok/fetch_error/partial")
+    run_id = Column(Integer, nullable=True, comment="scoring_runs.id（世代。migration 012 以前の行は NULL）")
+
+
+# latest_stock_scores へ写す列（id / symbol を除く共通列）
+SCORE_COLUMN_NAMES = tuple(
+    name for name, value in vars(StockScoreColumns).items() if isinstance(value, Column)
+)
+
+
+class StockScore(StockScoreColumns, Base):
+    """StockScore model - 全銘柄バッチスコアリング結果（履歴）
+
+    scored_at の月単位で RANGE パーティション化されている（migration 010）。
+    DB 上の PK は (id, scored_at) だが、id はシーケンスで一意なので ORM では id のみを識別子とする。
+    月ごとのパーティション作成と古い行の間引きは score_retention_service が行う。
+    """
+
+    __tablename__ = "stock_scores"
+    __table_args__ = (
+        Index("ix_stock_scores_symbol_scored_at", "symbol", text("scored_at DESC")),
+        Index(
+            "ix_stock_scores_valid_symbol_scored_at",
+            "symbol",
+            text("scored_at DESC"),
+            postgresql_where=text("data_quality NOT IN ('fetch_error', 'missing_tv')"),
+        ),
+        # 世代の公開（run_id で latest_stock_scores へ写す）用（migration 012）
+        Index("ix_stock_scores_run_id_symbol", "run_id", "symbol"),
+        {"postgresql_partition_by": "RANGE (scored_at)"},
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    symbol = Column(String(10), nullable=False, comment="銘柄コード（例: 7203.T）")
 
     def __repr__(self):
         return f"<StockScore(symbol={self.symbol}, total_score={self.total_score}, rating={self.rating})>"
+
+
+class LatestStockScore(StockScoreColumns, Base):
+    """LatestStockScore model - 銘柄ごとの最新スコア（1 銘柄 1 行）
+
+    バッチの完走時に、公開する世代（run_id）の行で 1 トランザクションで差し替える
+    （scoring_run_service.publish_run）。実行中の世代の行は見えない。
+    「銘柄ごとの最新」を読む箇所は履歴を GROUP BY せずこちらを引く。
+    """
+
+    __tablename__ = "latest_stock_scores"
+    __table_args__ = (
+        # 一覧（score_service.list_scores）のキーセットページング / フィルタ用（migration 011）
+        *(
+            Index(
+                f"ix_latest_stock_scores_{col}_symbol",
+                text(f"{col} DESC"),
+                "symbol",
+                postgresql_where=text(f"data_quality NOT IN ('fetch_error', 'missing_tv') AND {col} IS NOT NULL"),
+            )
+            for col in ("total_score", "fundamental_score", "technical_score", "kurotenko_score")
+        ),
+        Index("ix_latest_stock_scores_sector", "sector"),
+        Index("ix_latest_stock_scores_rating", "rating"),
+    )
+
+    symbol = Column(String(10), primary_key=True, comment="銘柄コード（例: 7203.T）")
+    id = Column(Integer, nullable=False, comment="元の stock_scores.id")
+
+    def __repr__(self):
+        return f"<LatestStockScore(symbol={self.symbol}, total_score={self.total_score}, rating={self.rating})>"
@@ -1,13 +1,56 @@
 """Stock repository"""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 from datetime import date
+from decimal import Decimal
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from sqlalchemy.orm import selectinload
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert
 from app.models.stock import Stock
 from app.models.stock_price import StockPrice
-from app.schemas.stock import StockInfo, StockPriceData
+from app.schemas.stock import StockInfo
+
+# 1 文あたりの行数（7 列 × 1000 行 = 7000 パラメータ。asyncpg の上限 32767 に収まる）
+PRICE_UPSERT_BATCH_SIZE = 1000
+PRICE_VALUE_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """Numeric 列へ渡す値を Decimal に揃える（PriceFrame の float 行も受けるため）"""
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def price_upsert_stmt(values: List[dict]):
+    """stock_prices への一括 upsert 文（(stock_code, date) 衝突時は値が変わった行だけ更新）"""
+    stmt = insert(StockPrice).values(values)
+    excluded = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=[StockPrice.stock_code, StockPrice.date],
+        set_={c: excluded[c] for c in PRICE_VALUE_COLUMNS},
+        # 同値の再保存で dead tuple / WAL を増やさない
+        where=or_(*(getattr(StockPrice, c).is_distinct_from(excluded[c]) for c in PRICE_VALUE_COLUMNS)),
+    )
+
+
+def stock_upsert_stmt(stock_info: StockInfo):
+    """stocks への upsert 文（RETURNING で更新後の Stock を返す）"""
+    stmt = insert(Stock).values(
+        code=stock_info.code,
+        name=stock_info.name,
+        sector=stock_info.sector,
+        market_cap=stock_info.market_cap,
+    )
+    excluded = stmt.excluded
+    return (
+        stmt.on_conflict_do_update(
+            index_elements=[Stock.code],
+            set_={"name": excluded.name, "sector": excluded.sector, "market_cap": excluded.market_cap},
+        )
+        .returning(Stock)
+        .execution_options(populate_existing=True)
+    )
 
 
 class StockRepository:
@@ -39,83 +82,49 @@ class StockRepository:
         Returns:
             Stock: 作成・更新された銘柄情報
         """
-        stock = await self.find_by_code(stock_info.code)
-
-        if stock:
-            # 更新
-            stock.name = stock_info.name
-            stock.sector = stock_info.sector
-            stock.market_cap = stock_info.market_cap
-        else:
-            # 作成
-            stock = Stock(
-                code=stock_info.code,
-                name=stock_info.name,
-                sector=stock_info.sector,
-                market_cap=stock_info.market_cap,
-            )
-            self.db.add(stock)
-
+        # SELECT → UPDATE/INSERT → refresh の 3 往復を INSERT ... ON CONFLICT ... RETURNING の 1 往復にする
+        result = await self.db.execute(stock_upsert_stmt(stock_info))
+        stock = result.scalar_one()
         await self.db.commit()
-        await self.db.refresh(stock)
         return stock
 
     async def save_prices(
-        self, code: str, prices: List[StockPriceData]
-    ) -> List[StockPrice]:
+        self, code: str, prices: Sequence[Any]
+    ) -> int:
         """
-        株価データを保存
+        株価データを一括 upsert で保存
+        
+        PRICE_UPSERT_BATCH_SIZE 行ずつ INSERT ... ON CONFLICT (stock_code, date) DO UPDATE を
+        発行する（1 年分なら 1 文）。保存後の行は読み直さない。
         
         Args:
             code: 銘柄コード
-            prices: 株価データのリスト
+            prices: 株価データのリスト（StockPriceData または PriceFrame の itertuples 行）
             
         Returns:
-            List[StockPrice]: 保存された株価データ
+            int: 保存した行数（同一日付の重複は後勝ちで 1 行に数える）
         """
-        saved_prices = []
-
-        for price_data in prices:
-            # 既存データを確認
-            result = await self.db.execute(
-                select(StockPrice).where(
-                    and_(
-                        StockPrice.stock_code == code,
-                        StockPrice.date == price_data.date,
-                    )
-                )
-            )
-            existing = result.scalar_one_or_none()
-
-            if existing:
-                # 更新
-                existing.open = price_data.open
-                existing.high = price_data.high
-                existing.low = price_data.low
-                existing.close = price_data.close
-                existing.volume = price_data.volume
-                saved_prices.append(existing)
-            else:
-                # 作成
-                new_price = StockPrice(
-                    stock_code=code,
-                    date=price_data.date,
-                    open=price_data.open,
-                    high=price_data.high,
-                    low=price_data.low,
-                    close=price_data.close,
-                    volume=price_data.volume,
-                )
-                self.db.add(new_price)
-                saved_prices.append(new_price)
+        # 同じ文の中で同一キーを 2 回更新すると PostgreSQL がエラーにするため日付で後勝ち重複除去
+        rows = {
+            price_data.date: {
+                "stock_code": code,
+                "date": price_data.date,
+                "open": _to_decimal(price_data.open),
+                "high": _to_decimal(price_data.high),
+                "low": _to_decimal(price_data.low),
+                "close": _to_decimal(price_data.close),
+                "volume": int(price_data.volume),
+            }
+            for price_data in prices
+        }
+        values = list(rows.values())
+        if not values:
+            return 0
 
+        for start in range(0, len(values), PRICE_UPSERT_BATCH_SIZE):
+            await self.db.execute(price_upsert_stmt(values[start:start + PRICE_UPSERT_BATCH_SIZE]))
         await self.db.commit()
-
-        # リフレッシュ
-        for price in saved_prices:
-            await self.db.refresh(price)
-
-        return saved_prices
+        return len(values)
 
     async def get_prices(
         self,
@@ -146,6 +155,90 @@ class StockRepository:
         result = await self.db.execute(query)
         return list(result.scalars().all())
 
+    async def get_price_rows(
+        self,
+        code: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> List[tuple]:
+        """
+        株価データを ORM を経由せず列タプルで取得（PriceFrame 構築用）
+        
+        Args:
+            code: 銘柄コード
+            start_date: 開始日（オプション）
+            end_date: 終了日（オプション）
+            
+        Returns:
+            List[tuple]: (date, open, high, low, close, volume) のリスト（日付昇順）
+        """
+        query = select(
+            StockPrice.date,
+            StockPrice.open,
+            StockPrice.high,
+            StockPrice.low,
+            StockPrice.close,
+            StockPrice.volume,
+        ).where(StockPrice.stock_code == code)
+
+        if start_date:
+            query = query.where(StockPrice.date >= start_date)
+        if end_date:
+            query = query.where(StockPrice.date <= end_date)
+
+        query = query.order_by(StockPrice.date)
+
+        result = await self.db.execute(query)
+        return [tuple(row) for row in result.all()]
+
+    async def get_price_rows_many(
+        self,
+        codes: List[str],
+        start_date: date,
+        end_date: date,
+    ) -> Dict[str, List[tuple]]:
+        """
+        複数銘柄の株価を 1 クエリで列タプルとして取得（一括取得 API 向け）
+
+        Returns:
+            Dict[str, List[tuple]]: 銘柄コード → (date, open, high, low, close, volume) のリスト（日付昇順）。
+            行の無い銘柄は含まない
+        """
+        query = (
+            select(
+                StockPrice.stock_code,
+                StockPrice.date,
+                StockPrice.open,
+                StockPrice.high,
+                StockPrice.low,
+                StockPrice.close,
+                StockPrice.volume,
+            )
+            .where(
+                StockPrice.stock_code.in_(codes),
+                StockPrice.date >= start_date,
+                StockPrice.date <= end_date,
+            )
+            .order_by(StockPrice.stock_code, StockPrice.date)
+        )
+        result = await self.db.execute(query)
+        out: Dict[str, List[tuple]] = {}
+        for code, *row in result.all():
+            out.setdefault(code, []).append(tuple(row))
+        return out
+
+    async def get_names(self, codes: List[str]) -> Dict[str, str]:
+        """銘柄コード → 銘柄名（stocks に無い銘柄は含まない）"""
+        result = await self.db.execute(select(Stock.code, Stock.name).where(Stock.code.in_(codes)))
+        return {code: name for code, name in result.all()}
+
+    async def get_latest_price_date(self, code: str) -> Optional[date]:
+        """最新の株価日付（(stock_code, date) の一意索引だけで引ける。無ければ None）"""
+        result = await self.db.execute(
+            select(func.max(StockPrice.date)).where(StockPrice.stock_code == code)
+        )
+        return result.scalar_one_or_none()
+
     async def get_latest_price(self, code: str) -> Optional[StockPrice]:
         """
         最新の株価データを取得
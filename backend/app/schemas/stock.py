@@ -2,9 +2,14 @@
 
 from datetime import date as date_type, datetime
 from decimal import Decimal
-from typing import List, Optional
+from typing import List, Literal, Optional
 from pydantic import BaseModel, Field
 
+from app.core.config import settings
+
+# StockService._parse_period_to_days が受け付ける期間
+PricePeriod = Literal["1d", "1w", "1m", "3m", "6m", "1y", "2y", "5y"]
+
 
 class StockInfo(BaseModel):
     """銘柄情報スキーマ"""
@@ -35,6 +40,19 @@ class StockPriceData(BaseModel):
         from_attributes = True
 
 
+class StockPriceBatchRequest(BaseModel):
+    """一括株価取得リクエストスキーマ"""
+
+    codes: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.PRICES_BATCH_MAX_CODES,
+        description="銘柄コードのリスト",
+        example=["7203", "6758"],
+    )
+    period: PricePeriod = Field("1y", description="期間（1d, 1w, 1m, 3m, 6m, 1y, 2y, 5y）", example="1y")
+
+
 class StockPriceResponse(BaseModel):
     """株価データレスポンススキーマ"""
 
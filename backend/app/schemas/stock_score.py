@@ -27,6 +27,8 @@ class StockScoreResponse(BaseModel):
     macd_score: Optional[float] = None
     close_price: Optional[float] = None
     data_quality: str = "ok"
+    # このスコアを公開したスコアリング世代（scoring_runs.id）
+    run_id: Optional[int] = None
     # プロファイル適用時にのみ埋まる
     profile_score: Optional[float] = None
     profile_name: Optional[str] = None
@@ -1,48 +1,139 @@
 """多軸分析集約サービス
 
-stock_scores（最新1件）、chart_analyses（最新1件）、tradingview_signals（最新1件）を
-symbol で結合して返す。
+latest_stock_scores、chart_analyses（最新1件）、tradingview_signals（最新1件）を
+symbol で結合して 1 文で取得し、AnalysisAxesResponse として返す。
+
+組み立て済みのレスポンスは銘柄ごとに Redis にキャッシュする。スコア（バッチの
+latest_stock_scores 反映）・チャート分析・TradingView シグナルの書き込み時に
+invalidate_axes_cache / invalidate_axes_cache_sync で該当銘柄のキーを消す。
 """
 
+import logging
+from typing import Iterable, Optional
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import String, desc, literal, select, true
+from sqlalchemy.orm import aliased
 
-from app.models.stock_score import StockScore
+from app.core.redis_client import get_redis, scan_delete_sync
+from app.models.stock_score import LatestStockScore
 from app.models.chart_analysis import ChartAnalysis
 from app.models.tradingview_signal import TradingViewSignal
 from app.schemas.stock_score import AnalysisAxesResponse, AnalysisAxis
 
+logger = logging.getLogger(__name__)
 
-async def get_analysis_axes(symbol: str, db: AsyncSession) -> AnalysisAxesResponse:
-    """symbol の全分析軸を集約して返す。"""
+AXES_CACHE_KEY_FMT = "analysis_axes:{symbol}"
+# 書き込み時に明示的に消すので長めでよい（取りこぼしの上限）
+AXES_CACHE_TTL_SEC = 3600
 
-    score_stmt = (
-        select(StockScore)
-        .where(StockScore.symbol == symbol)
-        .order_by(desc(StockScore.scored_at))
-        .limit(1)
-    )
-    score_result = await db.execute(score_stmt)
-    stock_score = score_result.scalar_one_or_none()
 
-    chart_stmt = (
+def axes_stmt(symbol: str):
+    """3 軸の最新行を 1 往復で取る文（該当なしの軸は None）。
+
+    1 行だけの起点に LEFT JOIN するため、どの軸が欠けていても必ず 1 行返る。
+    chart / TV は (symbol) インデックスで絞ってから LIMIT 1。
+    """
+    anchor = select(literal(symbol, String).label("symbol")).subquery("k")
+    chart_sq = (
         select(ChartAnalysis)
         .where(ChartAnalysis.symbol == symbol)
         .order_by(desc(ChartAnalysis.created_at))
         .limit(1)
+        .subquery("chart")
     )
-    chart_result = await db.execute(chart_stmt)
-    chart_analysis = chart_result.scalar_one_or_none()
-
-    tv_stmt = (
+    tv_sq = (
         select(TradingViewSignal)
         .where(TradingViewSignal.symbol == symbol)
         .order_by(desc(TradingViewSignal.updated_at))
         .limit(1)
+        .subquery("tv")
+    )
+    chart = aliased(ChartAnalysis, chart_sq)
+    tv = aliased(TradingViewSignal, tv_sq)
+    return (
+        select(LatestStockScore, chart, tv)
+        .select_from(anchor)
+        .outerjoin(LatestStockScore, LatestStockScore.symbol == anchor.c.symbol)
+        .outerjoin(chart_sq, true())
+        .outerjoin(tv_sq, true())
     )
-    tv_result = await db.execute(tv_stmt)
-    tv_signal = tv_result.scalar_one_or_none()
 
+
+async def _get_cached(symbol: str) -> Optional[AnalysisAxesResponse]:
+    try:
+        redis = await get_redis()
+        raw = await redis.get(AXES_CACHE_KEY_FMT.format(symbol=symbol))
+        if raw:
+            return AnalysisAxesResponse.model_validate_json(raw)
+    except Exception:
+        # Redis接続エラー / 旧形式の場合はスキップ
+        pass
+    return None
+
+
+async def _set_cached(response: AnalysisAxesResponse) -> None:
+    try:
+        redis = await get_redis()
+        await redis.setex(
+            AXES_CACHE_KEY_FMT.format(symbol=response.symbol),
+            AXES_CACHE_TTL_SEC,
+            response.model_dump_json(),
+        )
+    except Exception:
+        pass
+
+
+async def invalidate_axes_cache(symbols: Iterable[str]) -> None:
+    """書き込み後（commit 後）に呼ぶ。Redis が使えなければ何もしない（TTL で失効）。"""
+    keys = [AXES_CACHE_KEY_FMT.format(symbol=s) for s in set(symbols)]
+    if not keys:
+        return
+    try:
+        redis = await get_redis()
+        await redis.delete(*keys)
+    except Exception as e:
+        logger.debug("analysis axes キャッシュ削除失敗: %s", e)
+
+
+def invalidate_axes_cache_sync(redis_client, symbols: Iterable[str]) -> None:
+    """バッチ（同期 Redis クライアント）用の invalidate_axes_cache。"""
+    keys = [AXES_CACHE_KEY_FMT.format(symbol=s) for s in set(symbols)]
+    if redis_client is None or not keys:
+        return
+    try:
+        redis_client.delete(*keys)
+    except Exception as e:
+        logger.warning("analysis axes キャッシュ削除失敗: %s", e)
+
+
+def invalidate_all_axes_cache_sync(redis_client) -> int:
+    """全銘柄の分析軸キャッシュを消す（スコア世代の公開時）。削除件数を返す。"""
+    if redis_client is None:
+        return 0
+    try:
+        return scan_delete_sync(redis_client, AXES_CACHE_KEY_FMT.format(symbol="*"))
+    except Exception as e:
+        logger.warning("analysis axes キャッシュ全削除失敗: %s", e)
+    return 0
+
+
+async def get_analysis_axes(symbol: str, db: AsyncSession, use_cache: bool = True) -> AnalysisAxesResponse:
+    """symbol の全分析軸を集約して返す。"""
+    if use_cache:
+        cached = await _get_cached(symbol)
+        if cached is not None:
+            return cached
+
+    row = (await db.execute(axes_stmt(symbol))).one()
+    response = build_axes_response(symbol, *row)
+    if use_cache:
+        await _set_cached(response)
+    return response
+
+
+def build_axes_response(symbol: str, stock_score, chart_analysis, tv_signal) -> AnalysisAxesResponse:
+    """各軸の最新行（無ければ None）から AnalysisAxesResponse を組み立てる。"""
     axes = []
 
     if stock_score:
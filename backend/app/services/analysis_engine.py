@@ -1,24 +1,28 @@
 """Analysis engine - 分析エンジン"""
 
-from typing import List, Dict, Any
-from decimal import Decimal
-from app.schemas.stock import StockInfo, StockPriceData
-from app.utils.technical_indicators import TechnicalIndicators
+from typing import Dict, Any
+from app.schemas.stock import StockInfo
+from app.utils.technical_indicators import PriceInput, TechnicalIndicators
 from app.utils.fundamental_analysis import FundamentalAnalysis
 
+# サポート/レジスタンス水準の「付近」とみなす現在値との乖離率
+SR_PROXIMITY = 0.02
+# 複数回意識された（ピボットが 2 つ以上ある）水準のみシグナルに使う
+SR_MIN_TOUCHES = 2
+
 
 class AnalysisEngine:
     """分析エンジン - テクニカル・ファンダメンタル分析の実行"""
 
     @staticmethod
     def calculate_technical_indicators(
-        prices: List[StockPriceData],
+        prices: PriceInput,
     ) -> Dict[str, Any]:
         """
         テクニカル指標を計算
         
         Args:
-            prices: 株価データのリスト
+            prices: 株価データ（PriceFrame または StockPriceData のリスト）
             
         Returns:
             Dict[str, Any]: テクニカル指標
@@ -44,7 +48,7 @@ class AnalysisEngine:
     def determine_buy_signal(
         technical: Dict[str, Any],
         fundamental: Dict[str, Any],
-        current_price: Decimal,
+        current_price: float,
     ) -> Dict[str, Any]:
         """
         買いシグナルを判定
@@ -61,7 +65,7 @@ class AnalysisEngine:
         reasons = []
 
         # RSI判定
-        rsi = technical.get("rsi", Decimal("50"))
+        rsi = technical.get("rsi", 50.0)
         if rsi < 30:
             score += 30
             reasons.append(f"RSI {rsi:.1f}が30を下回っており、売られすぎの可能性")
@@ -71,26 +75,37 @@ class AnalysisEngine:
 
         # 移動平均線判定
         ma = technical.get("moving_averages", {})
-        ma_short = ma.get("ma_short", Decimal("0"))
-        ma_long = ma.get("ma_long", Decimal("0"))
+        ma_short = ma.get("ma_short", 0.0)
+        ma_long = ma.get("ma_long", 0.0)
         if ma_short > ma_long and ma_short > 0 and ma_long > 0:
             score += 20
             reasons.append("短期移動平均線が長期移動平均線を上回っている（ゴールデンクロス）")
 
         # MACD判定
         macd_data = technical.get("macd", {})
-        macd_histogram = macd_data.get("histogram", Decimal("0"))
+        macd_histogram = macd_data.get("histogram", 0.0)
         if macd_histogram > 0:
             score += 15
             reasons.append("MACDヒストグラムがプラスで上昇トレンド")
 
         # ボリンジャーバンド判定
         bb = technical.get("bollinger_bands", {})
-        lower_band = bb.get("lower", Decimal("0"))
+        lower_band = bb.get("lower", 0.0)
         if current_price <= lower_band and lower_band > 0:
             score += 15
             reasons.append("株価がボリンジャーバンドの下バンドに近づいている")
 
+        # サポートライン判定
+        sr = technical.get("support_resistance", {})
+        support = sr.get("support", 0.0)
+        if (
+            support > 0
+            and sr.get("support_touches", 0.0) >= SR_MIN_TOUCHES
+            and support <= current_price <= support * (1 + SR_PROXIMITY)
+        ):
+            score += 10
+            reasons.append(f"株価がサポートライン {support:.1f} 付近で下げ止まりの可能性")
+
         # ファンダメンタル判定
         fundamental_score = fundamental.get("score", 50)
         if fundamental_score >= 70:
@@ -123,7 +138,7 @@ class AnalysisEngine:
     def determine_sell_signal(
         technical: Dict[str, Any],
         fundamental: Dict[str, Any],
-        current_price: Decimal,
+        current_price: float,
     ) -> Dict[str, Any]:
         """
         売りシグナルを判定
@@ -140,7 +155,7 @@ class AnalysisEngine:
         reasons = []
 
         # RSI判定
-        rsi = technical.get("rsi", Decimal("50"))
+        rsi = technical.get("rsi", 50.0)
         if rsi > 70:
             score += 30
             reasons.append(f"RSI {rsi:.1f}が70を上回っており、買われすぎの可能性")
@@ -150,26 +165,37 @@ class AnalysisEngine:
 
         # 移動平均線判定
         ma = technical.get("moving_averages", {})
-        ma_short = ma.get("ma_short", Decimal("0"))
-        ma_long = ma.get("ma_long", Decimal("0"))
+        ma_short = ma.get("ma_short", 0.0)
+        ma_long = ma.get("ma_long", 0.0)
         if ma_short < ma_long and ma_short > 0 and ma_long > 0:
             score += 20
             reasons.append("短期移動平均線が長期移動平均線を下回っている（デッドクロス）")
 
         # MACD判定
         macd_data = technical.get("macd", {})
-        macd_histogram = macd_data.get("histogram", Decimal("0"))
+        macd_histogram = macd_data.get("histogram", 0.0)
         if macd_histogram < 0:
             score += 15
             reasons.append("MACDヒストグラムがマイナスで下降トレンド")
 
         # ボリンジャーバンド判定
         bb = technical.get("bollinger_bands", {})
-        upper_band = bb.get("upper", Decimal("0"))
+        upper_band = bb.get("upper", 0.0)
         if current_price >= upper_band and upper_band > 0:
             score += 15
             reasons.append("株価がボリンジャーバンドの上バンドに近づいている")
 
+        # レジスタンスライン判定
+        sr = technical.get("support_resistance", {})
+        resistance = sr.get("resistance", 0.0)
+        if (
+            resistance > 0
+            and sr.get("resistance_touches", 0.0) >= SR_MIN_TOUCHES
+            and resistance * (1 - SR_PROXIMITY) <= current_price <= resistance
+        ):
+            score += 10
+            reasons.append(f"株価がレジスタンスライン {resistance:.1f} 付近で上値が重い可能性")
+
         # ファンダメンタル判定
         fundamental_score = fundamental.get("score", 50)
         if fundamental_score < 30:
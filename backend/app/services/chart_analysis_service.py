@@ -1,14 +1,21 @@
 """Chart analysis service - 指標計算とヒューリスティックで分析を自動生成"""
 
-from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Any, Dict
+
+import pandas as pd
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.chart_analysis import ChartAnalysis
-from app.schemas.stock import StockPriceData
+from app.services.analysis_axes_service import invalidate_axes_cache
 from app.services.stock_service import StockService
 from app.utils.technical_indicators import TechnicalIndicators
 
+# 日足分析は従来どおり直近 1 年分（DB の 1 年分で足りる）。週足・月足は本数を確保するため
+# 5 年分の日足から集約する（どちらも銘柄ごとの正準系列 1 つから切り出す）
+DAILY_PERIOD = "1y"
+RESAMPLE_SOURCE_PERIOD = "5y"
+TIMEFRAME_LABELS = {"1D": "日足", "1W": "週足", "1M": "月足"}
+
 
 class ChartAnalysisService:
     """テクニカル指標からルールベースで分析を生成し、DB に保存するサービス"""
@@ -20,21 +27,21 @@ class ChartAnalysisService:
     async def generate_and_save(
         self, symbol: str, timeframe: str = "1D"
     ) -> ChartAnalysis:
-        prices: List[StockPriceData] = await self.stock_service.get_stock_prices(
-            symbol, period="1y"
-        )
-        if not prices:
+        if timeframe not in TIMEFRAME_LABELS:
+            raise ValueError(f"unsupported timeframe: {timeframe}")
+        prices = await self._load_frame(symbol, timeframe)
+        if prices.empty:
             raise ValueError(f"price data unavailable for {symbol}")
 
         indicators = TechnicalIndicators.calculate_all_indicators(prices)
-        last_close = Decimal(str(prices[-1].close))
+        last_close = float(prices["close"].iloc[-1])
 
         score = self._score_signals(indicators, last_close)
         trend = self._derive_trend(score)
         recommendation = self._derive_recommendation(score)
         signals_dict = self._build_signals_dict(indicators, last_close)
         summary = self._build_summary(
-            symbol, last_close, indicators, trend, recommendation
+            symbol, last_close, indicators, trend, recommendation, timeframe
         )
 
         analysis = ChartAnalysis(
@@ -49,10 +56,19 @@ class ChartAnalysisService:
         self.db.add(analysis)
         await self.db.commit()
         await self.db.refresh(analysis)
+        await invalidate_axes_cache([symbol])
         return analysis
 
+    async def _load_frame(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        """時間足に応じた PriceFrame を返す。週足・月足は共有日足からの集約。"""
+        if timeframe == "1D":
+            return await self.stock_service.get_price_frame(symbol, period=DAILY_PERIOD)
+        return await self.stock_service.get_resampled_frame(
+            symbol, timeframe, period=RESAMPLE_SOURCE_PERIOD
+        )
+
     @staticmethod
-    def _score_signals(indicators: Dict[str, Any], close: Decimal) -> int:
+    def _score_signals(indicators: Dict[str, Any], close: float) -> int:
         score = 0
         ma = indicators["moving_averages"]
         ma_s, ma_m, ma_l = ma["ma_short"], ma["ma_medium"], ma["ma_long"]
@@ -104,12 +120,17 @@ class ChartAnalysisService:
         return "hold"
 
     @staticmethod
-    def _fmt(value: Decimal, digits: int = 2) -> str:
-        return f"{float(value):.{digits}f}"
+    def _fmt(value: float, digits: int = 2) -> str:
+        return f"{value:.{digits}f}"
+
+    @staticmethod
+    def _touches(count: float) -> str:
+        # ピボット由来の水準のみ接触回数を付ける（0 は直近高安値による代替）
+        return f" ({int(count)}回)" if count > 0 else ""
 
     @classmethod
     def _build_signals_dict(
-        cls, indicators: Dict[str, Any], close: Decimal
+        cls, indicators: Dict[str, Any], close: float
     ) -> Dict[str, str]:
         ma = indicators["moving_averages"]
         macd = indicators["macd"]
@@ -147,17 +168,21 @@ class ChartAnalysisService:
             "macd": f"{cls._fmt(macd['macd'], 3)} vs Signal {cls._fmt(macd['signal'], 3)} ({macd_cross})",
             "bollinger": f"upper {cls._fmt(bb['upper'])} / lower {cls._fmt(bb['lower'])} / price {cls._fmt(close)} ({bb_position})",
             "ma": f"5日 {cls._fmt(ma['ma_short'])} / 25日 {cls._fmt(ma['ma_medium'])} / 75日 {cls._fmt(ma['ma_long'])} — {ma_alignment}",
-            "support_resistance": f"S {cls._fmt(sr['support'])} / R {cls._fmt(sr['resistance'])}",
+            "support_resistance": (
+                f"S {cls._fmt(sr['support'])}{cls._touches(sr.get('support_touches', 0.0))}"
+                f" / R {cls._fmt(sr['resistance'])}{cls._touches(sr.get('resistance_touches', 0.0))}"
+            ),
         }
 
     @classmethod
     def _build_summary(
         cls,
         symbol: str,
-        close: Decimal,
+        close: float,
         indicators: Dict[str, Any],
         trend: str,
         recommendation: str,
+        timeframe: str = "1D",
     ) -> str:
         ma = indicators["moving_averages"]
         macd = indicators["macd"]
@@ -195,7 +220,7 @@ class ChartAnalysisService:
         )
 
         return (
-            f"{symbol} 日足は{trend_jp}・推奨は{rec_jp}。"
+            f"{symbol} {TIMEFRAME_LABELS.get(timeframe, '日足')}は{trend_jp}・推奨は{rec_jp}。"
             f"{ma_note}。{macd_note}、{rsi_note}、{bb_note}。"
             f"価格 {cls._fmt(close)} / BB {cls._fmt(bb['lower'])}〜{cls._fmt(bb['upper'])}。"
         )
@@ -39,8 +39,8 @@ class EvaluationService:
             raise StockNotFoundError(code)
 
         # 株価データを取得
-        prices = await self.stock_service.get_stock_prices(code, period=period)
-        if not prices:
+        prices = await self.stock_service.get_price_frame(code, period=period)
+        if prices.empty:
             raise StockNotFoundError(f"{code}の株価データが見つかりません")
 
         # テクニカル分析
@@ -50,7 +50,11 @@ class EvaluationService:
         fundamental = self.analysis_engine.calculate_fundamental_metrics(stock_info)
 
         # 現在の株価を取得
-        current_price = stock_info.current_price or prices[-1].close
+        current_price = (
+            float(stock_info.current_price)
+            if stock_info.current_price
+            else float(prices["close"].iloc[-1])
+        )
 
         # 買い時・売り時判定
         buy_signal = self.analysis_engine.determine_buy_signal(
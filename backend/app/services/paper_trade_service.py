@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException
 
 from app.models.paper_trade import PaperAccount, PaperHolding, PaperTrade
-from app.models.stock_score import StockScore
+from app.models.stock_score import LatestStockScore
 from app.models.stock_price import StockPrice
 
 
@@ -16,7 +16,7 @@ LOT_SIZE = 100  # 日本株の単元株
 
 
 # =================================================================
-# 現在値取得ヘルパ（Portfolio と同じ経路：stock_scores の最新 close_price）
+# 現在値取得ヘルパ（Portfolio と同じ経路：latest_stock_scores の close_price）
 # =================================================================
 
 async def load_latest_prices(db: AsyncSession, symbols: Sequence[str]) -> dict[str, Optional[float]]:
@@ -24,16 +24,8 @@ async def load_latest_prices(db: AsyncSession, symbols: Sequence[str]) -> dict[s
     if not symbols:
         return {}
     try:
-        latest_subq = (
-            select(StockScore.symbol, func.max(StockScore.scored_at).label("max_at"))
-            .where(StockScore.symbol.in_(list(symbols)))
-            .group_by(StockScore.symbol)
-            .subquery()
-        )
-        stmt = select(StockScore.symbol, StockScore.close_price).join(
-            latest_subq,
-            (StockScore.symbol == latest_subq.c.symbol)
-            & (StockScore.scored_at == latest_subq.c.max_at),
+        stmt = select(LatestStockScore.symbol, LatestStockScore.close_price).where(
+            LatestStockScore.symbol.in_(list(symbols))
         )
         result = await db.execute(stmt)
         return {row.symbol: row.close_price for row in result.all() if row.close_price is not None}
@@ -465,10 +457,35 @@ async def _load_or_fetch_prices(
     if rows:
         return rows
     from app.services.stock_service import StockService
-    svc_prices = await StockService(db).get_stock_prices(
+    frame = await StockService(db).get_price_frame(
         symbol, start_date=from_date, end_date=to_date, use_cache=False
     )
-    return [(symbol, p.date, float(p.close)) for p in svc_prices]
+    return [(symbol, d, c) for d, c in zip(frame["date"], frame["close"].tolist())]
+
+
+def chart_version_stmt():
+    """チャートの版（口座, 最終取引 ID, 取引銘柄の最新株価日）を 1 往復で取る文"""
+    own_trades = PaperTrade.account_id == PaperAccount.id
+    traded_symbols = select(PaperTrade.symbol).where(own_trades).correlate(PaperAccount)
+    return select(
+        PaperAccount.id,
+        PaperAccount.started_at,
+        PaperAccount.initial_cash,
+        select(func.max(PaperTrade.id)).where(own_trades).scalar_subquery().label("last_trade_id"),
+        select(func.max(StockPrice.date))
+        .where(StockPrice.stock_code.in_(traded_symbols))
+        .scalar_subquery()
+        .label("last_price_date"),
+    ).limit(1)
+
+
+async def chart_version(db: AsyncSession) -> Optional[tuple]:
+    """reconstruct_chart の結果を決める版（ETag 用）。口座未初期化なら None。
+
+    取引の追加・リセット（started_at / 取引 ID が変わる）と株価の追加で変わる。
+    """
+    row = (await db.execute(chart_version_stmt())).first()
+    return tuple(row) if row is not None else None
 
 
 async def reconstruct_chart(
@@ -3,11 +3,11 @@
 from datetime import date, datetime
 from typing import Optional, Sequence
 
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.portfolio import Holding, PortfolioSetting, TradeHistory
-from app.models.stock_score import StockScore
+from app.models.stock_score import LatestStockScore
 
 
 NISA_GROWTH_ANNUAL_LIMIT = 2_400_000  # 成長投資枠年間上限 (円)
@@ -54,20 +54,12 @@ async def _upsert_setting(db: AsyncSession, key: str, value: str):
 # ---------- 評価・進捗 ----------
 
 async def _load_latest_prices(db: AsyncSession, symbols: Sequence[str]) -> dict[str, Optional[float]]:
-    """symbol ごとに最新 scored_at の close_price を返す。該当なしは含まない。"""
+    """symbol ごとに最新（latest_stock_scores）の close_price を返す。該当なしは含まない。"""
     if not symbols:
         return {}
     try:
-        latest_subq = (
-            select(StockScore.symbol, func.max(StockScore.scored_at).label("max_at"))
-            .where(StockScore.symbol.in_(list(symbols)))
-            .group_by(StockScore.symbol)
-            .subquery()
-        )
-        stmt = select(StockScore.symbol, StockScore.close_price).join(
-            latest_subq,
-            (StockScore.symbol == latest_subq.c.symbol)
-            & (StockScore.scored_at == latest_subq.c.max_at),
+        stmt = select(LatestStockScore.symbol, LatestStockScore.close_price).where(
+            LatestStockScore.symbol.in_(list(symbols))
         )
         result = await db.execute(stmt)
         return {row.symbol: row.close_price for row in result.all()}
@@ -77,7 +69,7 @@ async def _load_latest_prices(db: AsyncSession, symbols: Sequence[str]) -> dict[
 
 async def calc_total_value(db: AsyncSession, holdings: Optional[Sequence[Holding]] = None) -> tuple[float, float]:
     """(total_value, total_cost) を返す。
-    total_value は最新の stock_scores.close_price × quantity の合計。
+    total_value は最新の latest_stock_scores.close_price × quantity の合計。
     close_price が未取得の銘柄は avg_price をフォールバックに使用する。
     """
     if holdings is None:
@@ -7,14 +7,15 @@ Phase 4 の phase_scorer（ライフステージボーナス）もここから
 from typing import List, Literal, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import select
 
 from app.analyzer.scoring_profiles import (
     ScoringProfile,
     compute_phase_score,
     get_profile,
 )
-from app.models.stock_score import StockScore
+from app.models.stock_score import LatestStockScore
+from app.services.score_service import INVALID_DATA_QUALITY, ScoreFilters, apply_score_filters
 
 
 ProfileKey = Literal["growth", "balanced", "income", "auto"]
@@ -25,26 +26,22 @@ async def list_scores_with_profile(
     profile_key: str,
     limit: int = 100,
     progress_rate: Optional[float] = None,
+    filters: Optional[ScoreFilters] = None,
 ) -> list[dict]:
-    """最新スコアを取得し、プロファイル適用後の phase_score で並べ直す。
+    """最新スコア（latest_stock_scores）を取得し、プロファイル適用後の phase_score で並べ直す。
 
     profile_key="auto" のときは phase_scorer から進捗率に応じたプロファイルを選択する。
     返り値は StockScore ORM + profile_score/profile_name/current_phase/adjusted_total_score
-    を載せた dict のリスト。
+    を載せた dict のリスト。filters は再ランク付けの前に SQL で適用する。
     """
-    subq = (
-        select(StockScore.symbol, func.max(StockScore.scored_at).label("latest"))
-        .group_by(StockScore.symbol)
-        .subquery()
-    )
     stmt = (
-        select(StockScore)
-        .join(subq, (StockScore.symbol == subq.c.symbol) & (StockScore.scored_at == subq.c.latest))
-        .where(StockScore.data_quality.notin_(["fetch_error", "missing_tv"]))
-        .where(StockScore.total_score.is_not(None))
+        select(LatestStockScore)
+        .where(LatestStockScore.data_quality.notin_(INVALID_DATA_QUALITY))
+        .where(LatestStockScore.total_score.is_not(None))
     )
+    stmt = apply_score_filters(stmt, LatestStockScore, filters)
     result = await db.execute(stmt)
-    scores: List[StockScore] = list(result.scalars().all())
+    scores: List[LatestStockScore] = list(result.scalars().all())
 
     profile, current_phase = _resolve_profile(profile_key, progress_rate)
 
@@ -0,0 +1,110 @@
+"""スコア一覧（GET /scores）の応答キャッシュ
+
+一覧はバッチが世代を公開したときにしか変わらないため、シリアライズ済みの JSON を
+Redis に置き、2 回目以降は DB もシリアライズも通さずに返す。
+
+キーは (sort, limit, profile, cursor, フィルタ) と公開中の世代（scoring_runs.id）から作る:
+
+    scores_resp:{generation}:{パラメータの sha1}
+
+値は「次ページカーソル（無ければ空）」の 1 行 + 改行 + レスポンス本文。
+世代が切り替われば新しいキーを引くので古いエントリは自然に使われなくなり、
+publish_run からも invalidate_score_cache_sync で一括削除する。
+"""
+
+import dataclasses
+import hashlib
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.redis_client import get_redis, scan_delete_sync
+from app.core.responses import dumps, model_rows
+from app.schemas.stock_score import StockScoreResponse
+from app.services.score_service import ScoreFilters
+from app.services.scoring_run_service import get_published_run_id
+
+logger = logging.getLogger(__name__)
+
+SCORES_CACHE_KEY_PREFIX = "scores_resp"
+
+
+def list_params(
+    sort: str,
+    limit: int,
+    profile: Optional[str],
+    cursor: Optional[str],
+    filters: ScoreFilters,
+) -> Dict[str, Any]:
+    """応答を一意に決めるパラメータ（profile=auto は解決後のフェーズを渡す）。"""
+    filter_values = dataclasses.asdict(filters)
+    filter_values["ratings"] = sorted(filter_values["ratings"])
+    return {"sort": sort, "limit": limit, "profile": profile, "cursor": cursor, **filter_values}
+
+
+def cache_key(generation: int, params: Dict[str, Any]) -> str:
+    raw = json.dumps(params, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    digest = hashlib.sha1(raw.encode()).hexdigest()
+    return f"{SCORES_CACHE_KEY_PREFIX}:{generation}:{digest}"
+
+
+def serialize_scores(items: list) -> bytes:
+    """スコア ORM / dict のリストを StockScoreResponse の JSON 配列にする（行ごとの検証なし）。"""
+    return dumps(model_rows(items, StockScoreResponse))
+
+
+def encode_entry(body: bytes, next_cursor: Optional[str]) -> str:
+    return f"{next_cursor or ''}\n{body.decode()}"
+
+
+def decode_entry(raw: str) -> Tuple[bytes, Optional[str]]:
+    next_cursor, _, body = raw.partition("\n")
+    return body.encode(), next_cursor or None
+
+
+async def current_generation(db: AsyncSession) -> Optional[int]:
+    """公開中の世代（Redis → DB の順）。未公開なら None（キャッシュしない）。"""
+    try:
+        redis = await get_redis()
+    except Exception:
+        redis = None
+    return await get_published_run_id(db, redis)
+
+
+async def get_cached(key: str) -> Optional[Tuple[bytes, Optional[str]]]:
+    """(本文, 次ページカーソル)。ヒットしなければ None。"""
+    if settings.SCORES_RESPONSE_CACHE_TTL_SEC <= 0:
+        return None
+    try:
+        redis = await get_redis()
+        raw = await redis.get(key)
+        if raw is not None:
+            return decode_entry(raw)
+    except Exception:
+        # Redis接続エラーの場合はスキップ
+        pass
+    return None
+
+
+async def set_cached(key: str, body: bytes, next_cursor: Optional[str]) -> None:
+    if settings.SCORES_RESPONSE_CACHE_TTL_SEC <= 0:
+        return
+    try:
+        redis = await get_redis()
+        await redis.setex(key, settings.SCORES_RESPONSE_CACHE_TTL_SEC, encode_entry(body, next_cursor))
+    except Exception:
+        pass
+
+
+def invalidate_score_cache_sync(redis_client) -> int:
+    """全世代のスコア一覧キャッシュを消す（世代の公開時）。削除件数を返す。"""
+    if redis_client is None:
+        return 0
+    try:
+        return scan_delete_sync(redis_client, f"{SCORES_CACHE_KEY_PREFIX}:*")
+    except Exception as e:
+        logger.warning("スコア一覧キャッシュ削除失敗: %s", e)
+    return 0
@@ -0,0 +1,162 @@
+"""最新スコア全件のストリーミングエクスポート
+
+latest_stock_scores をサーバーサイドカーソルで chunk_size 行ずつ読み、
+NDJSON または Arrow IPC（stream format）のバイト列としてチャンクごとに返す。
+ORM オブジェクトや pydantic モデルは作らず、列タプルを直接エンコードするため
+メモリ使用量は全体件数に依らずチャンク 1 つ分で一定。
+
+Arrow は pyarrow が必要（未インストール環境では NDJSON のみ）。
+"""
+
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence
+
+from sqlalchemy import DateTime, Float, Integer, JSON, String, select
+
+from app.core import database
+from app.models.stock_score import LatestStockScore
+from app.services.score_service import INVALID_DATA_QUALITY, ScoreFilters, apply_score_filters
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+# エクスポート可能な列（テーブル定義順）
+EXPORT_COLUMNS: Dict[str, Any] = {c.name: c for c in LatestStockScore.__table__.columns}
+
+
+def resolve_columns(fields: Optional[str]) -> List[str]:
+    """`fields`（カンマ区切り）を列名リストにする。未指定なら全列。
+
+    Raises:
+        ValueError: 未知の列名
+    """
+    if not fields:
+        return list(EXPORT_COLUMNS)
+    columns = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(columns))  # 重複除去（順序は維持）
+
+
+def build_export_stmt(columns: Sequence[str], filters: Optional[ScoreFilters], include_invalid: bool):
+    stmt = select(*[getattr(LatestStockScore, c) for c in columns])
+    if not include_invalid:
+        stmt = stmt.where(LatestStockScore.data_quality.notin_(INVALID_DATA_QUALITY))
+    stmt = apply_score_filters(stmt, LatestStockScore, filters)
+    return stmt.order_by(LatestStockScore.symbol)
+
+
+async def iter_row_chunks(
+    columns: Sequence[str],
+    filters: Optional[ScoreFilters] = None,
+    include_invalid: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[List[tuple]]:
+    """サーバーサイドカーソルで行タプルを chunk_size 件ずつ返す。
+
+    StreamingResponse の生成中もセッションが生きている必要があるため、
+    リクエストスコープの get_read_db ではなく自前で読み取り用セッションを開く。
+    """
+    stmt = build_export_stmt(columns, filters, include_invalid).execution_options(yield_per=chunk_size)
+    async with database.ReadSessionLocal() as session:
+        result = await session.stream(stmt)
+        async for partition in result.partitions(chunk_size):
+            yield [tuple(row) for row in partition]
+
+
+def _json_default(value: Any):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[tuple]) -> bytes:
+    """1 チャンク分の行を NDJSON（1 行 1 オブジェクト、末尾改行付き）にする。"""
+    lines = [
+        json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=_json_default)
+        for row in rows
+    ]
+    return ("\n".join(lines) + "\n").encode() if lines else b""
+
+
+def arrow_schema(columns: Sequence[str]):
+    """列の SQL 型から Arrow スキーマを作る（JSON 列は JSON 文字列として出す）。"""
+    import pyarrow as pa
+
+    fields = []
+    for name in columns:
+        col_type = EXPORT_COLUMNS[name].type
+        if isinstance(col_type, Float):
+            arrow_type = pa.float64()
+        elif isinstance(col_type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(col_type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC")
+        elif isinstance(col_type, (String, JSON)):
+            arrow_type = pa.string()
+        else:  # pragma: no cover - 現行テーブルには無い型
+            arrow_type = pa.string()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+class ArrowStreamEncoder:
+    """チャンクごとに Arrow IPC stream の続きのバイト列を返すエンコーダ"""
+
+    def __init__(self, columns: Sequence[str]):
+        import pyarrow as pa
+
+        self._pa = pa
+        self.columns = list(columns)
+        self.schema = arrow_schema(self.columns)
+        self._json_columns = {
+            i for i, c in enumerate(self.columns) if isinstance(EXPORT_COLUMNS[c].type, JSON)
+        }
+        self._sink = io.BytesIO()
+        self._writer = pa.ipc.new_stream(self._sink, self.schema)
+
+    def _drain(self) -> bytes:
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def encode(self, rows: Sequence[tuple]) -> bytes:
+        arrays = []
+        for i, field in enumerate(self.schema):
+            values = [row[i] for row in rows]
+            if i in self._json_columns:
+                values = [None if v is None else json.dumps(v, ensure_ascii=False) for v in values]
+            arrays.append(self._pa.array(values, type=field.type))
+        self._writer.write_batch(self._pa.record_batch(arrays, schema=self.schema))
+        return self._drain()
+
+    def close(self) -> bytes:
+        self._writer.close()
+        return self._drain()
+
+
+async def stream_export(
+    fmt: str,
+    columns: Sequence[str],
+    filters: Optional[ScoreFilters] = None,
+    include_invalid: bool = False,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[bytes]:
+    """エクスポート本体。StreamingResponse にそのまま渡せるバイト列のイテレータ。"""
+    encoder = ArrowStreamEncoder(columns) if fmt == "arrow" else None
+    total = 0
+    async for rows in iter_row_chunks(columns, filters, include_invalid, chunk_size):
+        total += len(rows)
+        yield encoder.encode(rows) if encoder else encode_ndjson(columns, rows)
+    if encoder:
+        yield encoder.close()
+    logger.info("score export: format=%s columns=%d rows=%d", fmt, len(columns), total)
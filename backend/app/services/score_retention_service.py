@@ -0,0 +1,117 @@
+"""stock_scores のパーティション管理と保持（間引き）
+
+stock_scores は scored_at の月単位で RANGE パーティション化されている（migration 010）。
+本モジュールは同期エンジン（psycopg2）で次を行う:
+
+    - ensure_partitions: 当月から PARTITION_MONTHS_AHEAD か月先までのパーティションを作成
+      （バッチ開始時にも呼ぶ。パーティションが無い月の INSERT はエラーになるため）
+    - downsample: 直近 SCORE_RETENTION_DAILY_DAYS 日より古い行を「銘柄 × 週（JST）」で
+      最新 1 行だけ残して削除（日次 → 週次）
+
+週の境界をまたいで間引くと同じ週に 2 行残るため、カットオフは JST の週頭（月曜 0 時）に揃える。
+"""
+
+import logging
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from typing import List, Optional
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+PARTITION_MONTHS_AHEAD = 2
+RETENTION_TZ = ZoneInfo("Asia/Tokyo")
+# 日次の通常運用では、カットオフ直前のこの日数分だけを見る（full=True で全期間）
+DOWNSAMPLE_WINDOW_DAYS = 28
+
+_DOWNSAMPLE_SQL = """
+DELETE FROM stock_scores s
+USING (
+    SELECT id, scored_at,
+           row_number() OVER (
+               PARTITION BY symbol, date_trunc('week', scored_at AT TIME ZONE 'Asia/Tokyo')
+               ORDER BY scored_at DESC, id DESC
+           ) AS rn
+    FROM stock_scores
+    WHERE scored_at < :cutoff{since_clause}
+) d
+WHERE s.id = d.id
+  AND s.scored_at = d.scored_at
+  AND d.rn > 1
+  AND s.scored_at < :cutoff
+"""
+
+
+def add_months(d: date, months: int) -> date:
+    """月初日 d から months か月後の月初日を返す。"""
+    y, m = divmod(d.month - 1 + months, 12)
+    return date(d.year + y, m + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"stock_scores_y{month:%Y}m{month:%m}"
+
+
+def partition_ddl(month: date) -> str:
+    """月初日 month のパーティションを作る DDL（境界は UTC の月初）。"""
+    nxt = add_months(month, 1)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF stock_scores "
+        f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{nxt.isoformat()} 00:00:00+00')"
+    )
+
+
+def months_to_ensure(today: date, months_ahead: int = PARTITION_MONTHS_AHEAD) -> List[date]:
+    first = today.replace(day=1)
+    return [add_months(first, i) for i in range(months_ahead + 1)]
+
+
+def downsample_cutoff(now: datetime, daily_days: int) -> datetime:
+    """daily_days 日前を含む週の JST 月曜 0 時（UTC aware）を返す。これより前が間引き対象。"""
+    local = (now - timedelta(days=daily_days)).astimezone(RETENTION_TZ)
+    monday = local.date() - timedelta(days=local.weekday())
+    return datetime.combine(monday, dtime.min, tzinfo=RETENTION_TZ).astimezone(timezone.utc)
+
+
+def ensure_partitions(conn, today: Optional[date] = None) -> List[str]:
+    """必要な月のパーティションを作成し、対象のパーティション名を返す（冪等）。"""
+    from sqlalchemy import text
+
+    today = today or datetime.now(timezone.utc).date()
+    months = months_to_ensure(today)
+    for month in months:
+        conn.execute(text(partition_ddl(month)))
+    return [partition_name(m) for m in months]
+
+
+def downsample(conn, now: Optional[datetime] = None, daily_days: int = 90, full: bool = False) -> int:
+    """古い行を銘柄 × 週で 1 行に間引き、削除件数を返す。
+
+    latest_stock_scores が指す行はその週の最新行なので削除されない。
+    """
+    from sqlalchemy import text
+
+    now = now or datetime.now(timezone.utc)
+    cutoff = downsample_cutoff(now, daily_days)
+    params = {"cutoff": cutoff}
+    since_clause = ""
+    if not full:
+        # 範囲を定数で絞るとパーティションプルーニングが効く
+        params["since"] = cutoff - timedelta(days=DOWNSAMPLE_WINDOW_DAYS)
+        since_clause = " AND scored_at >= :since"
+    result = conn.execute(text(_DOWNSAMPLE_SQL.format(since_clause=since_clause)), params)
+    return result.rowcount or 0
+
+
+def run_score_retention_sync(full: bool = False) -> dict:
+    """パーティション作成と間引きを 1 トランザクションずつ実行する（ジョブ / CLI 用）。"""
+    from app.core.config import settings
+    from app.core.database import get_sync_engine
+
+    engine = get_sync_engine()
+    with engine.begin() as conn:
+        partitions = ensure_partitions(conn)
+    with engine.begin() as conn:
+        deleted = downsample(conn, daily_days=settings.SCORE_RETENTION_DAILY_DAYS, full=full)
+    logger.info("stock_scores 保持: partitions=%s deleted=%d full=%s", partitions, deleted, full)
+    return {"partitions": partitions, "deleted": deleted}
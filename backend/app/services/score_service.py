@@ -1,48 +1,129 @@
 """スコアサービス"""
 
-from typing import List, Optional
+import base64
+import json
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Tuple
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
+from sqlalchemy import and_, or_, select
 
-from app.models.stock_score import StockScore
+from app.models.stock_score import LatestStockScore
+
+SORTABLE_COLUMNS = ("total_score", "fundamental_score", "technical_score", "kurotenko_score")
+INVALID_DATA_QUALITY = ("fetch_error", "missing_tv")
+KUROTENKO_CRITERIA_TOTAL = 8  # kurotenko_score = 充足数 / 8 * 100
+
+
+@dataclass
+class ScoreFilters:
+    """一覧のサーバー側フィルタ（None / 空は条件なし）"""
+
+    sector: Optional[str] = None
+    ratings: List[str] = field(default_factory=list)
+    min_total_score: Optional[float] = None
+    max_total_score: Optional[float] = None
+    min_per: Optional[float] = None
+    max_per: Optional[float] = None
+    min_pbr: Optional[float] = None
+    max_pbr: Optional[float] = None
+    min_kurotenko_criteria: Optional[int] = None
+
+
+def apply_score_filters(stmt, model, filters: Optional[ScoreFilters]):
+    """ScoreFilters を WHERE 句として stmt に積む（model は StockScore / LatestStockScore）。"""
+    if filters is None:
+        return stmt
+    if filters.sector:
+        stmt = stmt.where(model.sector == filters.sector)
+    if filters.ratings:
+        stmt = stmt.where(model.rating.in_(filters.ratings))
+    ranges = (
+        (model.total_score, filters.min_total_score, filters.max_total_score),
+        (model.per, filters.min_per, filters.max_per),
+        (model.pbr, filters.min_pbr, filters.max_pbr),
+    )
+    for column, lower, upper in ranges:
+        if lower is not None:
+            stmt = stmt.where(column >= lower)
+        if upper is not None:
+            stmt = stmt.where(column <= upper)
+    if filters.min_kurotenko_criteria is not None:
+        # JSON を数える代わりに、充足数から一意に決まる kurotenko_score で絞る
+        threshold = filters.min_kurotenko_criteria / KUROTENKO_CRITERIA_TOTAL * 100
+        stmt = stmt.where(model.kurotenko_score >= threshold)
+    return stmt
+
+
+def encode_cursor(sort: str, value: float, symbol: str) -> str:
+    """ページ末尾の (ソート値, symbol) を不透明なカーソル文字列にする。"""
+    raw = json.dumps({"sort": sort, "v": value, "s": symbol}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[float, str]:
+    """カーソルを (ソート値, symbol) に戻す。
+
+    Raises:
+        ValueError: 壊れたカーソル、または別のソート軸で発行されたカーソル
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, symbol = float(data["v"]), str(data["s"])
+        issued_for = data["sort"]
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {e}") from e
+    if issued_for != sort:
+        raise ValueError(f"cursor was issued for sort={issued_for}")
+    return value, symbol
+
+
+def next_cursor(rows: List[Any], sort: str, limit: int) -> Optional[str]:
+    """ページが埋まっていれば次ページ用カーソルを返す（最終ページは None）。"""
+    if len(rows) < limit or not rows:
+        return None
+    last = rows[-1]
+    return encode_cursor(sort, getattr(last, sort), last.symbol)
 
 
 async def list_scores(
     db: AsyncSession,
     sort: str = "total_score",
     limit: int = 100,
-) -> List[StockScore]:
-    """全銘柄スコア一覧（最新スコアのみ、指定軸で降順ソート）"""
-    allowed_sorts = {"total_score", "fundamental_score", "technical_score", "kurotenko_score"}
-    if sort not in allowed_sorts:
+    filters: Optional[ScoreFilters] = None,
+    after: Optional[Tuple[float, str]] = None,
+) -> List[LatestStockScore]:
+    """全銘柄スコア一覧（latest_stock_scores から最新スコアのみ、指定軸で降順ソート）
+
+    (sort_col DESC, symbol ASC) のキーセットページング。after に前ページ末尾の
+    (ソート値, symbol) を渡すと、その直後から limit 件を返す（OFFSET を使わないため
+    何ページ目でもコストは一定）。
+    """
+    if sort not in SORTABLE_COLUMNS:
         sort = "total_score"
 
-    subq = (
-        select(StockScore.symbol, func.max(StockScore.scored_at).label("latest"))
-        .group_by(StockScore.symbol)
-        .subquery()
-    )
-    sort_col = getattr(StockScore, sort)
+    sort_col = getattr(LatestStockScore, sort)
     stmt = (
-        select(StockScore)
-        .join(subq, (StockScore.symbol == subq.c.symbol) & (StockScore.scored_at == subq.c.latest))
-        .where(StockScore.data_quality.notin_(["fetch_error", "missing_tv"]))
+        select(LatestStockScore)
+        .where(LatestStockScore.data_quality.notin_(INVALID_DATA_QUALITY))
         .where(sort_col.is_not(None))
-        .order_by(sort_col.desc().nulls_last())
-        .limit(limit)
     )
+    stmt = apply_score_filters(stmt, LatestStockScore, filters)
+    if after is not None:
+        value, symbol = after
+        stmt = stmt.where(
+            or_(sort_col < value, and_(sort_col == value, LatestStockScore.symbol > symbol))
+        )
+    stmt = stmt.order_by(sort_col.desc(), LatestStockScore.symbol.asc()).limit(limit)
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
 
-async def get_score(db: AsyncSession, symbol: str) -> Optional[StockScore]:
-    """銘柄の最新スコアを返す。存在しない場合は None。"""
-    stmt = (
-        select(StockScore)
-        .where(StockScore.symbol == symbol)
-        .order_by(desc(StockScore.scored_at))
-        .limit(1)
-    )
-    result = await db.execute(stmt)
+async def get_score(db: AsyncSession, symbol: str) -> Optional[LatestStockScore]:
+    """銘柄の公開中の世代のスコアを返す。存在しない場合は None。
+
+    実行中のバッチが書いた行は公開されるまで見えない（一覧と同じ世代を返す）。
+    """
+    result = await db.execute(select(LatestStockScore).where(LatestStockScore.symbol == symbol))
     return result.scalar_one_or_none()
@@ -0,0 +1,129 @@
+"""スコアリング世代（scoring_runs）の管理
+
+バッチ 1 回 = 1 世代。実行中に書いた stock_scores の行には run_id を付け、
+完走時に publish_run で次を 1 トランザクションで行う:
+
+    1. その世代の行（銘柄ごとに最新 1 行）で latest_stock_scores を upsert
+    2. その世代に含まれない銘柄を latest_stock_scores から削除
+    3. 直前の公開世代を superseded、この世代を published にする
+
+読み取り側（latest_stock_scores を引く箇所）は常に公開済みの 1 世代だけを見るため、
+実行途中の「昨日と今日が混ざったランキング」は見えない。
+公開中の run_id は Redis（PUBLISHED_RUN_REDIS_KEY）にも書き、応答キャッシュ等の
+世代キーとして 1 往復で引けるようにする。
+"""
+
+import logging
+from typing import Optional
+
+from sqlalchemy import func, select, update
+
+from app.models.scoring_run import RUN_FAILED, RUN_PUBLISHED, RUN_RUNNING, RUN_SUPERSEDED, ScoringRun
+from app.models.stock_score import LatestStockScore, SCORE_COLUMN_NAMES, StockScore
+
+logger = logging.getLogger(__name__)
+
+PUBLISHED_RUN_REDIS_KEY = "scoring:published_run_id"
+
+
+def resume_run(session) -> Optional[int]:
+    """実行中のまま残っている最新の世代（チェックポイントからの再開用）。無ければ None。"""
+    return session.execute(
+        select(ScoringRun.id)
+        .where(ScoringRun.status == RUN_RUNNING)
+        .order_by(ScoringRun.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def begin_run(session, source: str) -> int:
+    """新しい世代を開始して run_id を返す（commit する）。
+
+    実行中のまま残っている世代は中断されたものとして failed にする。
+    """
+    session.execute(
+        update(ScoringRun).where(ScoringRun.status == RUN_RUNNING).values(status=RUN_FAILED)
+    )
+    run = ScoringRun(source=source, status=RUN_RUNNING)
+    session.add(run)
+    session.flush()
+    run_id = run.id
+    session.commit()
+    logger.info("スコアリング世代 %d を開始 (source=%s)", run_id, source)
+    return run_id
+
+
+def latest_publish_stmt(run_id: int):
+    """世代 run_id の行（銘柄ごとに最新 1 行）で latest_stock_scores を upsert する文。
+
+    ix_stock_scores_run_id_symbol で世代の行だけを読む。
+    """
+    from sqlalchemy.dialects.postgresql import insert
+
+    columns = ("symbol", "id", *SCORE_COLUMN_NAMES)
+    source = (
+        select(*[getattr(StockScore, c) for c in columns])
+        .where(StockScore.run_id == run_id)
+        .distinct(StockScore.symbol)
+        .order_by(StockScore.symbol, StockScore.scored_at.desc(), StockScore.id.desc())
+    )
+    stmt = insert(LatestStockScore).from_select(list(columns), source)
+    return stmt.on_conflict_do_update(
+        index_elements=[LatestStockScore.symbol],
+        set_={c: stmt.excluded[c] for c in columns if c != "symbol"},
+    )
+
+
+def publish_stmts(run_id: int, total: int, processed: int, failed: int) -> list:
+    """publish_run が 1 トランザクションで実行する文（順序に意味がある）。"""
+    from sqlalchemy import delete
+
+    return [
+        latest_publish_stmt(run_id),
+        delete(LatestStockScore).where(LatestStockScore.run_id.is_distinct_from(run_id)),
+        update(ScoringRun)
+        .where(ScoringRun.status == RUN_PUBLISHED, ScoringRun.id != run_id)
+        .values(status=RUN_SUPERSEDED),
+        update(ScoringRun)
+        .where(ScoringRun.id == run_id)
+        .values(
+            status=RUN_PUBLISHED,
+            published_at=func.now(),
+            total=total,
+            processed=processed,
+            failed=failed,
+        ),
+    ]
+
+
+def publish_run(session, run_id: int, total: int, processed: int, failed: int, redis_client=None) -> None:
+    """世代 run_id を公開する（latest_stock_scores の差し替えと世代の切り替えを同一トランザクションで）。"""
+    from app.services.analysis_axes_service import invalidate_all_axes_cache_sync
+    from app.services.score_cache_service import invalidate_score_cache_sync
+
+    for stmt in publish_stmts(run_id, total, processed, failed):
+        session.execute(stmt)
+    session.commit()
+    logger.info("スコアリング世代 %d を公開 (processed=%d failed=%d)", run_id, processed, failed)
+
+    if redis_client is not None:
+        try:
+            redis_client.set(PUBLISHED_RUN_REDIS_KEY, run_id)
+        except Exception as e:
+            logger.warning("公開世代の Redis 書き込み失敗: %s", e)
+    # 一覧と分析軸のスコア部分は latest_stock_scores 由来なので全件が変わる
+    invalidate_score_cache_sync(redis_client)
+    invalidate_all_axes_cache_sync(redis_client)
+
+
+async def get_published_run_id(db, redis=None) -> Optional[int]:
+    """公開中の run_id（未公開なら None）。Redis にあればそれを、なければ DB を引く。"""
+    if redis is not None:
+        try:
+            raw = await redis.get(PUBLISHED_RUN_REDIS_KEY)
+            if raw:
+                return int(raw)
+        except Exception:
+            pass
+    result = await db.execute(select(ScoringRun.id).where(ScoringRun.status == RUN_PUBLISHED))
+    return result.scalar_one_or_none()
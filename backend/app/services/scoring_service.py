@@ -1,6 +1,8 @@
 """バッチスコアリングサービス
 
 JPX 全銘柄を取得してスコアリングし、stock_scores テーブルに保存する。
+実行ごとに世代（scoring_runs / run_id）を切り、完走時にその世代を latest_stock_scores へ
+一括で公開する（読み取り側はこちらを使うため、実行途中の世代は見えない）。
 データ源は settings.SCORING_DATA_SOURCE で切り替え可能:
     - "hybrid"   : yfinance の history + info を TradingView の指標で上書き（既定）
     - "tv"       : TradingView のみ（history 不要の簡易スコア）
@@ -13,12 +15,18 @@ JPX 全銘柄を取得してスコアリングし、stock_scores テーブルに
 import json
 import logging
 import time
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+try:
+    import jpholiday
+except ImportError:  # pragma: no cover - jpholiday は任意
+    jpholiday = None
+    logger.warning("jpholiday が無いため祝日を判定できません（土日・年末年始のみ休場扱い）")
+
 BATCH_REDIS_KEY = "batch:scoring:status"
 CHECKPOINT_REDIS_KEY = "batch:scoring:checkpoint"  # 処理済み銘柄の Set
 CHECKPOINT_TTL_SEC = 60 * 60 * 24 * 3  # 3 日（中断から再開するための保持期間）
@@ -32,6 +40,15 @@ RETRY_BACKOFF_SECONDS = (1.0, 3.0)  # 1 回リトライ時の待機
 KUROTENKO_CACHE_KEY_FMT = "kurotenko:v1:{symbol}"
 KUROTENKO_CACHE_TTL_SEC = 60 * 60 * 24 * 30  # 30 日
 
+# screener モードの MACD 逐次状態（macd_incremental）。snapshot の close を毎営業日
+# 1 本ずつ積み、直近3本のクロス判定を復元する。連休で数日止まっても消えないよう 14 日 TTL。
+# 状態が無い / 前営業日で途切れている銘柄は stock_prices の終値（MACD_SEED_DAYS 日分）から作り直す。
+# v2: 終値ウィンドウを持たない形式
+MACD_STATE_CACHE_KEY_FMT = "macd_state:v2:{symbol}"
+MACD_STATE_CACHE_TTL_SEC = 60 * 60 * 24 * 14  # 14 日
+MACD_STATE_MGET_CHUNK = 500
+MACD_SEED_DAYS = 400  # hybrid（yfinance の 1y history）と同程度の本数
+
 
 def _fetch_merged_data(symbol: str, source: str) -> Optional[dict]:
     """設定に応じて TV / yfinance / hybrid でデータを取得する。
@@ -112,6 +129,144 @@ def _set_kurotenko_cached(redis_client, symbol: str, value: dict) -> None:
         logger.debug("%s: kurotenko cache write failed - %s", symbol, e)
 
 
+def _load_macd_states(redis_client, symbols: list) -> dict:
+    """MACD 逐次状態を MGET でまとめて読む。読めなかった銘柄は dict に含まれない。"""
+    states: dict = {}
+    if redis_client is None or not symbols:
+        return states
+    for i in range(0, len(symbols), MACD_STATE_MGET_CHUNK):
+        chunk = symbols[i:i + MACD_STATE_MGET_CHUNK]
+        try:
+            raws = redis_client.mget([MACD_STATE_CACHE_KEY_FMT.format(symbol=s) for s in chunk])
+        except Exception as e:
+            logger.warning("macd state 読み込み失敗: %s", e)
+            continue
+        for symbol, raw in zip(chunk, raws or []):
+            if not raw:
+                continue
+            try:
+                states[symbol] = json.loads(raw)
+            except ValueError:
+                logger.debug("%s: macd state が壊れているため破棄", symbol)
+    return states
+
+
+def _save_macd_states(redis_client, states: dict) -> None:
+    """MACD 逐次状態を pipeline でまとめて書き込む。失敗はログのみ。"""
+    if redis_client is None or not states:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for symbol, state in states.items():
+            pipe.setex(
+                MACD_STATE_CACHE_KEY_FMT.format(symbol=symbol),
+                MACD_STATE_CACHE_TTL_SEC,
+                json.dumps(state),
+            )
+        pipe.execute()
+    except Exception as e:
+        logger.warning("macd state 書き込み失敗: %s", e)
+
+
+def _score_row(run_id: int, **fields):
+    """世代 run_id の StockScore を作る。
+
+    run_id は作るときに付ける（commit 前に autoflush された行も世代に入るように）。
+    latest_stock_scores には反映しない（完走時に scoring_run_service.publish_run で一括公開）。
+    """
+    from app.models.stock_score import StockScore
+
+    return StockScore(run_id=run_id, **fields)
+
+
+def _ensure_score_partitions(engine) -> None:
+    """当月以降の stock_scores パーティションを用意する（無い月への INSERT は失敗するため）。"""
+    from app.services.score_retention_service import ensure_partitions
+
+    try:
+        with engine.begin() as conn:
+            ensure_partitions(conn)
+    except Exception as e:
+        logger.warning("stock_scores パーティション作成失敗: %s", e)
+
+
+def _needs_macd_seed(state: Optional[dict], trading_day: str) -> bool:
+    """状態が無いか、前営業日より前で途切れている（積めなかった足がある）か"""
+    if state is None or state.get("as_of") is None:
+        return True
+    if state["as_of"] >= trading_day:
+        return False
+    prev_day = date.fromisoformat(trading_day) - timedelta(days=1)
+    while not _is_jpx_trading_day(prev_day):
+        prev_day -= timedelta(days=1)
+    return state["as_of"] < prev_day.isoformat()
+
+
+def _load_macd_seeds(session, symbols: list, trading_day: str) -> dict:
+    """stock_prices の終値（trading_day の前日まで）から MACD 状態を作る。
+
+    銘柄ごとに 1 クエリにせず、MACD_STATE_MGET_CHUNK 銘柄ずつまとめて引く。
+    行の無い銘柄は dict に含まれない（空の状態から積み始める）。
+    """
+    from sqlalchemy import select
+    from app.analyzer.macd_incremental import seed_from_closes
+    from app.models.stock_price import StockPrice
+
+    end = date.fromisoformat(trading_day)
+    start = end - timedelta(days=MACD_SEED_DAYS)
+    codes = {(s[:-2] if s.endswith(".T") else s): s for s in symbols}
+    code_list = list(codes)
+    seeds: dict = {}
+    for i in range(0, len(code_list), MACD_STATE_MGET_CHUNK):
+        chunk = code_list[i:i + MACD_STATE_MGET_CHUNK]
+        try:
+            rows = session.execute(
+                select(StockPrice.stock_code, StockPrice.date, StockPrice.close)
+                .where(
+                    StockPrice.stock_code.in_(chunk),
+                    StockPrice.date >= start,
+                    StockPrice.date < end,
+                )
+                .order_by(StockPrice.stock_code, StockPrice.date)
+            ).all()
+        except Exception as e:
+            logger.warning("macd seed 読み込み失敗: %s", e)
+            session.rollback()
+            continue
+        by_code: dict = {}
+        for code, day, close in rows:
+            by_code.setdefault(code, []).append((day, float(close)))
+        for code, bars in by_code.items():
+            seeds[codes[code]] = seed_from_closes([c for _, c in bars], as_of=bars[-1][0].isoformat())
+    return seeds
+
+
+def _is_jpx_trading_day(day: date) -> bool:
+    """東証の営業日か（土日・祝日・年末年始 12/31〜1/3 は休場）。
+
+    祝日は jpholiday で判定する（任意。無ければ土日と年末年始だけ）。
+    """
+    if day.weekday() >= 5:
+        return False
+    if (day.month, day.day) in ((12, 31), (1, 1), (1, 2), (1, 3)):
+        return False
+    return jpholiday is None or not jpholiday.is_holiday(day)
+
+
+def _snapshot_trading_day() -> Optional[str]:
+    """snapshot の close を積む日付（JST）を返す。
+
+    休場日は新しい足が無い（snapshot は前営業日の終値）ので None。積むと MACD 状態に
+    同じ終値が 1 本余分に入り、以後 ta の計算とずれ続ける。
+    """
+    from zoneinfo import ZoneInfo
+
+    today = datetime.now(ZoneInfo("Asia/Tokyo")).date()
+    if not _is_jpx_trading_day(today):
+        return None
+    return today.isoformat()
+
+
 def _score_symbol(
     symbol: str,
     name: Optional[str],
@@ -214,11 +369,11 @@ def run_batch_scoring_sync(redis_client) -> dict:
     Returns:
         {"processed": int, "failed": int, "total": int, "skipped": int}
     """
-    from sqlalchemy import create_engine
+    from app.core.database import get_sync_engine
     from sqlalchemy.orm import Session
     from app.core.config import settings
     from app.external.yfinance_client import load_jpx_symbols
-    from app.models.stock_score import StockScore
+    from app.services.scoring_run_service import begin_run, publish_run, resume_run
 
     # Phase 1 feature flag: screener モード
     if settings.SCORING_DATA_SOURCE == "screener":
@@ -227,8 +382,8 @@ def run_batch_scoring_sync(redis_client) -> dict:
     source = settings.SCORING_DATA_SOURCE
     max_workers = settings.SCORING_MAX_WORKERS or DEFAULT_MAX_WORKERS
 
-    sync_url = settings.DATABASE_URL.replace("+asyncpg", "+psycopg2")
-    engine = create_engine(sync_url)
+    engine = get_sync_engine()
+    _ensure_score_partitions(engine)
 
     logger.info("JPX 銘柄マスターを取得中...")
     try:
@@ -239,8 +394,17 @@ def run_batch_scoring_sync(redis_client) -> dict:
 
     total = len(symbols_data)
 
-    # チェックポイントから処理済み銘柄を読み込み、対象をフィルタ
+    # チェックポイントから処理済み銘柄を読み込み、対象をフィルタ。
+    # 処理済み銘柄の行は中断した世代に属するので、その世代を引き継ぐ（無ければ最初から）
     already_done = _load_checkpoint(redis_client)
+    with Session(engine) as session:
+        run_id = resume_run(session) if already_done else None
+        if run_id is None:
+            if already_done:
+                logger.warning("再開する世代が無いためチェックポイントを破棄して最初から実行します")
+                _clear_checkpoint(redis_client)
+                already_done = set()
+            run_id = begin_run(session, source)
     pending = [row for row in symbols_data if row["symbol"] not in already_done]
     skipped = total - len(pending)
     processed = 0
@@ -255,7 +419,9 @@ def run_batch_scoring_sync(redis_client) -> dict:
     )
 
     if not pending:
-        logger.info("すべての銘柄が既に処理済みです。チェックポイントをクリアします。")
+        logger.info("すべての銘柄が既に処理済みです。世代を公開してチェックポイントをクリアします。")
+        with Session(engine) as session:
+            publish_run(session, run_id, total=total, processed=total, failed=0, redis_client=redis_client)
         _clear_checkpoint(redis_client)
         _set_status(redis_client, "done", total=total, processed=total, failed=0, started_at=started_at, finished=True)
         return {"processed": 0, "failed": 0, "total": total, "skipped": skipped}
@@ -281,12 +447,13 @@ def run_batch_scoring_sync(redis_client) -> dict:
                     result = None
 
                 if result is not None:
-                    session.add(StockScore(**result))
+                    session.add(_score_row(run_id, **result))
                     processed += 1
                     # 成功した銘柄だけ checkpoint に記録（失敗は次回実行でリトライされる）
                     checkpoint_buffer.append(sym)
                 else:
-                    session.add(StockScore(
+                    session.add(_score_row(
+                        run_id,
                         symbol=sym,
                         name=symbol_map[sym]["name"],
                         data_quality="fetch_error",
@@ -309,6 +476,10 @@ def run_batch_scoring_sync(redis_client) -> dict:
             session.commit()
             if checkpoint_buffer:
                 _mark_checkpoint(redis_client, checkpoint_buffer)
+            publish_run(
+                session, run_id,
+                total=total, processed=skipped + processed, failed=failed, redis_client=redis_client,
+            )
 
     _set_status(
         redis_client, "done",
@@ -353,25 +524,30 @@ def _run_batch_scoring_screener(redis_client) -> dict:
     - 外部 API は screener の 1 回の snapshot fetch と、kurotenko cache miss 時の
       yfinance 財務 API のみ。ループ内は CPU バウンド。
     - checkpoint/retry は不要（単発 API なので中断耐性は低いが再実行で十分）。
+    - MACD のクロス判定は Redis に保持した銘柄別の逐次状態（macd_incremental）に
+      当日の close を積んで復元する。状態の読み書きは MGET/pipeline でまとめて行う。
+      状態が無い / 途切れた銘柄は stock_prices から seed する（無ければ空から積むので、
+      MIN_BARS 本たまるまでクロス判定は中立、その後もしばらく hybrid とはずれる）。
     """
-    from sqlalchemy import create_engine
+    from app.core.database import get_sync_engine
     from sqlalchemy.orm import Session
-    from app.core.config import settings
     from app.external.yfinance_client import load_jpx_symbols, fetch_stock_data
     from app.external.tv_screener_client import fetch_japan_market_snapshot
     from app.external.tv_screener_adapter import tv_row_to_info, tv_row_to_technical_features
     from app.analyzer.fundamental import calc_fundamental_score
     from app.analyzer.technical import calc_technical_score
     from app.analyzer.technical_from_tv import calc_technical_score_from_tv
+    from app.analyzer.macd_incremental import macd_flags, seed_from_closes, update_for_day
     from app.analyzer.kurotenko_screener import evaluate_candidate
     from app.analyzer.scorer import build_stock_result
-    from app.models.stock_score import StockScore
+    from app.services.scoring_run_service import begin_run, publish_run
 
-    sync_url = settings.DATABASE_URL.replace("+asyncpg", "+psycopg2")
-    engine = create_engine(sync_url)
+    engine = get_sync_engine()
+    _ensure_score_partitions(engine)
 
     started_at = datetime.now(timezone.utc).isoformat()
     _set_status(redis_client, "running", total=0, processed=0, failed=0, started_at=started_at)
+    trading_day = _snapshot_trading_day()
 
     logger.info("screener mode: snapshot 取得開始")
     snapshot_t0 = time.time()
@@ -397,10 +573,25 @@ def _run_batch_scoring_screener(redis_client) -> dict:
     processed = 0
     failed = 0
 
+    macd_states = _load_macd_states(redis_client, [row["symbol"] for row in symbols_data])
+    dirty_macd_states: dict = {}
+
     _set_status(redis_client, "running", total=total, processed=0, failed=0, started_at=started_at)
-    logger.info("screener mode: スコアリング開始 total=%d", total)
+    logger.info(
+        "screener mode: スコアリング開始 total=%d macd_states=%d", total, len(macd_states),
+    )
 
     with Session(engine) as session:
+        run_id = begin_run(session, "screener")
+        if trading_day is not None:
+            # 初めて見る銘柄・途切れた状態は空から積まず stock_prices の終値で作り直す
+            unseeded = [
+                row["symbol"] for row in symbols_data
+                if row["symbol"] in snapshot and _needs_macd_seed(macd_states.get(row["symbol"]), trading_day)
+            ]
+            seeds = _load_macd_seeds(session, unseeded, trading_day)
+            macd_states.update(seeds)
+            logger.info("screener mode: macd state seed 対象=%d stock_prices から=%d", len(unseeded), len(seeds))
         for idx, row in enumerate(symbols_data):
             symbol = row["symbol"]
             name = row.get("name")
@@ -424,16 +615,22 @@ def _run_batch_scoring_screener(redis_client) -> dict:
                         _set_kurotenko_cached(redis_client, symbol, kurotenko)
 
                     close_price = _extract_close_from_history(data.get("history"))
+                    # 履歴が手元にあるので MACD 状態をここで初期化しておく
+                    if trading_day is not None:
+                        dirty_macd_states[symbol] = seed_from_closes(
+                            data["history"]["Close"].tolist(), as_of=trading_day,
+                        )
                     result = build_stock_result(
                         symbol, name, market, fundamental, technical, kurotenko, close_price=close_price
                     )
                     result["data_quality"] = "yfinance_fallback"
-                    session.add(StockScore(**result))
+                    session.add(_score_row(run_id, **result))
                     processed += 1
                     logger.info("%s: yfinance フォールバック成功", symbol)
                 except Exception as e:
                     logger.warning("%s: missing_tv かつ yfinance も失敗 - %s", symbol, e)
-                    session.add(StockScore(
+                    session.add(_score_row(
+                        run_id,
                         symbol=symbol,
                         name=name,
                         data_quality="missing_tv",
@@ -444,7 +641,12 @@ def _run_batch_scoring_screener(redis_client) -> dict:
                     info = tv_row_to_info(tv_row)
                     features = tv_row_to_technical_features(tv_row)
                     fundamental = calc_fundamental_score(info)
-                    technical = calc_technical_score_from_tv(features)
+
+                    state = macd_states.get(symbol)
+                    if trading_day is not None and features.get("close") is not None:
+                        state = update_for_day(state, features["close"], trading_day)
+                        dirty_macd_states[symbol] = state
+                    technical = calc_technical_score_from_tv(features, macd_flags=macd_flags(state))
 
                     kurotenko = _get_kurotenko_cached(redis_client, symbol)
                     if kurotenko is None:
@@ -456,11 +658,12 @@ def _run_batch_scoring_screener(redis_client) -> dict:
                     result = build_stock_result(
                         symbol, name, market, fundamental, technical, kurotenko, close_price=close_price
                     )
-                    session.add(StockScore(**result))
+                    session.add(_score_row(run_id, **result))
                     processed += 1
                 except Exception as e:
                     logger.error("%s: screener スコアリング失敗 - %s", symbol, e)
-                    session.add(StockScore(
+                    session.add(_score_row(
+                        run_id,
                         symbol=symbol,
                         name=name,
                         data_quality="fetch_error",
@@ -470,6 +673,8 @@ def _run_batch_scoring_screener(redis_client) -> dict:
             done = processed + failed
             if done % 100 == 0:
                 session.commit()
+                _save_macd_states(redis_client, dirty_macd_states)
+                dirty_macd_states = {}
                 _set_status(
                     redis_client, "running",
                     total=total, processed=processed, failed=failed,
@@ -477,6 +682,11 @@ def _run_batch_scoring_screener(redis_client) -> dict:
                 )
                 logger.info("進捗: %d/%d (成功=%d 失敗=%d)", done, total, processed, failed)
         session.commit()
+        _save_macd_states(redis_client, dirty_macd_states)
+        publish_run(
+            session, run_id,
+            total=total, processed=processed, failed=failed, redis_client=redis_client,
+        )
 
     _set_status(
         redis_client, "done",
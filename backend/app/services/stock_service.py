@@ -1,16 +1,73 @@
 """Stock service - ビジネスロジック層"""
 
-from typing import List, Optional
+import asyncio
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+import pandas as pd
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.repositories.stock_repository import StockRepository
 from app.external.providers.mock_provider import MockProvider
-from app.core.redis_client import get_redis
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+from app.core.tiered_cache import TieredCache
 from app.schemas.stock import StockInfo, StockPriceData
+from app.utils import price_codec
 from app.core.exceptions import StockNotFoundError
+from app.utils.price_frame import (
+    empty_frame,
+    frame_from_history,
+    frame_from_prices,
+    frame_from_rows,
+    frame_to_prices,
+    merge_frames,
+    PriceSeries,
+    resample_frame,
+    slice_frame,
+    TIMEFRAME_RULES,
+)
 import json
 
+# DB の最古データが期間の開始日からこの日数以内なら「期間をカバー済み」とみなす（連休対策）
+DB_COVERAGE_TOLERANCE_DAYS = 7
+# DB の最新データがこの日数以内なら外部 API に取りに行かない
+DB_FRESHNESS_DAYS = 1
+# (yfinance period, 遡れる日数) の昇順リスト
+YFINANCE_PERIODS = [("1y", 365), ("2y", 730), ("5y", 1825)]
+
+# 銘柄情報・株価のキャッシュ（プロセス内 LRU → Redis）。ローカルにはデコード済みの
+# StockInfo / PriceFrame を持ち、返すときは複製する。株価の Redis 値は price_codec のバイナリ
+_info_cache = TieredCache(
+    "stock_info", local_maxsize=settings.STOCK_LOCAL_CACHE_MAXSIZE, local_ttl=settings.STOCK_LOCAL_CACHE_TTL_SEC
+)
+_price_cache = TieredCache(
+    "stock_prices",
+    local_maxsize=settings.STOCK_LOCAL_CACHE_MAXSIZE,
+    local_ttl=settings.STOCK_LOCAL_CACHE_TTL_SEC,
+    binary=True,
+)
+
+# キャッシュミス時の取得の合流（プロセス内 + Redis ロックでプロセス間）
+_info_flight = SingleFlight("stock_info")
+_price_flight = SingleFlight("stock_prices")
+
+
+def _decode_info(raw: str) -> StockInfo:
+    return StockInfo(**json.loads(raw))
+
+
+def _encode_info(stock_info: StockInfo) -> str:
+    return json.dumps(stock_info.dict(), default=str)
+
+
+def _encode_frame(frame: pd.DataFrame) -> bytes:
+    return price_codec.encode_frame(frame, settings.PRICE_CACHE_COMPRESSION)
+
+
+def _encode_series(series: PriceSeries) -> bytes:
+    return price_codec.encode_series(series, settings.PRICE_CACHE_COMPRESSION)
+
 
 class StockService:
     """Stock service - 株情報サービス"""
@@ -20,26 +77,24 @@ class StockService:
         self.repository = StockRepository(db)
         self.provider = MockProvider()
 
-    async def _get_cache(self, key: str) -> Optional[dict]:
-        """キャッシュからデータを取得"""
-        try:
-            redis = await get_redis()
-            cached = await redis.get(key)
-            if cached:
-                return json.loads(cached)
-        except Exception:
-            # Redis接続エラーの場合はスキップ
-            pass
-        return None
+    async def _get_cached_info(self, cache_key: str) -> Optional[StockInfo]:
+        return await _info_cache.get(cache_key, _decode_info, copy=StockInfo.model_copy)
 
-    async def _set_cache(self, key: str, value: dict, ttl: int = 300):
-        """キャッシュにデータを保存"""
-        try:
-            redis = await get_redis()
-            await redis.setex(key, ttl, json.dumps(value, default=str))
-        except Exception:
-            # Redis接続エラーの場合はスキップ
-            pass
+    async def _set_cached_info(self, cache_key: str, stock_info: StockInfo, ttl: int = 3600) -> None:
+        await _info_cache.set(cache_key, stock_info.model_copy(), _encode_info, ttl)
+
+    async def _get_cached_series(self, series_key: str) -> Optional[PriceSeries]:
+        # PriceSeries は不変で、呼び出し側は切り出した frame しか返さないため複製しない
+        return await _price_cache.get(series_key, price_codec.decode_series)
+
+    async def _set_cached_series(self, series_key: str, series: PriceSeries) -> None:
+        await _price_cache.set(series_key, series, _encode_series, settings.PRICE_SERIES_CACHE_TTL_SEC)
+
+    async def _get_cached_frame(self, cache_key: str) -> Optional[pd.DataFrame]:
+        return await _price_cache.get(cache_key, price_codec.decode_frame, copy=pd.DataFrame.copy)
+
+    async def _set_cached_frame(self, cache_key: str, frame: pd.DataFrame, ttl: int = 3600) -> None:
+        await _price_cache.set(cache_key, frame.copy(), _encode_frame, ttl)
 
     async def get_stock_info(self, code: str, use_cache: bool = True) -> StockInfo:
         """
@@ -55,11 +110,21 @@ class StockService:
         cache_key = f"stock:{code}:info:v2"
 
         # キャッシュ確認
-        if use_cache:
-            cached = await self._get_cache(cache_key)
-            if cached:
-                return StockInfo(**cached)
-
+        if not use_cache:
+            return await self._load_stock_info(code, cache_key)
+        cached = await self._get_cached_info(cache_key)
+        if cached is not None:
+            return cached
+        # 同じ銘柄の同時ミスは 1 回の取得にまとめる（他プロセスの取得結果はキャッシュから拾う）
+        stock_info, shared = await _info_flight.do(
+            cache_key,
+            lambda: self._load_stock_info(code, cache_key),
+            probe=lambda: self._get_cached_info(cache_key),
+        )
+        return stock_info.model_copy() if shared else stock_info
+
+    async def _load_stock_info(self, code: str, cache_key: str) -> StockInfo:
+        """DB → latest_stock_scores → 外部 API の順に銘柄情報を取得してキャッシュに保存する"""
         # DB確認（データベースが利用可能な場合のみ）
         try:
             stock = await self.repository.find_by_code(code)
@@ -94,17 +159,17 @@ class StockService:
                     pass
 
             # キャッシュに保存（1時間）
-            await self._set_cache(cache_key, stock_info.dict(), ttl=3600)
+            await self._set_cached_info(cache_key, stock_info)
 
             return stock_info
 
-        # stock_scores テーブルからフォールバック
+        # latest_stock_scores（公開中の世代）からフォールバック
         try:
             from sqlalchemy import select
-            from app.models.stock_score import StockScore
+            from app.models.stock_score import LatestStockScore
             symbol = f"{code}.T" if not code.endswith(".T") else code
             result = await self.db.execute(
-                select(StockScore).where(StockScore.symbol == symbol).order_by(StockScore.scored_at.desc()).limit(1)
+                select(LatestStockScore).where(LatestStockScore.symbol == symbol)
             )
             score = result.scalar_one_or_none()
             if score:
@@ -119,7 +184,7 @@ class StockService:
                 )
                 # close_price があればキャッシュ、なければキャッシュしない（次回バッチ後に反映）
                 if stock_info.current_price is not None:
-                    await self._set_cache(cache_key, stock_info.dict(), ttl=3600)
+                    await self._set_cached_info(cache_key, stock_info)
                 return stock_info
         except Exception:
             pass
@@ -134,7 +199,7 @@ class StockService:
             pass
 
         # キャッシュに保存（1時間）
-        await self._set_cache(cache_key, stock_info.dict(), ttl=3600)
+        await self._set_cached_info(cache_key, stock_info)
 
         return stock_info
 
@@ -147,7 +212,7 @@ class StockService:
         use_cache: bool = True,
     ) -> List[StockPriceData]:
         """
-        株価データを取得
+        株価データを取得（API 向け。Decimal への変換はここで 1 回だけ行う）
         
         Args:
             code: 銘柄コード
@@ -159,123 +224,397 @@ class StockService:
         Returns:
             List[StockPriceData]: 株価データのリスト
         """
-        # キャッシュキーを生成
-        cache_key = f"stock:{code}:prices:{period or f'{start_date}_{end_date}'}"
+        frame = await self.get_price_frame(
+            code, period=period, start_date=start_date, end_date=end_date, use_cache=use_cache
+        )
+        return frame_to_prices(frame)
 
-        # キャッシュ確認
-        if use_cache:
-            cached = await self._get_cache(cache_key)
-            if cached:
-                return [StockPriceData(**p) for p in cached]
+    async def get_price_version(self, code: str, period: Optional[str] = None) -> Optional[Tuple[float, date]]:
+        """get_stock_prices(period) の応答の版（ETag 用）。キャッシュ済みの正準系列だけを見る（DB は引かない）。
 
-        # 期間を計算
+        (refreshed_at, 最終バー日) を返す。系列がキャッシュに無い・期間を満たさない
+        （取得し直すと中身が変わり得る）場合は None。
+        """
+        series = await self._get_cached_series(f"stock:{code}:prices:v3:series")
+        if series is None or series.frame.empty:
+            return None
+        start, end = self._resolve_range(period, None, None)
+        if any(self._series_gaps(series, start, end)):
+            return None
+        return series.refreshed_at, series.frame["date"].iloc[-1]
+
+    async def get_price_frame(
+        self,
+        code: str,
+        period: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        use_cache: bool = True,
+    ) -> pd.DataFrame:
+        """
+        株価データを float64 の PriceFrame で取得（指標計算・スコアリング向け）
+
+        引数は get_stock_prices と同じ。キャッシュは銘柄ごとの正準系列（PriceSeries）1 つで、
+        要求範囲が系列より古い場合は古い側だけ、直近バーが PRICE_SERIES_REFRESH_SEC より古い
+        場合は最終バー以降だけを取得して系列を伸ばす。
+        
+        Returns:
+            pd.DataFrame: date/open/high/low/close/volume 列の PriceFrame（日付昇順）
+        """
+        start, end = self._resolve_range(period, start_date, end_date)
+        if not use_cache:
+            return await self._load_price_frame(code, start, end, period)
+
+        series = await self._get_series(code, start, end, period)
+        if series is None:
+            return empty_frame()
+        # 切り出しは新しい DataFrame なので、共有した系列でも複製は不要
+        return slice_frame(series.frame, start, end)
+
+    async def _get_series(
+        self, code: str, start: date, end: date, period: Optional[str]
+    ) -> Optional[PriceSeries]:
+        """[start, end] を含む正準系列（足りなければ伸ばす）。取得できなければ None。"""
+        # 期間・日付範囲によらず銘柄ごとの正準系列 1 つから切り出す
+        series_key = f"stock:{code}:prices:v3:series"
+        series = await self._get_cached_series(series_key)
+        if series is None or any(self._series_gaps(series, start, end)):
+            # 同じ範囲の同時ミスは 1 回の取得にまとめる（他プロセスの取得結果はキャッシュから拾う）
+            series, _ = await _price_flight.do(
+                f"{series_key}:{start}:{end}",
+                lambda: self._extend_series(code, series_key, series, start, end, period),
+                probe=lambda: self._get_covering_series(series_key, start, end),
+            )
+        return series
+
+    def _resolve_range(
+        self, period: Optional[str], start_date: Optional[date], end_date: Optional[date]
+    ) -> Tuple[date, date]:
+        """period / 日付範囲を (開始日, 終了日) にする（既定は直近 1 年）"""
         if period:
             end = date.today()
-            days = self._parse_period_to_days(period)
-            start = end - timedelta(days=days)
-        elif start_date and end_date:
-            start = start_date
-            end = end_date
+            return end - timedelta(days=self._parse_period_to_days(period)), end
+        if start_date and end_date:
+            return start_date, end_date
+        end = date.today()
+        return end - timedelta(days=365), end
+
+    @staticmethod
+    def _series_gaps(series: PriceSeries, start: date, end: date) -> Tuple[bool, bool]:
+        """(古い側が足りない, 直近バーの再取得が要る)"""
+        return (
+            series.needs_older(start),
+            series.needs_newer(end, time.time(), settings.PRICE_SERIES_REFRESH_SEC),
+        )
+
+    async def _get_covering_series(self, series_key: str, start: date, end: date) -> Optional[PriceSeries]:
+        """singleflight の probe。ローカルには待つ前の古い系列があるので Redis を直接読む"""
+        series = await _price_cache.get_remote(series_key, price_codec.decode_series)
+        if series is None or any(self._series_gaps(series, start, end)):
+            return None
+        return series
+
+    async def _extend_series(
+        self,
+        code: str,
+        series_key: str,
+        series: Optional[PriceSeries],
+        start: date,
+        end: date,
+        period: Optional[str],
+    ) -> Optional[PriceSeries]:
+        """正準系列に足りない範囲（古い側 / 直近）だけを取得して結合し、キャッシュに保存する。
+
+        系列が無ければ要求範囲の開始日から今日までを取得する（過去だけの範囲でも、
+        refreshed_at 以前のバーは取得済みという前提を守る）。取得できなかった（空の）場合は None。
+        """
+        now = time.time()
+        if series is None:
+            frame = await self._load_price_frame(code, start, max(end, date.today()), period)
+            if frame.empty:
+                return None
+            series = PriceSeries(frame=frame, covered_from=start, refreshed_at=now)
         else:
-            # デフォルト: 1年
-            end = date.today()
-            start = end - timedelta(days=365)
+            older, newer = self._series_gaps(series, start, end)
+            parts = []
+            if older:
+                parts.append(await self._load_price_frame(code, start, series.covered_from - timedelta(days=1)))
+            parts.append(series.frame)
+            if newer:
+                # 取得済みの最終バーから（当日分の確定値で上書きするため 1 本重ねる）
+                last = series.frame["date"].iloc[-1] if not series.frame.empty else series.covered_from
+                parts.append(await self._load_price_frame(code, last, max(end, date.today())))
+            series = PriceSeries(
+                frame=merge_frames(*parts),
+                covered_from=min(start, series.covered_from),
+                refreshed_at=now if newer else series.refreshed_at,
+            )
+        await self._set_cached_series(series_key, series)
+        return series
 
+    async def _load_price_frame(
+        self,
+        code: str,
+        start: date,
+        end: date,
+        period: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """DB（十分新しければ）→ yfinance → Mock の順に [start, end] を取得し、DB に保存する"""
         # DBから取得を試みる（データベースが利用可能な場合のみ）
-        db_prices = []
+        db_frame = empty_frame()
         try:
-            db_prices = await self.repository.get_prices(code, start, end)
+            db_frame = frame_from_rows(await self.repository.get_price_rows(code, start, end))
         except Exception:
             # データベース接続エラーの場合はスキップ
             pass
 
         # データが十分にある場合はDBから返す
-        if len(db_prices) > 0:
-            # 最新データが1日以内ならDBから返す
-            latest_date = max(p.date for p in db_prices)
-            if (date.today() - latest_date).days <= 1:
-                prices = [
-                    StockPriceData(
-                        date=p.date,
-                        open=p.open,
-                        high=p.high,
-                        low=p.low,
-                        close=p.close,
-                        volume=p.volume,
-                    )
-                    for p in db_prices
-                ]
+        if self._db_frame_covers(db_frame, start, end):
+            return db_frame
 
-                # キャッシュに保存（1時間）
-                await self._set_cache(
-                    cache_key, [p.dict() for p in prices], ttl=3600
-                )
+        frame = await self._fetch_price_frame(code, start, end, period)
+        await self._save_price_frame(code, frame)
+        return frame
 
-                return prices
+    @staticmethod
+    def _db_frame_covers(db_frame: pd.DataFrame, start: date, end: date) -> bool:
+        """DB の行が [start, end] を返せるだけ揃っているか。
 
+        最新データが終了日（当日以降なら今日）から1日以内、かつ期間の先頭までカバーしていること。
+        過去の範囲（古い側の延長）は終了日の手前に連休があり得るので先頭と同じ許容幅にする。
+        """
+        if db_frame.empty:
+            return False
+        latest_date = db_frame["date"].iloc[-1]
+        earliest_date = db_frame["date"].iloc[0]
+        today = date.today()
+        tolerance = DB_FRESHNESS_DAYS if end >= today else DB_COVERAGE_TOLERANCE_DAYS
+        return (
+            (min(end, today) - latest_date).days <= tolerance
+            and (earliest_date - start).days <= DB_COVERAGE_TOLERANCE_DAYS
+        )
+
+    async def _fetch_price_frame(
+        self, code: str, start: date, end: date, period: Optional[str] = None
+    ) -> pd.DataFrame:
+        """DB を使わずに取得する（yfinance → Mock）"""
         # yfinance フォールバックを優先（任意の銘柄に対応）
-        prices = await self._fetch_prices_yfinance(code, start, end)
+        frame = await self._fetch_price_frame_yfinance(code, start, end)
 
         # yfinance が失敗したらプロバイダ（Mock）にフォールバック
-        if not prices:
-            prices = await self.provider.get_stock_prices(
-                code, start_date=start, end_date=end, period=period
+        if frame.empty:
+            frame = frame_from_prices(
+                await self.provider.get_stock_prices(
+                    code, start_date=start, end_date=end, period=period
+                )
             )
+        return frame
 
-        # DBに保存（データベースが利用可能な場合のみ）
-        if prices:
+    async def _save_price_frame(self, code: str, frame: pd.DataFrame) -> None:
+        """DBに保存（データベースが利用可能な場合のみ）"""
+        if frame.empty:
+            return
+        try:
+            await self.repository.save_prices(
+                code, list(frame.itertuples(index=False))
+            )
+        except Exception:
+            # データベース接続エラー / 読み取り専用セッション（レプリカ）の場合はスキップ。
+            # 失敗したトランザクションを残すと同じセッションの後続クエリが失敗するため戻す
             try:
-                await self.repository.save_prices(code, prices)
+                await self.db.rollback()
             except Exception:
-                # データベース接続エラーの場合はスキップ
                 pass
 
-        # キャッシュに保存（1時間）
-        if prices:
-            await self._set_cache(
-                cache_key, [p.dict() for p in prices], ttl=3600
-            )
+    async def iter_price_frames(
+        self, codes: List[str], period: Optional[str] = "1y"
+    ) -> AsyncIterator[Tuple[str, Optional[pd.DataFrame], Optional[Exception]]]:
+        """複数銘柄の PriceFrame を揃った順に (銘柄, frame, 例外) で返す（一括取得 API 向け）
 
-        return prices
+        1. 正準系列のキャッシュを 1 回の MGET で引き、範囲を満たすものはすぐ返す
+        2. 残りの DB の行を 1 クエリで引き、DB で足りるものを返す
+        3. それでも無いものは外部 API から並行に取得する（同時数は PRICES_BATCH_CONCURRENCY、
+           呼び出し間隔は yfinance_client の共有スロットル）。同じ範囲の同時ミスは
+           get_price_frame と同じ singleflight で合流する
 
-    async def _fetch_prices_yfinance(
+        取得できなかった銘柄は frame=None と例外（データが空なら StockNotFoundError）を返す。
+        途中で閉じられた（クライアント切断）場合は、まだ始まっていない取得を取り消す。
+        """
+        start, end = self._resolve_range(period, None, None)
+        keys = {code: f"stock:{code}:prices:v3:series" for code in codes}
+        cached = await _price_cache.get_many(list(keys.values()), price_codec.decode_series)
+
+        missing = []
+        for code in codes:
+            series = cached.get(keys[code])
+            if series is not None and not any(self._series_gaps(series, start, end)):
+                yield code, slice_frame(series.frame, start, end), None
+            else:
+                missing.append(code)
+        if not missing:
+            return
+
+        try:
+            rows = await self.repository.get_price_rows_many(missing, start, end)
+        except Exception:
+            # データベース接続エラーの場合はスキップ
+            rows = {}
+        remote = []
+        for code in missing:
+            db_frame = frame_from_rows(rows.get(code, []))
+            if self._db_frame_covers(db_frame, start, end):
+                series = self._series_with(cached.get(keys[code]), db_frame, start)
+                await self._set_cached_series(keys[code], series)
+                yield code, slice_frame(series.frame, start, end), None
+            else:
+                remote.append(code)
+
+        # 外部 API の取得だけを並行にする（同じセッションでの DB 書き込みは 1 つずつ）
+        semaphore = asyncio.Semaphore(max(1, settings.PRICES_BATCH_CONCURRENCY))
+        db_lock = asyncio.Lock()
+
+        async def fetch(code: str) -> PriceSeries:
+            frame = await self._fetch_price_frame(code, start, end, period)
+            if frame.empty:
+                raise StockNotFoundError(code)
+            async with db_lock:
+                await self._save_price_frame(code, frame)
+            series = self._series_with(cached.get(keys[code]), frame, start)
+            await self._set_cached_series(keys[code], series)
+            return series
+
+        async def run(code: str):
+            try:
+                # 同時数は合流の外側で絞る（待っている間に取り消されれば取得は始まらない）
+                async with semaphore:
+                    series, _ = await _price_flight.do(
+                        f"{keys[code]}:{start}:{end}",
+                        lambda: fetch(code),
+                        probe=lambda: self._get_covering_series(keys[code], start, end),
+                    )
+                if series is None:
+                    # get_price_frame 側の取得と合流して空だった場合
+                    raise StockNotFoundError(code)
+                return code, slice_frame(series.frame, start, end), None
+            except Exception as e:
+                return code, None, e
+
+        tasks = [asyncio.ensure_future(run(code)) for code in remote]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _series_with(series: Optional[PriceSeries], frame: pd.DataFrame, start: date) -> PriceSeries:
+        """[start, 今日] を取得した frame を既存の正準系列に結合する"""
+        if series is None:
+            return PriceSeries(frame=frame, covered_from=start, refreshed_at=time.time())
+        return PriceSeries(
+            frame=merge_frames(series.frame, frame),
+            covered_from=min(start, series.covered_from),
+            refreshed_at=time.time(),
+        )
+
+    async def get_stock_names(self, codes: List[str]) -> Dict[str, str]:
+        """複数銘柄の銘柄名（情報キャッシュ → stocks → latest_stock_scores の順。無ければコード）"""
+        keys = {code: f"stock:{code}:info:v2" for code in codes}
+        cached = await _info_cache.get_many(list(keys.values()), _decode_info)
+        names = {code: cached[keys[code]].name for code in codes if keys[code] in cached}
+
+        missing = [code for code in codes if code not in names]
+        if missing:
+            try:
+                names.update(await self.repository.get_names(missing))
+            except Exception:
+                # データベース接続エラーの場合はスキップ
+                pass
+        missing = [code for code in codes if code not in names]
+        if missing:
+            try:
+                from sqlalchemy import select
+                from app.models.stock_score import LatestStockScore
+                symbols = {f"{code}.T" if not code.endswith(".T") else code: code for code in missing}
+                result = await self.db.execute(
+                    select(LatestStockScore.symbol, LatestStockScore.name).where(
+                        LatestStockScore.symbol.in_(list(symbols))
+                    )
+                )
+                names.update({symbols[symbol]: name for symbol, name in result.all() if name})
+            except Exception:
+                pass
+        return {code: names.get(code, code) for code in codes}
+
+    async def _fetch_price_frame_yfinance(
         self, code: str, start: date, end: date
-    ) -> List[StockPriceData]:
+    ) -> pd.DataFrame:
         """yfinance から株価履歴を取得（同期APIを別スレッドで実行）"""
-        import asyncio
         from app.external.yfinance_client import fetch_stock_data
 
         symbol = code if code.endswith(".T") else f"{code}.T"
+        yf_period = self._yfinance_period_for(start)
         try:
-            data = await asyncio.to_thread(fetch_stock_data, symbol)
+            data = await asyncio.to_thread(fetch_stock_data, symbol, yf_period)
         except Exception:
-            return []
+            return empty_frame()
         if not data or "history" not in data:
-            return []
+            return empty_frame()
 
-        history = data["history"]
-        if history is None or history.empty:
-            return []
+        return frame_from_history(data["history"], start, end)
 
-        prices: List[StockPriceData] = []
-        for idx, row in history.iterrows():
-            d = idx.date() if hasattr(idx, "date") else idx
-            if d < start or d > end:
-                continue
-            try:
-                prices.append(
-                    StockPriceData(
-                        date=d,
-                        open=Decimal(str(row["Open"])),
-                        high=Decimal(str(row["High"])),
-                        low=Decimal(str(row["Low"])),
-                        close=Decimal(str(row["Close"])),
-                        volume=int(row["Volume"]),
-                    )
-                )
-            except Exception:
-                continue
-        return prices
+    async def get_resampled_frame(
+        self,
+        code: str,
+        timeframe: str,
+        period: str = "1y",
+    ) -> pd.DataFrame:
+        """
+        日足を週足・月足に集約した PriceFrame を取得
+
+        日足は get_price_frame と同じ正準系列を使い回すため、時間足を増やしても
+        外部 API の呼び出しは増えない。集約結果も (銘柄, 期間, 時間足) ごとにキャッシュし、
+        キーに系列の refreshed_at を含める（直近バーを取り直すと別キーになり、古い集約は使わない）。
+
+        Args:
+            code: 銘柄コード
+            timeframe: 時間足（"1D", "1W", "1M"）
+            period: 元になる日足の期間
+
+        Returns:
+            pd.DataFrame: 集約後の PriceFrame
+
+        Raises:
+            ValueError: 未対応の timeframe
+        """
+        if timeframe not in TIMEFRAME_RULES:
+            raise ValueError(f"unsupported timeframe: {timeframe}")
+        if TIMEFRAME_RULES[timeframe] is None:
+            return await self.get_price_frame(code, period=period)
+
+        start, end = self._resolve_range(period, None, None)
+        series = await self._get_series(code, start, end, period)
+        if series is None:
+            return empty_frame()
+        cache_key = f"stock:{code}:prices:v3:{period}:{timeframe}:{series.refreshed_at:.3f}"
+        cached = await self._get_cached_frame(cache_key)
+        if cached is not None:
+            return cached
+
+        frame = resample_frame(slice_frame(series.frame, start, end), timeframe)
+        if not frame.empty:
+            await self._set_cached_frame(cache_key, frame)
+        return frame
+
+    @staticmethod
+    def _yfinance_period_for(start: date) -> str:
+        """start まで遡れる最小の yfinance period を返す"""
+        days = (date.today() - start).days
+        for yf_period, max_days in YFINANCE_PERIODS:
+            if days <= max_days:
+                return yf_period
+        return YFINANCE_PERIODS[-1][0]
 
     def _parse_period_to_days(self, period: str) -> int:
         """期間文字列を日数に変換"""
@@ -286,5 +625,7 @@ class StockService:
             "3m": 90,
             "6m": 180,
             "1y": 365,
+            "2y": 730,
+            "5y": 1825,
         }
         return period_map.get(period, 365)
@@ -7,6 +7,7 @@ from sqlalchemy import select, desc, func
 
 from app.models.tradingview_signal import TradingViewSignal
 from app.schemas.tradingview_signal import TradingViewSignalCreate
+from app.services.analysis_axes_service import invalidate_axes_cache
 
 
 async def create_signal(
@@ -21,6 +22,7 @@ async def create_signal(
     db.add(signal)
     await db.commit()
     await db.refresh(signal)
+    await invalidate_axes_cache([symbol])
     return signal
 
 
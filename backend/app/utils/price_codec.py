@@ -0,0 +1,150 @@
+"""PriceFrame のキャッシュ用バイナリ形式（Redis の値）
+
+JSON（[{"date": ..., "open": ...}, ...]）はバーごとにキーを繰り返し、ヒットのたびに
+json.loads → dict → DataFrame の再構築がかかる。ここでは列ごとの配列をそのまま詰める:
+
+    ヘッダ（8 バイト, リトルエンディアン）: magic b"PF" / version u8 / compression u8 / 行数 u32
+    本体（compression で圧縮）: open, high, low, close（float64 × n を 4 列）
+                                / volume（int64 × n）/ date（1970-01-01 からの日数 int32 × n）
+
+デコードは np.frombuffer で配列に戻して DataFrame を組むだけで、行ごとの処理は無い。
+PriceSeries（銘柄ごとの正準系列）は 16 バイトのヘッダ（magic b"PS" / version u8 /
+covered_from の日数 i32 / refreshed_at f64）の後に上の形式の frame を続ける。
+version が違う・未知の圧縮・壊れた値は ValueError（キャッシュ側ではミス扱い）。
+圧縮は zstd / lz4（入っていれば）/ zlib / none から選ぶ。
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from app.utils.price_frame import PRICE_COLUMNS, PriceSeries, empty_frame
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstd は任意
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - lz4 は任意
+    lz4_frame = None
+
+MAGIC = b"PF"
+SERIES_MAGIC = b"PS"
+CODEC_VERSION = 1
+
+_HEADER = struct.Struct("<2sBBI")
+_SERIES_HEADER = struct.Struct("<2sBxid")
+
+NONE, ZLIB, ZSTD, LZ4 = 0, 1, 2, 3
+COMPRESSIONS = {"none": NONE, "zlib": ZLIB, "zstd": ZSTD, "lz4": LZ4}
+
+_EPOCH = np.datetime64("1970-01-01", "D")
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def available_compressions() -> list:
+    """このプロセスで使える圧縮名（none / zlib は常に使える）"""
+    names = ["none", "zlib"]
+    if zstandard is not None:
+        names.append("zstd")
+    if lz4_frame is not None:
+        names.append("lz4")
+    return names
+
+
+def resolve_compression(name: str) -> str:
+    """設定値を実際に使う圧縮名にする。auto は zstd → lz4 → none の順で入っているもの。"""
+    if name == "auto":
+        if zstandard is not None:
+            return "zstd"
+        if lz4_frame is not None:
+            return "lz4"
+        return "none"
+    if name not in available_compressions():
+        raise ValueError(f"unavailable price cache compression: {name}")
+    return name
+
+
+def _compress(payload: bytes, compression: int) -> bytes:
+    if compression == ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(payload)
+    if compression == LZ4:
+        return lz4_frame.compress(payload)
+    if compression == ZLIB:
+        return zlib.compress(payload, 6)
+    return payload
+
+
+def _decompress(body: bytes, compression: int) -> bytes:
+    if compression == NONE:
+        return body
+    if compression == ZLIB:
+        return zlib.decompress(body)
+    if compression == ZSTD and zstandard is not None:
+        return zstandard.ZstdDecompressor().decompress(body)
+    if compression == LZ4 and lz4_frame is not None:
+        return lz4_frame.decompress(body)
+    raise ValueError(f"unsupported compression: {compression}")
+
+
+def encode_frame(frame: pd.DataFrame, compression: str = "none") -> bytes:
+    """PriceFrame をバイナリにする（compression は COMPRESSIONS のキーか auto）。"""
+    code = COMPRESSIONS[resolve_compression(compression)]
+    n = len(frame)
+    prices = np.ascontiguousarray(frame[list(PRICE_COLUMNS)].to_numpy(dtype="<f8").T)
+    volume = frame["volume"].to_numpy(dtype="<i8")
+    days = (np.array(frame["date"], dtype="datetime64[D]") - _EPOCH).astype("<i4")
+    payload = prices.tobytes() + volume.tobytes() + days.tobytes()
+    return _HEADER.pack(MAGIC, CODEC_VERSION, code, n) + _compress(payload, code)
+
+
+def decode_frame(data: bytes) -> pd.DataFrame:
+    """encode_frame の出力から PriceFrame を組み立てる。"""
+    if len(data) < _HEADER.size:
+        raise ValueError("price cache value too short")
+    magic, version, code, n = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != CODEC_VERSION:
+        raise ValueError(f"unknown price cache format: {magic!r} v{version}")
+    if n == 0:
+        return empty_frame()
+    payload = _decompress(data[_HEADER.size:], code)
+    if len(payload) != n * (8 * len(PRICE_COLUMNS) + 8 + 4):
+        raise ValueError("price cache value truncated")
+
+    prices = np.frombuffer(payload, dtype="<f8", count=n * len(PRICE_COLUMNS)).reshape(len(PRICE_COLUMNS), n)
+    offset = prices.nbytes
+    volume = np.frombuffer(payload, dtype="<i8", count=n, offset=offset)
+    days = np.frombuffer(payload, dtype="<i4", count=n, offset=offset + volume.nbytes)
+
+    columns = {"date": (days.astype("datetime64[D]")).astype(object)}
+    columns.update({c: prices[i].astype("float64") for i, c in enumerate(PRICE_COLUMNS)})
+    columns["volume"] = volume.astype("int64")
+    return pd.DataFrame(columns)
+
+
+def encode_series(series: PriceSeries, compression: str = "none") -> bytes:
+    """PriceSeries をバイナリにする。"""
+    header = _SERIES_HEADER.pack(
+        SERIES_MAGIC, CODEC_VERSION, series.covered_from.toordinal() - _EPOCH_ORDINAL, series.refreshed_at
+    )
+    return header + encode_frame(series.frame, compression)
+
+
+def decode_series(data: bytes) -> PriceSeries:
+    """encode_series の出力から PriceSeries を組み立てる。"""
+    if len(data) < _SERIES_HEADER.size:
+        raise ValueError("price series value too short")
+    magic, version, days, refreshed_at = _SERIES_HEADER.unpack_from(data)
+    if magic != SERIES_MAGIC or version != CODEC_VERSION:
+        raise ValueError(f"unknown price series format: {magic!r} v{version}")
+    return PriceSeries(
+        frame=decode_frame(data[_SERIES_HEADER.size:]),
+        covered_from=date.fromordinal(_EPOCH_ORDINAL + days),
+        refreshed_at=refreshed_at,
+    )
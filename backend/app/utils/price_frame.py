@@ -0,0 +1,220 @@
+"""OHLCV の float64 内部表現（PriceFrame）
+
+API の `StockPriceData` は Decimal を使うが、指標計算やスコアリングでは float で
+十分なため、内部では次の列を持つ pandas DataFrame（日付昇順）で受け渡す:
+
+    date (datetime.date, object) / open / high / low / close (float64) / volume (int64)
+
+Decimal への変換は `frame_to_prices` による API シリアライズ直前の 1 回だけにする。
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Any, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.stock import StockPriceData
+
+PRICE_COLUMNS = ("open", "high", "low", "close")
+FRAME_COLUMNS = ("date", *PRICE_COLUMNS, "volume")
+
+
+def empty_frame() -> pd.DataFrame:
+    """列だけ持つ空の PriceFrame を返す。"""
+    frame = pd.DataFrame({c: pd.Series(dtype="float64") for c in PRICE_COLUMNS})
+    frame.insert(0, "date", pd.Series(dtype="object"))
+    frame["volume"] = pd.Series(dtype="int64")
+    return frame
+
+
+def _finish(frame: pd.DataFrame) -> pd.DataFrame:
+    for c in PRICE_COLUMNS:
+        frame[c] = frame[c].astype("float64", copy=False)
+    frame["volume"] = frame["volume"].fillna(0).astype("int64", copy=False)
+    frame = frame.dropna(subset=["close"])
+    if not frame["date"].is_monotonic_increasing:
+        frame = frame.sort_values("date", kind="stable")
+    return frame.reset_index(drop=True)
+
+
+def frame_from_rows(rows: Iterable[Sequence[Any]]) -> pd.DataFrame:
+    """(date, open, high, low, close, volume) のタプル列から作る（DB の列 SELECT 結果向け）。"""
+    rows = list(rows)
+    if not rows:
+        return empty_frame()
+    frame = pd.DataFrame.from_records(rows, columns=list(FRAME_COLUMNS), coerce_float=True)
+    return _finish(frame)
+
+
+def frame_from_prices(prices: Sequence[Any]) -> pd.DataFrame:
+    """`StockPriceData`（または同名属性を持つ行）のリストから作る。"""
+    return frame_from_rows(
+        (p.date, p.open, p.high, p.low, p.close, p.volume) for p in prices
+    )
+
+
+def frame_from_records(records: Sequence[dict]) -> pd.DataFrame:
+    """キャッシュ等の dict レコード（date は ISO 文字列可）から作る。"""
+    if not records:
+        return empty_frame()
+    frame = pd.DataFrame.from_records(records, columns=list(FRAME_COLUMNS))
+    frame["date"] = [date.fromisoformat(d) if isinstance(d, str) else d for d in frame["date"]]
+    for c in PRICE_COLUMNS:
+        frame[c] = pd.to_numeric(frame[c], errors="coerce")
+    return _finish(frame)
+
+
+def frame_from_history(
+    history: Optional[pd.DataFrame],
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> pd.DataFrame:
+    """yfinance の history（Open/High/Low/Close/Volume 列, DatetimeIndex）から作る。
+
+    セル単位の変換は行わず、列ごとのベクトル演算で期間を切り出す。
+    """
+    if history is None or history.empty:
+        return empty_frame()
+    idx = history.index
+    dates = np.array([d.date() if hasattr(d, "date") else d for d in idx], dtype=object)
+    mask = np.ones(len(dates), dtype=bool)
+    if start is not None:
+        mask &= dates >= start
+    if end is not None:
+        mask &= dates <= end
+    frame = pd.DataFrame({
+        "date": dates[mask],
+        "open": history["Open"].to_numpy(dtype="float64")[mask],
+        "high": history["High"].to_numpy(dtype="float64")[mask],
+        "low": history["Low"].to_numpy(dtype="float64")[mask],
+        "close": history["Close"].to_numpy(dtype="float64")[mask],
+        "volume": history["Volume"].fillna(0).to_numpy()[mask],
+    })
+    return _finish(frame)
+
+
+def slice_frame(frame: pd.DataFrame, start: Optional[date] = None, end: Optional[date] = None) -> pd.DataFrame:
+    """日付昇順の PriceFrame から [start, end] の行を新しい PriceFrame として切り出す（二分探索）。"""
+    dates = frame["date"]
+    lo = 0 if start is None else int(dates.searchsorted(start, side="left"))
+    hi = len(frame) if end is None else int(dates.searchsorted(end, side="right"))
+    return frame.iloc[lo:hi].copy().reset_index(drop=True)
+
+
+def merge_frames(*frames: pd.DataFrame) -> pd.DataFrame:
+    """PriceFrame を日付で結合する。同じ日付の行は後ろの frame を優先する。"""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return empty_frame()
+    merged = pd.concat(frames, ignore_index=True).drop_duplicates("date", keep="last")
+    return _finish(merged)
+
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """銘柄ごとの正準系列（キャッシュ用）。期間・日付範囲の要求はここから切り出す。
+
+    covered_from: 取得済みの開始日（上場前など、実データの先頭より前のことがある）
+    refreshed_at: 直近バーを最後に取得した時刻（UNIX 秒）。この日までのバーは取得済み
+    """
+
+    frame: pd.DataFrame
+    covered_from: date
+    refreshed_at: float
+
+    @property
+    def refreshed_on(self) -> date:
+        return date.fromtimestamp(self.refreshed_at)
+
+    def needs_older(self, start: date) -> bool:
+        return start < self.covered_from
+
+    def needs_newer(self, end: date, now: float, max_age: float) -> bool:
+        """end までのバーを返すのに直近バーの再取得が要るか（end が取得日以降で、取得から max_age 秒超）"""
+        return end >= self.refreshed_on and now - self.refreshed_at > max_age
+
+
+def frame_to_records(frame: pd.DataFrame) -> List[dict]:
+    """JSON キャッシュ用の dict レコードに変換する（値は float のまま）。"""
+    return [
+        {
+            "date": d.isoformat(),
+            "open": o,
+            "high": h,
+            "low": lo,
+            "close": c,
+            "volume": int(v),
+        }
+        for d, o, h, lo, c, v in zip(
+            frame["date"],
+            frame["open"].tolist(),
+            frame["high"].tolist(),
+            frame["low"].tolist(),
+            frame["close"].tolist(),
+            frame["volume"].tolist(),
+        )
+    ]
+
+
+def frame_to_prices(frame: pd.DataFrame) -> List[StockPriceData]:
+    """API 境界用: `StockPriceData`（Decimal）のリストに変換する。
+
+    値は検証済みの内部データなので `model_construct` で再バリデーションを省く。
+    """
+    return [
+        StockPriceData.model_construct(
+            date=d,
+            open=Decimal(str(o)),
+            high=Decimal(str(h)),
+            low=Decimal(str(lo)),
+            close=Decimal(str(c)),
+            volume=int(v),
+        )
+        for d, o, h, lo, c, v in zip(
+            frame["date"],
+            frame["open"].tolist(),
+            frame["high"].tolist(),
+            frame["low"].tolist(),
+            frame["close"].tolist(),
+            frame["volume"].tolist(),
+        )
+    ]
+
+
+# 時間足 → pandas の期間ルール。1D は日足そのもの（リサンプル不要）
+TIMEFRAME_RULES = {
+    "1D": None,
+    "1W": "W-FRI",
+    "1M": "M",
+}
+
+
+def resample_frame(frame: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """日足 PriceFrame を週足・月足に集約する。
+
+    期間ごとの groupby（cython 集約）で一括計算し、行ループは使わない。
+    各足の date はその期間の最終営業日（未確定の当週・当月は直近営業日）。
+
+    Raises:
+        ValueError: 未対応の timeframe
+    """
+    if timeframe not in TIMEFRAME_RULES:
+        raise ValueError(f"unsupported timeframe: {timeframe}")
+    rule = TIMEFRAME_RULES[timeframe]
+    if rule is None or frame.empty:
+        return frame
+
+    periods = pd.to_datetime(frame["date"]).dt.to_period(rule)
+    grouped = frame.groupby(periods.to_numpy(), sort=True).agg(
+        date=("date", "last"),
+        open=("open", "first"),
+        high=("high", "max"),
+        low=("low", "min"),
+        close=("close", "last"),
+        volume=("volume", "sum"),
+    )
+    return _finish(grouped.reset_index(drop=True))
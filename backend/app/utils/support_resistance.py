@@ -0,0 +1,186 @@
+"""ピボット（スイング高値・安値）ベースのサポート・レジスタンス検出
+
+1 銘柄あたり O(n) で動くように、次の 2 段で構成する:
+
+1. スイング検出: 幅 2k+1 の中心窓の最大値/最小値を単調デックで求め、
+   窓の極値と一致するバーをスイング高値/安値とする（素朴な二重ループだと O(n·k)）。
+2. クラスタリング: ピボット価格を対数スケールで幅 `tolerance` のビンに振り分け、
+   連続する非空ビンを安い順にまとめる。1 本の水準の幅（最安値からの比）は tolerance
+   までで、超えたら次の水準にする。全体のソートは不要で、ビン内だけ並べる
+   （ビンは小さいので実質 O(m + ビン数)）。
+
+pandas に依存しない（numpy 配列 / シーケンスのみ）ため、全銘柄に対して回しても軽い。
+"""
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_PIVOT_WIDTH = 5  # 左右 k 本より高い（安い）バーをスイングとみなす
+DEFAULT_TOLERANCE = 0.015  # 同一水準とみなす価格差（1.5%）
+FALLBACK_LOOKBACK = 20  # ピボットが無い側は直近 N 本の高値/安値で代替
+
+
+def rolling_extrema(values: Sequence[float], window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """末尾揃えの rolling min / max を単調デックで O(n) 計算する。
+
+    先頭 window-1 本は利用可能なバーだけで計算する（NaN にしない）。
+    """
+    return _rolling_extreme(values, window, "min"), _rolling_extreme(values, window, "max")
+
+
+def _rolling_extreme(values: Sequence[float], window: int, side: str) -> np.ndarray:
+    # numpy スカラーの個別アクセスは遅いので Python の float リストで回す
+    arr = np.asarray(values, dtype="float64").tolist()
+    is_max = side == "max"
+    out = []
+    q: deque = deque()
+    for i, v in enumerate(arr):
+        if is_max:
+            while q and arr[q[-1]] <= v:
+                q.pop()
+        else:
+            while q and arr[q[-1]] >= v:
+                q.pop()
+        q.append(i)
+        if q[0] <= i - window:
+            q.popleft()
+        out.append(arr[q[0]])
+    return np.array(out, dtype="float64")
+
+
+def find_pivots(
+    high: Sequence[float],
+    low: Sequence[float],
+    width: int = DEFAULT_PIVOT_WIDTH,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """スイング高値・安値のインデックスを返す。
+
+    バー i は high[i-k..i+k] の最大値ならスイング高値、low[i-k..i+k] の最小値なら
+    スイング安値。右側 k 本が確定していない末尾のバーは対象外。
+    """
+    high_arr = np.asarray(high, dtype="float64")
+    low_arr = np.asarray(low, dtype="float64")
+    n = len(high_arr)
+    window = 2 * width + 1
+    if n < window:
+        return np.array([], dtype=int), np.array([], dtype=int)
+
+    high_max = _rolling_extreme(high_arr, window, "max")
+    low_min = _rolling_extreme(low_arr, window, "min")
+    # 末尾揃え窓の i+k 位置の値 = i を中心とする窓の値
+    center = np.arange(width, n - width)
+    pivot_high = center[high_arr[center] >= high_max[center + width]]
+    pivot_low = center[low_arr[center] <= low_min[center + width]]
+    return pivot_high, pivot_low
+
+
+def cluster_levels(
+    prices: Sequence[float],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> List[Dict[str, float]]:
+    """ピボット価格を水準ごとにまとめ、価格の昇順で返す。
+
+    Returns:
+        [{"level": 平均価格, "touches": ピボット数}, ...]
+    """
+    values = [float(p) for p in prices if p is not None and p > 0 and not math.isnan(p)]
+    if not values:
+        return []
+
+    step = math.log1p(tolerance)
+    bins: Dict[int, List[float]] = {}
+    for p in values:
+        bins.setdefault(math.floor(math.log(p) / step), []).append(p)
+
+    levels: List[Dict[str, float]] = []
+    current: List[float] = []
+    for b in range(min(bins), max(bins) + 1):
+        members = bins.get(b)
+        if not members:
+            if current:
+                levels.append(_to_level(current))
+                current = []
+            continue
+        # 1 本の水準の幅は tolerance まで（隣のビンを連鎖させると上昇トレンドが 1 本に潰れる）
+        for p in sorted(members):
+            if current and p > current[0] * (1 + tolerance):
+                levels.append(_to_level(current))
+                current = []
+            current.append(p)
+    if current:
+        levels.append(_to_level(current))
+    return levels
+
+
+def _to_level(members: List[float]) -> Dict[str, float]:
+    return {"level": sum(members) / len(members), "touches": float(len(members))}
+
+
+def support_resistance_levels(
+    high: Sequence[float],
+    low: Sequence[float],
+    close: Sequence[float],
+    width: int = DEFAULT_PIVOT_WIDTH,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> Dict[str, object]:
+    """現在値に最も近いサポート/レジスタンス水準と、全水準の一覧を返す。
+
+    サポートは終値以下で最も高い水準、レジスタンスは終値より上で最も低い水準。
+    該当する水準が無い側は直近 FALLBACK_LOOKBACK 本の安値/高値で代替する
+    （touches=0 として区別できる）。
+
+    Returns:
+        {
+            "support": float, "support_touches": float,
+            "resistance": float, "resistance_touches": float,
+            "supports": [{"level", "touches"}, ...],      # 終値以下、近い順
+            "resistances": [{"level", "touches"}, ...],   # 終値より上、近い順
+        }
+    """
+    high_arr = np.asarray(high, dtype="float64")
+    low_arr = np.asarray(low, dtype="float64")
+    close_arr = np.asarray(close, dtype="float64")
+    if len(close_arr) == 0:
+        return _empty_levels()
+
+    last_close = float(close_arr[-1])
+    pivot_high, pivot_low = find_pivots(high_arr, low_arr, width)
+    levels = cluster_levels(
+        np.concatenate([high_arr[pivot_high], low_arr[pivot_low]]), tolerance
+    )
+    supports = [lv for lv in reversed(levels) if lv["level"] <= last_close]
+    resistances = [lv for lv in levels if lv["level"] > last_close]
+
+    lookback = min(FALLBACK_LOOKBACK, len(close_arr))
+    support = _nearest(supports, float(np.nanmin(low_arr[-lookback:])))
+    resistance = _nearest(resistances, float(np.nanmax(high_arr[-lookback:])))
+    return {
+        "support": support[0],
+        "support_touches": support[1],
+        "resistance": resistance[0],
+        "resistance_touches": resistance[1],
+        "supports": supports,
+        "resistances": resistances,
+    }
+
+
+def _nearest(levels: List[Dict[str, float]], fallback: float) -> Tuple[float, float]:
+    if levels:
+        return levels[0]["level"], levels[0]["touches"]
+    return (fallback if not math.isnan(fallback) else 0.0), 0.0
+
+
+def _empty_levels() -> Dict[str, object]:
+    return {
+        "support": 0.0,
+        "support_touches": 0.0,
+        "resistance": 0.0,
+        "resistance_touches": 0.0,
+        "supports": [],
+        "resistances": [],
+    }
+
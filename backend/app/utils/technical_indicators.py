@@ -1,202 +1,195 @@
 """Technical indicators calculation"""
 
 import pandas as pd
-import pandas_ta as ta
-from typing import List, Dict, Any
-from decimal import Decimal
+from typing import List, Dict, Any, Union
 from app.schemas.stock import StockPriceData
+from app.utils.price_frame import frame_from_prices
+from app.utils.support_resistance import support_resistance_levels
+
+# 指標計算の入力: 内部の PriceFrame（float64）か、API 互換の StockPriceData リスト
+PriceInput = Union[pd.DataFrame, List[StockPriceData]]
+
+
+def _as_frame(prices: PriceInput) -> pd.DataFrame:
+    if isinstance(prices, pd.DataFrame):
+        return prices
+    return frame_from_prices(prices)
+
+
+def _to_float(value, default: float) -> float:
+    return float(value) if not pd.isna(value) else default
+
+
+def _last(series: pd.Series, default: float) -> float:
+    return _to_float(series.iloc[-1], default)
 
 
 class TechnicalIndicators:
-    """テクニカル指標計算クラス"""
+    """テクニカル指標計算クラス
+
+    各メソッドは PriceFrame（`app.utils.price_frame`）か StockPriceData のリストを受け取り、
+    float を返す。Decimal への変換は API のシリアライズ境界でのみ行う。
+    """
 
     @staticmethod
     def calculate_moving_averages(
-        prices: List[StockPriceData], short: int = 5, medium: int = 25, long: int = 75
-    ) -> Dict[str, Decimal]:
+        prices: PriceInput, short: int = 5, medium: int = 25, long: int = 75
+    ) -> Dict[str, float]:
         """
         移動平均線を計算
-        
+
         Args:
-            prices: 株価データのリスト
+            prices: 株価データ（PriceFrame または StockPriceData のリスト）
             short: 短期移動平均の期間（デフォルト: 5日）
             medium: 中期移動平均の期間（デフォルト: 25日）
             long: 長期移動平均の期間（デフォルト: 75日）
-            
+
         Returns:
-            Dict[str, Decimal]: 移動平均線の値
+            Dict[str, float]: 移動平均線の値
         """
-        if not prices:
-            return {
-                "ma_short": Decimal("0"),
-                "ma_medium": Decimal("0"),
-                "ma_long": Decimal("0"),
-            }
-
-        df = pd.DataFrame([p.dict() for p in prices])
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df = df.sort_values("date")
-
-        ma_short = df["close"].rolling(window=short).mean().iloc[-1]
-        ma_medium = df["close"].rolling(window=medium).mean().iloc[-1]
-        ma_long = df["close"].rolling(window=long).mean().iloc[-1]
+        df = _as_frame(prices)
+        if df.empty:
+            return {"ma_short": 0.0, "ma_medium": 0.0, "ma_long": 0.0}
 
+        close = df["close"]
         return {
-            "ma_short": Decimal(str(ma_short)) if not pd.isna(ma_short) else Decimal("0"),
-            "ma_medium": Decimal(str(ma_medium)) if not pd.isna(ma_medium) else Decimal("0"),
-            "ma_long": Decimal(str(ma_long)) if not pd.isna(ma_long) else Decimal("0"),
+            "ma_short": _last(close.rolling(window=short).mean(), 0.0),
+            "ma_medium": _last(close.rolling(window=medium).mean(), 0.0),
+            "ma_long": _last(close.rolling(window=long).mean(), 0.0),
         }
 
     @staticmethod
-    def calculate_rsi(prices: List[StockPriceData], period: int = 14) -> Decimal:
+    def calculate_rsi(prices: PriceInput, period: int = 14) -> float:
         """
         RSI（相対力指数）を計算
-        
+
         Args:
-            prices: 株価データのリスト
+            prices: 株価データ（PriceFrame または StockPriceData のリスト）
             period: RSIの期間（デフォルト: 14日）
-            
+
         Returns:
-            Decimal: RSIの値（0-100）
+            float: RSIの値（0-100）
         """
-        if len(prices) < period + 1:
-            return Decimal("50")  # データ不足時は中立値
+        df = _as_frame(prices)
+        if len(df) < period + 1:
+            return 50.0  # データ不足時は中立値
 
-        df = pd.DataFrame([p.dict() for p in prices])
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df = df.sort_values("date")
+        import pandas_ta as ta  # 読み込みが重いので最初に使うときに import する
 
         rsi = ta.rsi(df["close"], length=period)
-        rsi_value = rsi.iloc[-1]
-
-        return (
-            Decimal(str(rsi_value)) if not pd.isna(rsi_value) else Decimal("50")
-        )
+        return _last(rsi, 50.0)
 
     @staticmethod
     def calculate_macd(
-        prices: List[StockPriceData], fast: int = 12, slow: int = 26, signal: int = 9
-    ) -> Dict[str, Decimal]:
+        prices: PriceInput, fast: int = 12, slow: int = 26, signal: int = 9
+    ) -> Dict[str, float]:
         """
         MACDを計算
-        
+
         Args:
-            prices: 株価データのリスト
+            prices: 株価データ（PriceFrame または StockPriceData のリスト）
             fast: 短期EMA期間（デフォルト: 12）
             slow: 長期EMA期間（デフォルト: 26）
             signal: シグナル線期間（デフォルト: 9）
-            
+
         Returns:
-            Dict[str, Decimal]: MACD、シグナル、ヒストグラム
+            Dict[str, float]: MACD、シグナル、ヒストグラム
         """
-        if len(prices) < slow + signal:
-            return {
-                "macd": Decimal("0"),
-                "signal": Decimal("0"),
-                "histogram": Decimal("0"),
-            }
+        df = _as_frame(prices)
+        if len(df) < slow + signal:
+            return {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
 
-        df = pd.DataFrame([p.dict() for p in prices])
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df = df.sort_values("date")
+        import pandas_ta as ta
 
         macd_data = ta.macd(df["close"], fast=fast, slow=slow, signal=signal)
 
-        macd_value = macd_data[f"MACD_{fast}_{slow}_{signal}"].iloc[-1]
-        signal_value = macd_data[f"MACDs_{fast}_{slow}_{signal}"].iloc[-1]
-        histogram_value = macd_data[f"MACDh_{fast}_{slow}_{signal}"].iloc[-1]
-
         return {
-            "macd": Decimal(str(macd_value)) if not pd.isna(macd_value) else Decimal("0"),
-            "signal": Decimal(str(signal_value)) if not pd.isna(signal_value) else Decimal("0"),
-            "histogram": Decimal(str(histogram_value)) if not pd.isna(histogram_value) else Decimal("0"),
+            "macd": _last(macd_data[f"MACD_{fast}_{slow}_{signal}"], 0.0),
+            "signal": _last(macd_data[f"MACDs_{fast}_{slow}_{signal}"], 0.0),
+            "histogram": _last(macd_data[f"MACDh_{fast}_{slow}_{signal}"], 0.0),
         }
 
     @staticmethod
     def calculate_bollinger_bands(
-        prices: List[StockPriceData], period: int = 20, std: float = 2.0
-    ) -> Dict[str, Decimal]:
+        prices: PriceInput, period: int = 20, std: float = 2.0
+    ) -> Dict[str, float]:
         """
         ボリンジャーバンドを計算
-        
+
         Args:
-            prices: 株価データのリスト
+            prices: 株価データ（PriceFrame または StockPriceData のリスト）
             period: 移動平均の期間（デフォルト: 20日）
             std: 標準偏差の倍数（デフォルト: 2.0）
-            
+
         Returns:
-            Dict[str, Decimal]: 上バンド、中バンド（移動平均）、下バンド
+            Dict[str, float]: 上バンド、中バンド（移動平均）、下バンド
         """
-        if len(prices) < period:
-            return {
-                "upper": Decimal("0"),
-                "middle": Decimal("0"),
-                "lower": Decimal("0"),
-            }
+        df = _as_frame(prices)
+        if len(df) < period:
+            return {"upper": 0.0, "middle": 0.0, "lower": 0.0}
 
-        df = pd.DataFrame([p.dict() for p in prices])
-        df["close"] = pd.to_numeric(df["close"], errors="coerce")
-        df = df.sort_values("date")
+        import pandas_ta as ta
 
         bb_data = ta.bbands(df["close"], length=period, std=std)
 
-        upper = bb_data[f"BBU_{period}_{std}"].iloc[-1]
-        middle = bb_data[f"BBM_{period}_{std}"].iloc[-1]
-        lower = bb_data[f"BBL_{period}_{std}"].iloc[-1]
-
         return {
-            "upper": Decimal(str(upper)) if not pd.isna(upper) else Decimal("0"),
-            "middle": Decimal(str(middle)) if not pd.isna(middle) else Decimal("0"),
-            "lower": Decimal(str(lower)) if not pd.isna(lower) else Decimal("0"),
+            "upper": _last(bb_data[f"BBU_{period}_{std}"], 0.0),
+            "middle": _last(bb_data[f"BBM_{period}_{std}"], 0.0),
+            "lower": _last(bb_data[f"BBL_{period}_{std}"], 0.0),
         }
 
     @staticmethod
-    def find_support_resistance(prices: List[StockPriceData]) -> Dict[str, Decimal]:
+    def find_support_resistance(prices: PriceInput) -> Dict[str, float]:
         """
         サポート・レジスタンスラインを検出
-        
+
+        スイング高値・安値をクラスタリングした水準のうち、現在値に最も近いものを返す
+        （`app.utils.support_resistance`）。該当する水準が無い側は直近20日の
+        安値・高値で代替し、touches=0 になる。
+
         Args:
-            prices: 株価データのリスト
-            
+            prices: 株価データ（PriceFrame または StockPriceData のリスト）
+
         Returns:
-            Dict[str, Decimal]: サポートライン、レジスタンスライン
+            Dict[str, float]: サポートライン、レジスタンスライン、各水準のピボット数
         """
-        if not prices:
+        df = _as_frame(prices)
+        if df.empty:
             return {
-                "support": Decimal("0"),
-                "resistance": Decimal("0"),
+                "support": 0.0,
+                "resistance": 0.0,
+                "support_touches": 0.0,
+                "resistance_touches": 0.0,
             }
 
-        df = pd.DataFrame([p.dict() for p in prices])
-        df["low"] = pd.to_numeric(df["low"], errors="coerce")
-        df["high"] = pd.to_numeric(df["high"], errors="coerce")
-        df = df.sort_values("date")
-
-        # 簡易的な実装: 過去N日間の最低値と最高値
-        lookback = min(20, len(prices))
-        support = df["low"].tail(lookback).min()
-        resistance = df["high"].tail(lookback).max()
-
+        levels = support_resistance_levels(
+            df["high"].to_numpy(), df["low"].to_numpy(), df["close"].to_numpy()
+        )
         return {
-            "support": Decimal(str(support)) if not pd.isna(support) else Decimal("0"),
-            "resistance": Decimal(str(resistance)) if not pd.isna(resistance) else Decimal("0"),
+            "support": levels["support"],
+            "resistance": levels["resistance"],
+            "support_touches": levels["support_touches"],
+            "resistance_touches": levels["resistance_touches"],
         }
 
     @staticmethod
-    def calculate_all_indicators(prices: List[StockPriceData]) -> Dict[str, Any]:
+    def calculate_all_indicators(prices: PriceInput) -> Dict[str, Any]:
         """
         すべてのテクニカル指標を計算
-        
+
+        PriceFrame への変換は 1 回だけ行い、各指標で使い回す。
+
         Args:
-            prices: 株価データのリスト
-            
+            prices: 株価データ（PriceFrame または StockPriceData のリスト）
+
         Returns:
-            Dict[str, Any]: すべてのテクニカル指標
+            Dict[str, Any]: すべてのテクニカル指標（値はすべて float）
         """
+        df = _as_frame(prices)
         return {
-            "moving_averages": TechnicalIndicators.calculate_moving_averages(prices),
-            "rsi": TechnicalIndicators.calculate_rsi(prices),
-            "macd": TechnicalIndicators.calculate_macd(prices),
-            "bollinger_bands": TechnicalIndicators.calculate_bollinger_bands(prices),
-            "support_resistance": TechnicalIndicators.find_support_resistance(prices),
+            "moving_averages": TechnicalIndicators.calculate_moving_averages(df),
+            "rsi": TechnicalIndicators.calculate_rsi(df),
+            "macd": TechnicalIndicators.calculate_macd(df),
+            "bollinger_bands": TechnicalIndicators.calculate_bollinger_bands(df),
+            "support_resistance": TechnicalIndicators.find_support_resistance(df),
         }
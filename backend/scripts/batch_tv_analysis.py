@@ -10,6 +10,7 @@ import requests
 from sqlalchemy import text
 from app.core.database import engine
 from app.models.tradingview_signal import TradingViewSignal
+from app.services.analysis_axes_service import invalidate_axes_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
@@ -93,17 +94,11 @@ def fetch_tv_batch(symbols: list[str]) -> dict[str, dict]:
 async def get_top100_symbols() -> list[str]:
     async with engine.connect() as conn:
         result = await conn.execute(text("""
-            WITH latest AS (
-                SELECT symbol, MAX(scored_at) as latest_at
-                FROM stock_scores
-                GROUP BY symbol
-            )
-            SELECT s.symbol
-            FROM stock_scores s
-            JOIN latest l ON s.symbol = l.symbol AND s.scored_at = l.latest_at
-            WHERE s.data_quality != 'fetch_error'
-              AND s.total_score IS NOT NULL
-            ORDER BY s.total_score DESC
+            SELECT symbol
+            FROM latest_stock_scores
+            WHERE data_quality != 'fetch_error'
+              AND total_score IS NOT NULL
+            ORDER BY total_score DESC
             LIMIT 100
         """))
         return [row[0] for row in result]
@@ -116,6 +111,7 @@ async def save_signals(signals: list[dict]):
             obj = TradingViewSignal(**sig)
             session.add(obj)
         await session.commit()
+    await invalidate_axes_cache([sig["symbol"] for sig in signals])
     logger.info("DB に %d 件保存しました", len(signals))
 
 
@@ -0,0 +1,94 @@
+"""API のコールドスタート時間のベンチマーク（新しいプロセスでの import → 起動 → 初回リクエスト）。
+
+Usage:
+    cd backend && PYTHONPATH=. python scripts/bench_cold_start.py --runs 5
+    cd backend && PYTHONPATH=. python scripts/bench_cold_start.py --runs 5 --eager   # 比較用
+
+毎回新しいインタプリタで次を測る（Cloud Run のコールドスタート相当。DB / Redis には接続しない）:
+
+- import: `import app.main`（ルーター登録まで）
+- ready:  lifespan の起動完了まで
+- health: 初回 GET /health の応答まで
+- first-use: 起動後に株価サービス（pandas）を初めて import する時間（遅延させた分のコスト）
+
+--eager は従来のように重いサービス（pandas / pandas_ta / yfinance を含む）を app.main より
+先に読み込み、遅延 import による差を見る。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+_CHILD = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+if EAGER:
+    import importlib
+    for name in ("app.services.stock_service", "app.services.chart_analysis_service",
+                 "app.services.evaluation_service", "app.external.yfinance_client"):
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+import app.main
+t_import = time.perf_counter()
+
+from httpx import ASGITransport, AsyncClient
+from app.core import startup_profile
+
+async def boot():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        t_ready = time.perf_counter()
+        async with AsyncClient(transport=ASGITransport(app=app.main.app), base_url="http://test") as client:
+            assert (await client.get("/health")).status_code == 200
+        return t_ready, time.perf_counter()
+
+t_ready, t_health = asyncio.run(boot())
+heavy = startup_profile.loaded_heavy_modules()
+t1 = time.perf_counter()
+import app.services.stock_service
+t_first_use = time.perf_counter() - t1
+print(json.dumps({
+    "import": (t_import - t0) * 1000,
+    "ready": (t_ready - t0) * 1000,
+    "health": (t_health - t0) * 1000,
+    "first-use": t_first_use * 1000,
+    "heavy": heavy,
+    "phases": startup_profile.report()["phases"],
+}))
+"""
+
+
+def run_once(eager: bool) -> dict:
+    code = _CHILD.replace("EAGER", "True" if eager else "False")
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        env={**os.environ, "STARTUP_PROFILE_LOG": "false"},
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(runs: int, eager: bool) -> None:
+    results = [run_once(eager) for _ in range(runs)]
+    print(f"mode: {'eager' if eager else 'lazy'}  runs: {runs}")
+    print(f"{'metric':<10} {'median ms':>10} {'min ms':>8} {'max ms':>8}")
+    for metric in ("import", "ready", "health", "first-use"):
+        values = [r[metric] for r in results]
+        print(f"{metric:<10} {statistics.median(values):>10.1f} {min(values):>8.1f} {max(values):>8.1f}")
+    print(f"heavy modules loaded at boot: {', '.join(results[-1]['heavy']) or 'none'}")
+    print("phases (last run):")
+    for p in results[-1]["phases"]:
+        extra = f"  +{','.join(p['heavy_imports'])}" if p["heavy_imports"] else ""
+        print(f"  {p['name']:<28} {p['ms']:>8.1f} ms{extra}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--eager", action="store_true")
+    args = parser.parse_args()
+    main(args.runs, args.eager)
@@ -0,0 +1,97 @@
+"""重い JSON 応答の圧縮ベンチマーク（転送量と低速回線での応答時間の見積もり）。
+
+Usage:
+    cd backend && PYTHONPATH=. python scripts/bench_compression.py --repeat 20
+
+DB は使わず、各エンドポイント相当の合成データを FastJSONResponse で本文にし、
+無圧縮 / gzip / Brotli（入っていれば）のサイズと圧縮時間を測る。
+応答時間は「RTT + 転送時間 + 圧縮時間」で見積もる（展開時間はクライアント側で無視できる程度）。
+
+    slow-3g: 400ms RTT / 400 kbps,  fast-3g: 150ms / 1.6 Mbps,  4g: 50ms / 10 Mbps
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from app.core import compression
+from app.core.responses import FastJSONResponse, dumps, model_rows
+from app.schemas.stock_score import StockScoreResponse
+from scripts.bench_serialization import synthetic_chart, synthetic_scores
+
+LINKS = {"slow-3g": (0.400, 400_000), "fast-3g": (0.150, 1_600_000), "4g": (0.050, 10_000_000)}
+
+
+def prices_payload(days: int) -> dict:
+    start = date.today() - timedelta(days=days)
+    prices = [
+        {"date": start + timedelta(days=i), "open": f"{1000 + i * 0.5:.2f}", "high": f"{1010 + i * 0.5:.2f}",
+         "low": f"{990 + i * 0.5:.2f}", "close": f"{1005 + i * 0.5:.2f}", "volume": 100_000 + i * 37}
+        for i in range(days) if (start + timedelta(days=i)).weekday() < 5
+    ]
+    return {"stock_code": "7203", "stock_name": "トヨタ自動車", "period": "1y", "prices": prices}
+
+
+def analytics_payload(years: int) -> dict:
+    chart = synthetic_chart(years)
+    return {
+        "symbol": "7203.T",
+        "timing": {
+            "price_series": [{"date": p["date"], "close": 2500.0 + i * 0.7} for i, p in enumerate(chart)],
+            "trade_markers": [
+                {"date": datetime(2022, 1, 1, tzinfo=timezone.utc) + timedelta(days=30 * i),
+                 "action": "buy" if i % 2 == 0 else "sell", "price": 2500.0 + i, "quantity": 100}
+                for i in range(60)
+            ],
+        },
+        "equity_series": [
+            {"date": p["date"], "invested": 250_000.0, "realized_pl": i * 3.0, "unrealized_pl": i * 1.5,
+             "total_pl": i * 4.5}
+            for i, p in enumerate(chart)
+        ],
+    }
+
+
+def payloads(chart_years: int) -> dict:
+    return {
+        "scores limit=500": dumps(model_rows(synthetic_scores(500), StockScoreResponse)),
+        "prices 1y": FastJSONResponse(prices_payload(365)).body,
+        f"chart {chart_years}y": FastJSONResponse(synthetic_chart(chart_years)).body,
+        f"analytics {chart_years}y": FastJSONResponse(analytics_payload(chart_years)).body,
+    }
+
+
+def codecs() -> list:
+    out = [("identity", None), ("gzip-1", ("gzip", 1)), ("gzip-6", ("gzip", 6)), ("gzip-9", ("gzip", 9))]
+    if compression.brotli is not None:
+        out += [("br-4", ("br", 4)), ("br-11", ("br", 11))]
+    return out
+
+
+def main(chart_years: int, repeat: int) -> None:
+    header = f"{'payload':<18} {'codec':<9} {'bytes':>9} {'ratio':>6} {'comp ms':>8}"
+    header += "".join(f" {name + ' ms':>12}" for name in LINKS)
+    print(header)
+    for name, body in payloads(chart_years).items():
+        for label, codec in codecs():
+            if codec is None:
+                size, comp_ms = len(body), 0.0
+            else:
+                t0 = time.perf_counter()
+                for _ in range(repeat):
+                    data = compression.compress(body, *codec)
+                comp_ms = (time.perf_counter() - t0) / repeat * 1000
+                size = len(data)
+            line = f"{name:<18} {label:<9} {size:>9} {len(body) / size:>5.1f}x {comp_ms:>8.2f}"
+            for rtt, bps in LINKS.values():
+                line += f" {(rtt + size * 8 / bps) * 1000 + comp_ms:>12.0f}"
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--chart-years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.chart_years, args.repeat)
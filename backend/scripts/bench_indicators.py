@@ -0,0 +1,227 @@
+"""テクニカル指標のマイクロベンチマーク + 実装間パリティ確認。
+
+Usage:
+    cd backend && PYTHONPATH=. python scripts/bench_indicators.py --bars 75 250 1250 --repeat 30
+    cd backend && PYTHONPATH=. python scripts/bench_indicators.py --json bench_indicators.json
+
+GBM の合成系列（既定 75 / 250 / 1,250 本）に対して次を出力する:
+
+- ベンチマーク: 各カーネルの µs/call と tracemalloc のピーク割り当て量
+    - calc_technical_score（hybrid, ta）
+    - calc_technical_score_from_tv（screener, 断面値 + インクリメンタル MACD フラグ）
+    - macd_incremental の seed / 1 本更新
+    - TechnicalIndicators.calculate_all_indicators（pandas_ta, 入っていれば）
+    - support_resistance_levels
+- パリティ: 同じ系列から計算した値の実装間の最大絶対誤差
+    - RSI / MACD / ボリンジャーバンド: ta vs pandas_ta
+    - MACD: ta vs macd_incremental
+    - rolling min/max: pandas vs 単調デック
+    - technical_score: hybrid vs screener（直近 --score-points 時点で比較）
+
+ta と pandas_ta は EMA/RMA の初期値の取り方や標準偏差の ddof が異なるため、
+その組み合わせの誤差は 0 にならない（系列が短いほど大きい）。数値はドリフトの
+監視用で、スコアリング（ta 基準）の正しさは tests/test_indicator_parity.py で担保する。
+
+pandas_ta は SourceForge の tarball から入れるため環境によっては無い。その場合
+pandas_ta を含むケースは "skip" と表示する。
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import ta
+
+from app.analyzer import macd_incremental as mi
+from app.analyzer.technical import calc_technical_score
+from app.analyzer.technical_from_tv import calc_technical_score_from_tv
+from app.utils.price_frame import frame_from_history
+from app.utils.support_resistance import rolling_extrema, support_resistance_levels
+from scripts.bench_price_pipeline import synthetic_history
+
+try:
+    import pandas_ta
+    from app.utils.technical_indicators import TechnicalIndicators
+except ImportError:  # pragma: no cover - pandas_ta 無しでは該当ケースを skip
+    pandas_ta = None
+    TechnicalIndicators = None
+
+
+def _last_or_none(series: pd.Series) -> Optional[float]:
+    value = series.iloc[-1]
+    return None if pd.isna(value) else float(value)
+
+
+def tv_features_from_history(history: pd.DataFrame) -> Dict[str, Optional[float]]:
+    """history から TV Screener 相当の断面値（tv_row_to_technical_features 形式）を作る。"""
+    close = history["Close"]
+    macd = ta.trend.MACD(close, window_slow=26, window_fast=12, window_sign=9)
+    return {
+        "close": float(close.iloc[-1]),
+        "rsi": _last_or_none(ta.momentum.RSIIndicator(close, window=14).rsi()),
+        "macd": _last_or_none(macd.macd()),
+        "macd_signal": _last_or_none(macd.macd_signal()),
+        "sma25": _last_or_none(close.rolling(25).mean()),
+        "sma75": _last_or_none(close.rolling(75).mean()),
+    }
+
+
+def measure(fn: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """(µs/call, peak KiB) を返す。時間計測と割り当て計測は別パスで行う。"""
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    us = (time.perf_counter() - t0) / repeat * 1e6
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return us, peak / 1024
+
+
+def max_abs_dev(a, b) -> float:
+    """両方が有効な位置どうしの最大絶対誤差（共通の有効値が無ければ NaN）。"""
+    a = np.asarray(a, dtype="float64")
+    b = np.asarray(b, dtype="float64")
+    mask = ~(np.isnan(a) | np.isnan(b))
+    if not mask.any():
+        return math.nan
+    return float(np.max(np.abs(a[mask] - b[mask])))
+
+
+def incremental_macd_series(closes: List[float]) -> tuple[np.ndarray, np.ndarray]:
+    """macd_incremental を 1 本ずつ進めた MACD / Signal の全系列（無効区間は NaN）。"""
+    macd = np.full(len(closes), np.nan)
+    signal = np.full(len(closes), np.nan)
+    state = mi.new_state()
+    for i, close in enumerate(closes):
+        state = mi.advance(state, close)
+        if state["pairs"]:
+            macd[i], signal[i] = state["pairs"][-1]
+    return macd, signal
+
+
+def bench_cases(history: pd.DataFrame) -> Dict[str, Optional[Callable[[], object]]]:
+    closes = history["Close"].tolist()
+    features = tv_features_from_history(history)
+    state = mi.seed_from_closes(closes[:-1])
+    flags = mi.macd_flags(mi.advance(state, closes[-1]))
+    frame = frame_from_history(history)
+    high = frame["high"].to_numpy()
+    low = frame["low"].to_numpy()
+    close = frame["close"].to_numpy()
+    return {
+        "calc_technical_score (ta)": lambda: calc_technical_score(history),
+        "calc_technical_score_from_tv": lambda: calc_technical_score_from_tv(features, flags),
+        "macd_incremental.seed_from_closes": lambda: mi.seed_from_closes(closes),
+        "macd_incremental.advance (1 bar)": lambda: mi.advance(state, closes[-1]),
+        "calculate_all_indicators (pandas_ta)": (
+            (lambda: TechnicalIndicators.calculate_all_indicators(frame))
+            if TechnicalIndicators is not None
+            else None
+        ),
+        "support_resistance_levels": lambda: support_resistance_levels(high, low, close),
+    }
+
+
+def parity_cases(history: pd.DataFrame, score_points: int) -> Dict[str, float]:
+    close = history["Close"]
+    closes = close.tolist()
+    results: Dict[str, float] = {}
+
+    ta_macd = ta.trend.MACD(close, window_slow=26, window_fast=12, window_sign=9)
+    inc_macd, inc_signal = incremental_macd_series(closes)
+    results["macd: ta vs incremental"] = max(
+        max_abs_dev(ta_macd.macd(), inc_macd),
+        max_abs_dev(ta_macd.macd_signal(), inc_signal),
+    )
+
+    if pandas_ta is not None:
+        results["rsi: ta vs pandas_ta"] = max_abs_dev(
+            ta.momentum.RSIIndicator(close, window=14).rsi(), pandas_ta.rsi(close, length=14)
+        )
+        pta_macd = pandas_ta.macd(close, fast=12, slow=26, signal=9)
+        results["macd: ta vs pandas_ta"] = max(
+            max_abs_dev(ta_macd.macd(), pta_macd["MACD_12_26_9"]),
+            max_abs_dev(ta_macd.macd_signal(), pta_macd["MACDs_12_26_9"]),
+        )
+        ta_bb = ta.volatility.BollingerBands(close, window=20, window_dev=2)
+        pta_bb = pandas_ta.bbands(close, length=20, std=2.0)
+        results["bbands: ta vs pandas_ta"] = max(
+            max_abs_dev(ta_bb.bollinger_hband(), pta_bb["BBU_20_2.0"]),
+            max_abs_dev(ta_bb.bollinger_lband(), pta_bb["BBL_20_2.0"]),
+        )
+    else:
+        results["rsi: ta vs pandas_ta"] = math.nan
+        results["macd: ta vs pandas_ta"] = math.nan
+        results["bbands: ta vs pandas_ta"] = math.nan
+
+    window = 11
+    mins, maxs = rolling_extrema(closes, window)
+    results["rolling min/max: pandas vs deque"] = max(
+        max_abs_dev(close.rolling(window, min_periods=1).min(), mins),
+        max_abs_dev(close.rolling(window, min_periods=1).max(), maxs),
+    )
+
+    # hybrid（history 再計算）と screener（断面値 + 逐次 MACD）の technical_score
+    state = mi.new_state()
+    worst = 0.0
+    start = max(len(closes) - score_points, 0)
+    for i, c in enumerate(closes, start=1):
+        state = mi.advance(state, c)
+        if i <= start or i < mi.MIN_BARS:
+            continue
+        prefix = history.iloc[:i]
+        hybrid = calc_technical_score(prefix)["technical_score"]
+        screener = calc_technical_score_from_tv(
+            tv_features_from_history(prefix), mi.macd_flags(state)
+        )["technical_score"]
+        worst = max(worst, abs(hybrid - screener))
+    results["technical_score: hybrid vs screener"] = worst
+    return results
+
+
+def main(bars_list: List[int], repeat: int, score_points: int, json_path: Optional[str]) -> None:
+    print(f"pandas_ta={'on' if pandas_ta is not None else 'off (未インストール)'}")
+    report: Dict[str, list] = {"bench": [], "parity": []}
+
+    print(f"\n{'bars':>6} {'kernel':<38} {'us/call':>12} {'peak KiB':>10}")
+    for bars in bars_list:
+        history = synthetic_history(bars)
+        for label, fn in bench_cases(history).items():
+            if fn is None:
+                print(f"{bars:>6} {label:<38} {'skip':>12} {'skip':>10}")
+                continue
+            us, peak = measure(fn, repeat)
+            report["bench"].append({"bars": bars, "kernel": label, "us_per_call": us, "peak_kib": peak})
+            print(f"{bars:>6} {label:<38} {us:>12.1f} {peak:>10.1f}")
+
+    print(f"\n{'bars':>6} {'pair':<38} {'max |diff|':>12}")
+    for bars in bars_list:
+        for label, dev in parity_cases(synthetic_history(bars), score_points).items():
+            shown = "skip" if math.isnan(dev) else f"{dev:.3e}"
+            report["parity"].append({"bars": bars, "pair": label, "max_abs_dev": None if math.isnan(dev) else dev})
+            print(f"{bars:>6} {label:<38} {shown:>12}")
+
+    if json_path:
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n結果を {json_path} に保存しました")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[75, 250, 1250])
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--score-points", type=int, default=50)
+    parser.add_argument("--json", dest="json_path", default=None)
+    args = parser.parse_args()
+    main(args.bars, args.repeat, args.score_points, args.json_path)
@@ -0,0 +1,78 @@
+"""株価キャッシュ値のサイズとエンコード / デコード時間のベンチマーク（JSON vs price_codec）。
+
+Usage:
+    cd backend && PYTHONPATH=. python scripts/bench_price_codec.py --years 1 5 --repeat 200
+
+Redis は使わず、合成した PriceFrame を値にする時間（encode）と、値から PriceFrame に
+戻す時間（decode）を測る。
+
+- json: 旧形式。json.dumps(frame_to_records(frame), default=str) / frame_from_records(json.loads(raw))
+- codec-*: price_codec のバイナリ（none / zlib / zstd / lz4 のうち入っているもの）
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.utils import price_codec
+from app.utils.price_frame import frame_from_history, frame_from_records, frame_to_records
+
+
+def synthetic_frame(years: int) -> pd.DataFrame:
+    n = 245 * years
+    idx = pd.date_range(end=pd.Timestamp.today().normalize(), periods=n, freq="B", tz="Asia/Tokyo")
+    rng = np.random.default_rng(0)
+    close = np.round(2500.0 * np.exp(np.cumsum(rng.normal(0, 0.015, n))), 1)
+    history = pd.DataFrame(
+        {"Open": close - 5.0, "High": close + 12.5, "Low": close - 12.5, "Close": close,
+         "Volume": rng.integers(100_000, 5_000_000, n).astype(float)},
+        index=idx,
+    )
+    return frame_from_history(history)
+
+
+def formats() -> list:
+    out = [(
+        "json",
+        lambda f: json.dumps(frame_to_records(f), default=str),
+        lambda raw: frame_from_records(json.loads(raw)),
+    )]
+    for name in price_codec.available_compressions():
+        out.append((f"codec-{name}", lambda f, c=name: price_codec.encode_frame(f, c), price_codec.decode_frame))
+    return out
+
+
+def timed(fn: Callable, arg, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def main(years: list, repeat: int) -> None:
+    print(f"{'series':<14} {'format':<12} {'bytes':>9} {'ratio':>6} {'encode ms':>10} {'decode ms':>10}")
+    for y in years:
+        frame = synthetic_frame(y)
+        json_size = None
+        for name, encode, decode in formats():
+            raw = encode(frame)
+            assert decode(raw).equals(frame)
+            size = len(raw.encode() if isinstance(raw, str) else raw)
+            json_size = json_size or size
+            print(
+                f"{f'{y}y ({len(frame)} bars)':<14} {name:<12} {size:>9} {json_size / size:>5.1f}x "
+                f"{timed(encode, frame, repeat):>10.3f} {timed(decode, raw, repeat):>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.years, args.repeat)
@@ -0,0 +1,123 @@
+"""株価 → 指標パイプラインの Decimal 経路 vs float64 経路ベンチマーク。
+
+Usage:
+    cd backend && PYTHONPATH=. python scripts/bench_price_pipeline.py --bars 250 --repeat 50
+
+1 リクエスト相当（yfinance history の取り込み → 指標入力の準備 → API 返却用の変換）を
+旧経路（セル単位の Decimal(str(x)) 生成 + 指標ごとの DataFrame 再構築）と
+新経路（PriceFrame を 1 回だけ作り回す）で比較し、µs/req と tracemalloc のピーク
+割り当て量を出力する。pandas_ta が入っていれば指標計算そのものも含めて測る。
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+from decimal import Decimal
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.schemas.stock import StockPriceData
+from app.utils.price_frame import frame_from_history, frame_to_prices
+
+try:
+    import pandas_ta  # noqa: F401
+    from app.utils.technical_indicators import TechnicalIndicators
+except ImportError:  # pragma: no cover - 指標計算なしで変換コストのみ測る
+    TechnicalIndicators = None
+
+
+def synthetic_history(bars: int, seed: int = 0) -> pd.DataFrame:
+    """GBM で yfinance の history 互換 DataFrame を作る。"""
+    rng = np.random.default_rng(seed)
+    close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.015, bars)))
+    idx = pd.bdate_range(end=pd.Timestamp.today().normalize(), periods=bars)
+    return pd.DataFrame(
+        {
+            "Open": close * (1 + rng.normal(0, 0.003, bars)),
+            "High": close * 1.01,
+            "Low": close * 0.99,
+            "Close": close,
+            "Volume": rng.integers(100_000, 1_000_000, bars).astype(float),
+        },
+        index=idx,
+    )
+
+
+def legacy_pipeline(history: pd.DataFrame) -> None:
+    """変更前の経路を再現する（_fetch_prices_yfinance + 指標ごとの DataFrame 再構築）。"""
+    prices = [
+        StockPriceData(
+            date=idx.date(),
+            open=Decimal(str(row["Open"])),
+            high=Decimal(str(row["High"])),
+            low=Decimal(str(row["Low"])),
+            close=Decimal(str(row["Close"])),
+            volume=int(row["Volume"]),
+        )
+        for idx, row in history.iterrows()
+    ]
+    # 旧 TechnicalIndicators は 5 指標それぞれで DataFrame を作り直していた
+    for _ in range(5):
+        df = pd.DataFrame([p.dict() for p in prices])
+        df["close"] = pd.to_numeric(df["close"], errors="coerce")
+        df = df.sort_values("date")
+        value = df["close"].rolling(window=25).mean().iloc[-1]
+        Decimal(str(value))
+    if TechnicalIndicators is not None:
+        TechnicalIndicators.calculate_all_indicators(prices)
+
+
+def float_pipeline(history: pd.DataFrame, to_api: bool) -> None:
+    """新経路: PriceFrame を 1 回作り、必要なら最後に API 用へ変換する。"""
+    frame = frame_from_history(history)
+    frame["close"].rolling(window=25).mean().iloc[-1]
+    if TechnicalIndicators is not None:
+        TechnicalIndicators.calculate_all_indicators(frame)
+    if to_api:
+        frame_to_prices(frame)
+
+
+def measure(fn: Callable[[], None], repeat: int) -> tuple[float, float]:
+    """(µs/call, peak KiB) を返す。時間計測と割り当て計測は別パスで行う。"""
+    fn()  # warm-up
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    us = (time.perf_counter() - t0) / repeat * 1e6
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return us, peak / 1024
+
+
+def main(bars_list: list[int], repeat: int) -> None:
+    print(f"indicators={'on' if TechnicalIndicators is not None else 'off (pandas_ta 未インストール)'}")
+    print(f"{'bars':>6} {'path':<24} {'us/req':>12} {'peak KiB':>10}")
+    for bars in bars_list:
+        history = synthetic_history(bars)
+        cases = [
+            ("decimal (legacy)", lambda: legacy_pipeline(history)),
+            ("float64 (analysis only)", lambda: float_pipeline(history, to_api=False)),
+            ("float64 + API boundary", lambda: float_pipeline(history, to_api=True)),
+        ]
+        baseline = None
+        for label, fn in cases:
+            us, peak = measure(fn, repeat)
+            baseline = baseline or (us, peak)
+            print(
+                f"{bars:>6} {label:<24} {us:>12.1f} {peak:>10.1f}"
+                f"  (x{baseline[0] / us:.1f} cpu, -{(1 - peak / baseline[1]) * 100:.0f}% alloc)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[250, 1250])
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+    main(args.bars, args.repeat)
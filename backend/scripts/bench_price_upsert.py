@@ -0,0 +1,151 @@
+"""StockRepository.save_prices の往復回数 / 所要時間ベンチマーク（旧: 行ごと SELECT + refresh vs 新: 一括 upsert）。
+
+Usage:
+    cd backend && PYTHONPATH=. python scripts/bench_price_upsert.py --bars 250 1250
+    cd backend && PYTHONPATH=. python scripts/bench_price_upsert.py --dry-run   # DB なしで文数だけ数える
+
+DB モードでは settings.DATABASE_URL に接続し、ベンチ用銘柄（--code、既定 BENCH）に対して
+「新規保存」と「同じ期間の再保存（全行衝突）」を旧経路 / 新経路それぞれで実行する。
+往復回数はエンジンの before_cursor_execute で数えた SQL 文数 + COMMIT。
+終了時にベンチ用銘柄の行は削除する。
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import and_, delete, event, select
+
+from app.models.stock import Stock
+from app.models.stock_price import StockPrice
+from app.repositories.stock_repository import StockRepository
+
+
+def synthetic_bars(bars: int) -> list:
+    start = date.today() - timedelta(days=bars)
+    return [
+        SimpleNamespace(
+            date=start + timedelta(days=i),
+            open=1000.0 + i,
+            high=1010.0 + i,
+            low=990.0 + i,
+            close=1005.0 + i,
+            volume=100_000 + i,
+        )
+        for i in range(bars)
+    ]
+
+
+async def legacy_save_prices(db, code: str, prices: list) -> list:
+    """変更前の save_prices（行ごとに存在確認 SELECT、commit 後に行ごと refresh）"""
+    saved = []
+    for p in prices:
+        result = await db.execute(
+            select(StockPrice).where(and_(StockPrice.stock_code == code, StockPrice.date == p.date))
+        )
+        existing = result.scalar_one_or_none()
+        values = dict(
+            open=Decimal(str(p.open)), high=Decimal(str(p.high)), low=Decimal(str(p.low)),
+            close=Decimal(str(p.close)), volume=int(p.volume),
+        )
+        if existing:
+            for k, v in values.items():
+                setattr(existing, k, v)
+            saved.append(existing)
+        else:
+            obj = StockPrice(stock_code=code, date=p.date, **values)
+            db.add(obj)
+            saved.append(obj)
+    await db.commit()
+    for obj in saved:
+        await db.refresh(obj)
+    return saved
+
+
+async def bulk_save_prices(db, code: str, prices: list) -> int:
+    return await StockRepository(db).save_prices(code, prices)
+
+
+class _CountingDb:
+    """--dry-run 用: execute / commit / refresh の呼び出し回数だけ数える"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def execute(self, stmt):
+        self.calls += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: None)
+
+    def add(self, obj):
+        pass
+
+    async def commit(self):
+        self.calls += 1
+
+    async def refresh(self, obj):
+        self.calls += 1
+
+
+async def dry_run(bars_list: list[int]) -> None:
+    print("dry-run: 旧経路の INSERT は flush 時にまとめて送られるため含まない（下限値）")
+    print(f"{'bars':>6} {'legacy calls':>14} {'bulk calls':>12}")
+    for bars in bars_list:
+        prices = synthetic_bars(bars)
+        legacy, bulk = _CountingDb(), _CountingDb()
+        await legacy_save_prices(legacy, "BENCH", prices)
+        await bulk_save_prices(bulk, "BENCH", prices)
+        print(f"{bars:>6} {legacy.calls:>14} {bulk.calls:>12}")
+
+
+async def db_run(bars_list: list[int], code: str) -> None:
+    from app.core.database import AsyncSessionLocal, engine
+
+    statements = {"n": 0}
+
+    def _count(*_args, **_kwargs):
+        statements["n"] += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    event.listen(engine.sync_engine, "commit", _count)
+
+    async def cleanup():
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(StockPrice).where(StockPrice.stock_code == code))
+            await db.execute(delete(Stock).where(Stock.code == code))
+            await db.commit()
+
+    print(f"{'bars':>6} {'path':<8} {'phase':<8} {'round trips':>12} {'ms':>10}")
+    try:
+        for bars in bars_list:
+            prices = synthetic_bars(bars)
+            for name, fn in (("legacy", legacy_save_prices), ("bulk", bulk_save_prices)):
+                await cleanup()
+                async with AsyncSessionLocal() as db:
+                    db.add(Stock(code=code, name="bench"))
+                    await db.commit()
+                for phase in ("insert", "update"):
+                    async with AsyncSessionLocal() as db:
+                        statements["n"] = 0
+                        t0 = time.perf_counter()
+                        await fn(db, code, prices)
+                        ms = (time.perf_counter() - t0) * 1000
+                    print(f"{bars:>6} {name:<8} {phase:<8} {statements['n']:>12} {ms:>10.1f}")
+    finally:
+        await cleanup()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, nargs="+", default=[250, 1250])
+    parser.add_argument("--code", default="BENCH")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    if args.dry_run:
+        asyncio.run(dry_run(args.bars))
+    else:
+        asyncio.run(db_run(args.bars, args.code))
@@ -0,0 +1,124 @@
+"""一覧レスポンスの組み立て時間ベンチマーク（FastAPI 既定経路 vs orjson 高速経路）。
+
+Usage:
+    cd backend && PYTHONPATH=. python scripts/bench_serialization.py --scores 500 --chart-years 5 --repeat 50
+
+DB は使わず、合成したスコア ORM 行 / チャート点から「エンドポイントの戻り値 → 本文 bytes」
+までを測る。
+
+- 旧経路: 行ごとの StockScoreResponse.model_validate（profile 時は更に属性の書き換え）
+  → response_model による検証 + jsonable_encoder → 標準 json（JSONResponse）
+- 高速経路: model_rows で dict 化 → orjson（FastJSONResponse / responses.dumps）
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import FastJSONResponse, dumps, model_rows
+from app.models.stock_score import LatestStockScore
+from app.schemas.paper_trade import ChartPoint
+from app.schemas.stock_score import StockScoreResponse
+
+
+def synthetic_scores(n: int) -> list:
+    scored_at = datetime(2026, 10, 19, 6, tzinfo=timezone.utc)
+    return [
+        LatestStockScore(
+            id=i, symbol=f"{1000 + i}.T", name=f"銘柄{i}", sector="輸送用機器", scored_at=scored_at,
+            total_score=50 + i % 50, rating="買い", fundamental_score=60.0, technical_score=40.0,
+            kurotenko_score=62.5, kurotenko_criteria={f"c{k}": k % 2 == 0 for k in range(8)},
+            per=12.3, pbr=1.1, roe=0.08, dividend_yield=0.025, revenue_growth=0.05,
+            ma_score=50.0, rsi_score=45.0, macd_score=55.0, close_price=2500.0 + i,
+            data_quality="ok", run_id=3,
+        )
+        for i in range(n)
+    ]
+
+
+def synthetic_chart(years: int) -> list:
+    start = date.today() - timedelta(days=365 * years)
+    return [
+        {"date": start + timedelta(days=i), "cash": 1e6 - i * 10.0, "holdings_value": i * 12.5,
+         "total_value": 1e6 + i * 2.5}
+        for i in range(365 * years + 1)
+    ]
+
+
+def _legacy_render(response_model, content) -> bytes:
+    field = create_response_field(name="response", type_=response_model)
+    encoded = asyncio.run(serialize_response(field=field, response_content=content, is_coroutine=True))
+    return JSONResponse(encoded).body
+
+
+def legacy_scores(rows: list) -> bytes:
+    return _legacy_render(List[StockScoreResponse], rows)
+
+
+def legacy_profile_scores(rows: list) -> bytes:
+    out = []
+    for row in rows:
+        resp = StockScoreResponse.model_validate(row)
+        resp.profile_score = row.total_score
+        resp.profile_name = "balanced"
+        out.append(resp)
+    return _legacy_render(List[StockScoreResponse], out)
+
+
+def fast_scores(rows: list) -> bytes:
+    return dumps(model_rows(rows, StockScoreResponse))
+
+
+def fast_profile_scores(rows: list) -> bytes:
+    out = model_rows(rows, StockScoreResponse)
+    for row, src in zip(out, rows):
+        row["profile_score"] = src.total_score
+        row["profile_name"] = "balanced"
+    return dumps(out)
+
+
+def legacy_chart(points: list) -> bytes:
+    return _legacy_render(List[ChartPoint], points)
+
+
+def fast_chart(points: list) -> bytes:
+    return FastJSONResponse(points).body
+
+
+def bench(fn: Callable, data, repeat: int) -> tuple[float, int]:
+    body = fn(data)
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn(data)
+    return (time.perf_counter() - t0) / repeat * 1000, len(body)
+
+
+def main(n_scores: int, chart_years: int, repeat: int) -> None:
+    scores = synthetic_scores(n_scores)
+    chart = synthetic_chart(chart_years)
+    cases = [
+        (f"scores x{n_scores}", scores, legacy_scores, fast_scores),
+        (f"scores+profile x{n_scores}", scores, legacy_profile_scores, fast_profile_scores),
+        (f"chart {chart_years}y ({len(chart)} pts)", chart, legacy_chart, fast_chart),
+    ]
+    print(f"{'case':<28} {'legacy ms':>10} {'fast ms':>9} {'speedup':>8} {'bytes':>9}")
+    for name, data, legacy, fast in cases:
+        legacy_ms, _ = bench(legacy, data, repeat)
+        fast_ms, size = bench(fast, data, repeat)
+        print(f"{name:<28} {legacy_ms:>10.2f} {fast_ms:>9.2f} {legacy_ms / fast_ms:>7.1f}x {size:>9}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scores", type=int, default=500)
+    parser.add_argument("--chart-years", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    main(args.scores, args.chart_years, args.repeat)
@@ -1,10 +1,13 @@
 """pytest 設定 - 非同期テスト用の共通設定"""
 
+from contextlib import contextmanager
+
 import pytest
 from sqlalchemy.pool import NullPool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
 import app.core.database as db_module
+from app.core.query_stats import install_query_hooks, track_queries
 
 
 @pytest.fixture(autouse=True)
@@ -16,6 +19,7 @@ def patch_db_engine(monkeypatch):
         future=True,
         poolclass=NullPool,
     )
+    install_query_hooks(test_engine)
     test_session_factory = async_sessionmaker(
         test_engine,
         class_=AsyncSession,
@@ -26,3 +30,26 @@ def patch_db_engine(monkeypatch):
 
     monkeypatch.setattr(db_module, "engine", test_engine)
     monkeypatch.setattr(db_module, "AsyncSessionLocal", test_session_factory)
+    monkeypatch.setattr(db_module, "read_engine", test_engine)
+    monkeypatch.setattr(db_module, "ReadSessionLocal", test_session_factory)
+
+
+@pytest.fixture
+def max_queries():
+    """with ブロック内で発行された SQL が limit 件以下であることを検証する。
+
+    使い方:
+        with max_queries(2):
+            await client.get("/api/v1/scores/7203.T/axes")
+    """
+
+    @contextmanager
+    def _assert_max_queries(limit: int):
+        with track_queries() as stats:
+            yield stats
+        assert stats.count <= limit, (
+            f"expected <= {limit} queries, got {stats.count}:\n"
+            + "\n".join(f"  {n}x {sql}" for sql, n in stats.statements.most_common())
+        )
+
+    return _assert_max_queries
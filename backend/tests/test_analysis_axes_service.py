@@ -0,0 +1,107 @@
+"""analysis_axes_service（1 文での集約とキャッシュ）のテスト（DB / Redis 不要）"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import analysis_axes_service as svc
+
+NOW = datetime(2026, 10, 16, 6, 30, tzinfo=timezone.utc)
+SCORE = SimpleNamespace(
+    fundamental_score=30.0, technical_score=40.0, kurotenko_score=75.0,
+    per=12.0, pbr=1.1, roe=0.1, dividend_yield=0.03, revenue_growth=0.05,
+    ma_score=10.0, rsi_score=10.0, macd_score=20.0,
+    kurotenko_criteria={"per": True, "pbr": False},
+)
+CHART = SimpleNamespace(recommendation="buy", trend="bullish", summary="s", signals={}, created_at=NOW)
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        for k in keys:
+            self.store.pop(k, None)
+
+
+class _FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+
+class _FakeDb:
+    def __init__(self, row):
+        self.row = row
+        self.executed = 0
+
+    async def execute(self, stmt):
+        self.executed += 1
+        return _FakeResult(self.row)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    fake = _FakeRedis()
+
+    async def get_redis():
+        return fake
+
+    monkeypatch.setattr(svc, "get_redis", get_redis)
+    return fake
+
+
+def test_single_statement_with_left_joins():
+    sql = str(svc.axes_stmt("7203.T").compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert sql.count("SELECT") == 4  # 起点 + 外側 + chart/TV の LIMIT 1 サブクエリ
+    assert "LEFT OUTER JOIN latest_stock_scores" in sql
+    assert sql.count("LIMIT 1") == 2
+
+
+def test_build_response_skips_missing_axes():
+    resp = svc.build_axes_response("7203.T", SCORE, CHART, None)
+    assert [a.name for a in resp.axes] == ["ファンダメンタル", "テクニカル", "黒点子", "チャート分析"]
+    assert resp.axes[2].detail["criteria_met"] == 1
+    assert svc.build_axes_response("7203.T", None, None, None).axes == []
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_skips_query(redis):
+    db = _FakeDb((SCORE, CHART, None))
+    first = await svc.get_analysis_axes("7203.T", db)
+    second = await svc.get_analysis_axes("7203.T", db)
+    assert db.executed == 1
+    assert second == first
+    assert "analysis_axes:7203.T" in redis.store
+
+
+@pytest.mark.asyncio
+async def test_invalidate(redis):
+    db = _FakeDb((SCORE, None, None))
+    await svc.get_analysis_axes("7203.T", db)
+    await svc.invalidate_axes_cache(["7203.T"])
+    await svc.get_analysis_axes("7203.T", db)
+    assert db.executed == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_down_falls_back_to_db(monkeypatch):
+    async def broken():
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(svc, "get_redis", broken)
+    db = _FakeDb((None, None, None))
+    resp = await svc.get_analysis_axes("7203.T", db)
+    await svc.invalidate_axes_cache(["7203.T"])
+    assert resp.axes == [] and db.executed == 1
@@ -108,10 +108,12 @@ async def test_generate_saves_analysis(monkeypatch):
     from app.services import chart_analysis_service as cas_module
 
     async def fake_get_prices(self, code, period=None, **kwargs):
-        return _fake_prices()
+        from app.utils.price_frame import frame_from_prices
+
+        return frame_from_prices(_fake_prices())
 
     monkeypatch.setattr(
-        cas_module.StockService, "get_stock_prices", fake_get_prices
+        cas_module.StockService, "get_price_frame", fake_get_prices
     )
 
     async with AsyncClient(
@@ -135,10 +137,12 @@ async def test_generate_price_unavailable(monkeypatch):
     from app.services import chart_analysis_service as cas_module
 
     async def fake_get_prices(self, code, period=None, **kwargs):
-        return []
+        from app.utils.price_frame import empty_frame
+
+        return empty_frame()
 
     monkeypatch.setattr(
-        cas_module.StockService, "get_stock_prices", fake_get_prices
+        cas_module.StockService, "get_price_frame", fake_get_prices
     )
 
     async with AsyncClient(
@@ -147,3 +151,41 @@ async def test_generate_price_unavailable(monkeypatch):
         response = await client.post("/api/v1/chart-analysis/0000/generate")
 
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_generate_weekly_from_daily(monkeypatch):
+    from app.services import chart_analysis_service as cas_module
+
+    calls = {"count": 0}
+
+    async def fake_get_prices(self, code, period=None, **kwargs):
+        from app.utils.price_frame import frame_from_prices
+
+        calls["count"] += 1
+        return frame_from_prices(_fake_prices())
+
+    monkeypatch.setattr(
+        cas_module.StockService, "get_price_frame", fake_get_prices
+    )
+
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post("/api/v1/chart-analysis/7777/generate?timeframe=1W")
+
+    assert response.status_code == 201
+    data = response.json()
+    assert data["timeframe"] == "1W"
+    assert "週足" in data["summary"]
+    assert calls["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_generate_invalid_timeframe():
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        response = await client.post("/api/v1/chart-analysis/7777/generate?timeframe=4H")
+
+    assert response.status_code == 400
@@ -0,0 +1,117 @@
+"""JSON 応答の圧縮ミドルウェアのテスト"""
+
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, accepted_encodings
+from app.core.responses import FastJSONResponse
+
+BIG = [{"date": f"2026-01-{i % 28 + 1:02d}", "close": 1000.0 + i} for i in range(500)]
+
+
+def _app(**kwargs) -> FastAPI:
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(CompressionMiddleware, minimum_size=1024, **kwargs)
+
+    @app.get("/big")
+    async def big():
+        return FastJSONResponse(BIG, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/text")
+    async def text():
+        return PlainTextResponse("x" * 5000)
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            yield b"["
+            for i in range(200):
+                yield (b"," if i else b"") + b'{"i":%d}' % i
+            yield b"]"
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    @app.get("/ndjson")
+    async def ndjson():
+        async def lines():
+            for i in range(200):
+                yield b'{"i":%d}\n' % i
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+async def _get(app, path, encoding="gzip"):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get(path, headers={"Accept-Encoding": encoding})
+
+
+def test_accepted_encodings():
+    assert accepted_encodings("gzip, deflate, br;q=0") == {"gzip", "deflate"}
+    assert accepted_encodings("br;q=0.5, gzip;q=1.0") == {"br", "gzip"}
+    assert accepted_encodings("") == set()
+
+
+@pytest.mark.asyncio
+async def test_large_json_is_gzipped_with_weak_etag():
+    response = await _get(_app(use_brotli=False), "/big")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == 'W/"v1"'
+    assert int(response.headers["content-length"]) < len(FastJSONResponse(BIG).body)
+    assert response.json() == BIG
+
+
+@pytest.mark.asyncio
+async def test_small_non_json_and_identity_are_untouched():
+    app = _app()
+    assert "content-encoding" not in (await _get(app, "/small")).headers
+    assert "content-encoding" not in (await _get(app, "/text")).headers
+    plain = await _get(app, "/big", encoding="identity")
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_streaming_json_is_compressed_incrementally():
+    response = await _get(_app(use_brotli=False), "/stream")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert [row["i"] for row in response.json()] == list(range(200))
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_is_compressed_and_flushed_per_line():
+    response = await _get(_app(use_brotli=False), "/ndjson")
+    assert response.headers["content-encoding"] == "gzip"
+    assert [int(line[5:-1]) for line in response.text.splitlines()] == list(range(200))
+
+    # 各チャンクの後に同期フラッシュするので、途中までの出力だけで行が復元できる
+    compressor = compression._Compressor("gzip", 6)
+    partial = compressor.compress(b'{"i":0}\n') + compressor.sync_flush()
+    assert zlib.decompressobj(16 + zlib.MAX_WBITS).decompress(partial) == b'{"i":0}\n'
+
+
+@pytest.mark.asyncio
+async def test_brotli_preferred_when_available():
+    if compression.brotli is None:
+        pytest.skip("brotli 未インストール")
+    response = await _get(_app(), "/big", encoding="gzip, br")
+    assert response.headers["content-encoding"] == "br"
+    assert response.json() == BIG
+
+
+def test_compress_round_trip():
+    data = FastJSONResponse(BIG).body
+    assert gzip.decompress(compression.compress(data, "gzip", 6)) == data
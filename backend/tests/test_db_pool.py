@@ -0,0 +1,86 @@
+"""コネクションプール設定と計測のテスト（DB 不要、SQLite で代用）"""
+
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.core import database
+from app.core.db_pool import InstrumentedQueuePool, pool_stats
+
+
+def _sqlite_engine(**kwargs):
+    return create_engine("sqlite://", poolclass=InstrumentedQueuePool, **kwargs)
+
+
+class TestPoolStats:
+    def test_counts_checkouts_and_overflow(self):
+        engine = _sqlite_engine(pool_size=1, max_overflow=1)
+        a, b = engine.connect(), engine.connect()
+        stats = pool_stats(engine)
+        assert stats["size"] == 1 and stats["max_overflow"] == 1
+        assert stats["checked_out"] == 2 and stats["overflow"] == 1
+        assert stats["checkouts"] == 2 and stats["waits"] == 0
+        a.close(), b.close()
+        assert pool_stats(engine)["checked_in"] == 1
+
+    def test_counts_waits_and_timeouts(self):
+        engine = _sqlite_engine(pool_size=1, max_overflow=0, pool_timeout=0.05)
+        held = engine.connect()
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        stats = pool_stats(engine)
+        assert stats["waits"] == 1 and stats["timeouts"] == 1
+        assert stats["wait_seconds"] >= 0.04
+        held.close()
+
+    def test_none_engine(self):
+        assert pool_stats(None) is None
+
+
+class TestEngineKwargs:
+    def test_pool_settings_applied(self, monkeypatch):
+        monkeypatch.setattr(database.settings, "DB_POOL_SIZE", 7)
+        monkeypatch.setattr(database.settings, "DB_POOL_RECYCLE", 300)
+        kwargs = database._build_engine_kwargs("postgresql+asyncpg://u:p@h/db?sslmode=require")
+        assert kwargs["pool_size"] == 7 and kwargs["pool_recycle"] == 300
+        assert kwargs["connect_args"]["ssl"] is True
+        assert kwargs["connect_args"]["statement_cache_size"] == database.settings.DB_STATEMENT_CACHE_SIZE
+
+    def test_read_pool_override(self):
+        kwargs = database._build_engine_kwargs("postgresql+asyncpg://u:p@h/db", pool_size=2, max_overflow=0)
+        assert kwargs["pool_size"] == 2 and kwargs["max_overflow"] == 0
+
+    def test_pgbouncer_disables_statement_cache(self, monkeypatch):
+        monkeypatch.setattr(database.settings, "DB_PGBOUNCER", True)
+        args = database._build_engine_kwargs("postgresql+asyncpg://u:p@h/db?ssl=false")["connect_args"]
+        assert args["statement_cache_size"] == 0 and args["prepared_statement_cache_size"] == 0
+        name_func = args["prepared_statement_name_func"]
+        assert name_func() != name_func()
+        assert args["ssl"] is False
+
+
+@pytest.mark.asyncio
+async def test_internal_endpoint_reports_engines(monkeypatch):
+    from app.api.v1.internal import get_db_pool_stats
+
+    monkeypatch.setattr(database, "sync_engine", _sqlite_engine(pool_size=2))
+    body = await get_db_pool_stats()
+    assert body["async"]["pool_class"]
+    assert body["sync"]["size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_internal_api_is_disabled_by_default(monkeypatch):
+    from fastapi import FastAPI
+    from httpx import ASGITransport, AsyncClient
+
+    from app.api.v1.internal import router
+    from app.core.config import settings
+
+    app = FastAPI()
+    app.include_router(router, prefix="/internal")
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        monkeypatch.setattr(settings, "INTERNAL_API_ENABLED", False)
+        for path in ("/internal/db-pool", "/internal/cache-stats", "/internal/startup"):
+            assert (await client.get(path)).status_code == 404
+        monkeypatch.setattr(settings, "INTERNAL_API_ENABLED", True)
+        assert (await client.get("/internal/cache-stats")).status_code == 200
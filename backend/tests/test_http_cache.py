@@ -0,0 +1,153 @@
+"""条件付き GET（ETag / If-None-Match）のテスト（DB 不要）"""
+
+from datetime import date
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects import postgresql
+from starlette.requests import Request
+
+from app.core import http_cache
+from app.core.database import get_db, get_read_db
+
+
+def _request(if_none_match=None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+class TestEtag:
+    def test_make_etag_is_strong_and_stable(self):
+        etag = http_cache.make_etag("chart", 1, None, date(2026, 10, 19))
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == http_cache.make_etag("chart", 1, None, date(2026, 10, 19))
+        assert etag != http_cache.make_etag("chart", 2, None, date(2026, 10, 19))
+
+    def test_matches(self):
+        etag = http_cache.make_etag("x")
+        assert http_cache.etag_matches(_request(etag), etag)
+        assert http_cache.etag_matches(_request(f'"other", W/{etag}'), etag)
+        assert http_cache.etag_matches(_request("*"), etag)
+        assert not http_cache.etag_matches(_request('"other"'), etag)
+        assert not http_cache.etag_matches(_request(), etag)
+
+    def test_not_modified(self):
+        response = http_cache.not_modified('"a"')
+        assert response.status_code == 304
+        assert response.headers["ETag"] == '"a"'
+        assert response.headers["Cache-Control"] == "no-cache"
+
+
+def test_chart_version_stmt_single_round_trip():
+    from app.services.paper_trade_service import chart_version_stmt
+
+    sql = str(chart_version_stmt().compile(dialect=postgresql.dialect()))
+    assert sql.count("FROM paper_accounts") == 1
+    assert "max(paper_trades.id)" in sql and "max(stock_prices.date)" in sql
+
+
+def _client(router, prefix):
+    app = FastAPI()
+    app.include_router(router, prefix=prefix)
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_read_db] = lambda: None
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_chart_304_skips_reconstruction(monkeypatch):
+    from app.api.v1.paper_trade import router
+    from app.services import paper_trade_service as svc
+
+    version = [(1, "2026-04-01", 1_000_000.0, 10, date(2026, 10, 17))]
+    calls = []
+
+    async def _chart_version(db):
+        return version[0]
+
+    async def _reconstruct(db, from_date=None, to_date=None):
+        calls.append(from_date)
+        return []
+
+    monkeypatch.setattr(svc, "chart_version", _chart_version)
+    monkeypatch.setattr(svc, "reconstruct_chart", _reconstruct)
+    async with _client(router, "/paper-trade") as client:
+        first = await client.get("/paper-trade/chart")
+        etag = first.headers["ETag"]
+        second = await client.get("/paper-trade/chart", headers={"If-None-Match": etag})
+        assert second.status_code == 304 and second.content == b""
+        assert len(calls) == 1
+
+        # 取引が増えれば版が変わる
+        version[0] = (1, "2026-04-01", 1_000_000.0, 11, date(2026, 10, 17))
+        third = await client.get("/paper-trade/chart", headers={"If-None-Match": etag})
+        assert third.status_code == 200 and third.headers["ETag"] != etag
+        assert len(calls) == 2
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.mark.asyncio
+async def test_prices_304_from_cached_series_version(monkeypatch):
+    """版はキャッシュ済みの正準系列から作る（条件付き GET で DB も外部 API も引かない）"""
+    import pandas as pd
+
+    from app.api.v1.stocks import router
+    from app.core import tiered_cache
+    from app.schemas.stock import StockInfo
+    from app.services import stock_service
+    from app.services.stock_service import StockService
+    from app.utils.price_frame import frame_from_history
+
+    redis = _FakeRedis()
+    loads = []
+
+    async def _get_redis():
+        return redis
+
+    async def _info(self, code, use_cache=True):
+        return StockInfo(code=code, name="トヨタ自動車")
+
+    async def _load(self, code, start, end, period=None):
+        loads.append((start, end))
+        idx = pd.bdate_range(start, end)
+        close = [float(d.toordinal() % 1000) for d in idx]
+        return frame_from_history(pd.DataFrame(
+            {"Open": close, "High": close, "Low": close, "Close": close, "Volume": [100.0] * len(idx)}, index=idx,
+        ))
+
+    monkeypatch.setattr(tiered_cache, "get_redis_binary", _get_redis)
+    monkeypatch.setattr(StockService, "get_stock_info", _info)
+    monkeypatch.setattr(StockService, "_load_price_frame", _load)
+    stock_service._price_cache.local.clear()
+    try:
+        async with _client(router, "/stocks") as client:
+            first = await client.get("/stocks/7203/prices", params={"period": "1m"})
+            etag = first.headers["ETag"]
+            second = await client.get("/stocks/7203/prices", params={"period": "1m"}, headers={"If-None-Match": etag})
+            assert second.status_code == 304
+            assert len(loads) == 1
+
+            # 期間が違えば別の版（系列が期間を満たさなければ取得し直して新しい版になる）
+            other = await client.get("/stocks/7203/prices", params={"period": "1y"}, headers={"If-None-Match": etag})
+            assert other.status_code == 200 and other.headers["ETag"] != etag
+            assert len(loads) == 2
+
+            # 系列がキャッシュに無ければ版が分からないので本体を実行する
+            stock_service._price_cache.local.clear()
+            redis.store.clear()
+            cold = await client.get("/stocks/7203/prices", params={"period": "1m"}, headers={"If-None-Match": etag})
+            assert cold.status_code == 200
+            assert len(loads) == 3
+    finally:
+        stock_service._price_cache.local.clear()
@@ -0,0 +1,63 @@
+"""指標実装間のパリティテスト（hybrid / screener）
+
+pandas_ta と ta の乖離や計測込みの詳細は scripts/bench_indicators.py で確認する。
+合成系列と TV 断面値の作り方はベンチマークと共有する。
+"""
+
+import pytest
+import ta
+
+from app.analyzer import macd_incremental as mi
+from app.analyzer.technical import calc_technical_score
+from app.analyzer.technical_from_tv import calc_technical_score_from_tv
+from scripts.bench_indicators import tv_features_from_history
+from scripts.bench_price_pipeline import synthetic_history
+
+LENGTHS = (75, 250, 1250)
+
+
+class TestTechnicalScoreParity:
+    @pytest.mark.parametrize("bars", LENGTHS)
+    @pytest.mark.parametrize("seed", range(3))
+    def test_screener_matches_hybrid(self, bars, seed):
+        """history 全体から seed した逐次 MACD なら、screener パスが history 再計算と一致する"""
+        history = synthetic_history(bars, seed)
+        closes = history["Close"].tolist()
+        state = mi.seed_from_closes(closes[:-10])
+        for i in range(bars - 10, bars):
+            state = mi.advance(state, closes[i])
+            prefix = history.iloc[: i + 1]
+            hybrid = calc_technical_score(prefix)
+            screener = calc_technical_score_from_tv(tv_features_from_history(prefix), mi.macd_flags(state))
+            assert screener == hybrid
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_unseeded_state_diverges_from_hybrid(self, seed):
+        """history より短い（空から積んだ）状態は hybrid と一致しない。
+
+        - MIN_BARS 本たまるまで macd_flags は None（クロス判定は中立）
+        - EMA は最初に積んだ close から始まるため、ta の EMA との差が (1 - α)^本数 で
+          減衰しながら残る（EMA の漸化式は線形なので差そのものが等比で縮む）
+        """
+        bars, start = 250, 130
+        history = synthetic_history(bars, seed)
+        close = history["Close"]
+        closes = close.tolist()
+        ta_fast = ta.trend.EMAIndicator(close, window=mi.FAST).ema_indicator().tolist()
+        ta_slow = ta.trend.EMAIndicator(close, window=mi.SLOW).ema_indicator().tolist()
+
+        state = mi.new_state()
+        for i in range(start, bars):
+            state = mi.advance(state, closes[i])
+            if state["n"] < mi.MIN_BARS:
+                assert mi.macd_flags(state) is None
+        assert mi.macd_flags(state) is not None
+
+        steps = bars - 1 - start
+        for ema, expected, alpha in (
+            (state["ema_fast"], ta_fast, 2.0 / (mi.FAST + 1)),
+            (state["ema_slow"], ta_slow, 2.0 / (mi.SLOW + 1)),
+        ):
+            initial_gap = closes[start] - expected[start]
+            assert ema - expected[-1] == pytest.approx(initial_gap * (1 - alpha) ** steps, rel=1e-6, abs=1e-9)
+        assert state["ema_slow"] != pytest.approx(ta_slow[-1], abs=1e-6)
@@ -0,0 +1,57 @@
+"""macd_incremental のユニットテスト（ta 実装とのパリティ確認）"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.analyzer import macd_incremental as mi
+from app.analyzer.technical import _calc_macd_state
+
+
+def _closes(n: int, seed: int = 0) -> list[float]:
+    rng = np.random.default_rng(seed)
+    return list(1000 * np.exp(np.cumsum(rng.normal(0, 0.02, n))))
+
+
+class TestParityWithTa:
+    @pytest.mark.parametrize("seed", range(20))
+    def test_flags_match_calc_macd_state(self, seed):
+        closes = _closes(120, seed)
+        state = mi.new_state()
+        for i, c in enumerate(closes, start=1):
+            state = mi.advance(state, c)
+            if i < mi.MIN_BARS:
+                assert mi.macd_flags(state) is None
+                continue
+            expected = _calc_macd_state(pd.DataFrame({"Close": closes[:i]}))
+            assert mi.macd_flags(state) == expected
+
+    def test_values_match_ta(self):
+        import ta
+
+        closes = _closes(80)
+        state = mi.seed_from_closes(closes)
+        macd = ta.trend.MACD(pd.Series(closes), window_slow=26, window_fast=12, window_sign=9)
+        assert state["pairs"][-1][0] == pytest.approx(macd.macd().iloc[-1], abs=1e-9)
+        assert state["pairs"][-1][1] == pytest.approx(macd.macd_signal().iloc[-1], abs=1e-9)
+
+
+class TestUpdateForDay:
+    def test_same_day_rerun_replaces_bar(self):
+        closes = _closes(50)
+        state = mi.seed_from_closes(closes[:-1], as_of="2026-04-01")
+        once = mi.update_for_day(state, closes[-1], "2026-04-02")
+        # 同日に別の close で再実行 → 1 本だけ積まれた状態になる
+        again = mi.update_for_day(once, closes[-1] * 1.1, "2026-04-02")
+        again = mi.update_for_day(again, closes[-1], "2026-04-02")
+        assert again["n"] == once["n"] == 50
+        assert again["pairs"] == once["pairs"]
+        assert again["ema_slow"] == once["ema_slow"]
+
+    def test_none_close_keeps_state(self):
+        state = mi.seed_from_closes(_closes(40))
+        assert mi.update_for_day(state, None, "2026-04-02") is state
+
+    def test_seeded_same_day_is_not_double_counted(self):
+        state = mi.seed_from_closes(_closes(40), as_of="2026-04-02")
+        assert mi.update_for_day(state, 999.0, "2026-04-02")["n"] == 40
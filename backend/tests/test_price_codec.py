@@ -0,0 +1,81 @@
+"""price_codec（株価キャッシュのバイナリ形式）のユニットテスト"""
+
+import json
+import struct
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.utils import price_codec as pc
+from app.utils import price_frame as pf
+
+
+def _frame(n: int = 250) -> pd.DataFrame:
+    idx = pd.date_range("2025-10-01", periods=n, freq="B", tz="Asia/Tokyo")
+    close = np.round(np.linspace(1000.0, 1250.0, n), 1)
+    history = pd.DataFrame(
+        {"Open": close - 1, "High": close + 5, "Low": close - 5, "Close": close, "Volume": np.arange(n) * 100.0},
+        index=idx,
+    )
+    return pf.frame_from_history(history)
+
+
+@pytest.mark.parametrize("compression", pc.available_compressions())
+def test_round_trip(compression):
+    frame = _frame()
+    decoded = pc.decode_frame(pc.encode_frame(frame, compression))
+    assert decoded.equals(frame)
+    assert list(decoded.columns) == list(pf.FRAME_COLUMNS)
+    assert decoded["close"].dtype == np.float64
+    assert decoded["volume"].dtype == np.int64
+
+
+def test_nan_and_empty():
+    frame = _frame(3)
+    frame.loc[1, "high"] = np.nan
+    assert pc.decode_frame(pc.encode_frame(frame)).equals(frame)
+    empty = pc.decode_frame(pc.encode_frame(pf.empty_frame()))
+    assert empty.empty and list(empty.columns) == list(pf.FRAME_COLUMNS)
+
+
+def test_decoded_frame_is_writable():
+    decoded = pc.decode_frame(pc.encode_frame(_frame(3), "none"))
+    decoded.loc[0, "close"] = 1.0
+    assert decoded["close"].iloc[0] == 1.0
+
+
+def test_smaller_than_json_records():
+    frame = _frame()
+    as_json = json.dumps(pf.frame_to_records(frame), default=str).encode()
+    assert len(pc.encode_frame(frame, "none")) < len(as_json) / 2
+
+
+def test_rejects_unknown_version_and_truncated_values():
+    data = pc.encode_frame(_frame(3), "none")
+    newer = struct.pack("<2sBBI", pc.MAGIC, pc.CODEC_VERSION + 1, pc.NONE, 3) + data[8:]
+    with pytest.raises(ValueError):
+        pc.decode_frame(newer)
+    with pytest.raises(ValueError):
+        pc.decode_frame(data[:-4])
+    with pytest.raises(ValueError):
+        pc.decode_frame(b'[{"date": "2026-01-05"}]')
+
+
+def test_resolve_compression():
+    assert pc.resolve_compression("auto") in pc.available_compressions()
+    assert pc.resolve_compression("zlib") == "zlib"
+    with pytest.raises(ValueError):
+        pc.resolve_compression("snappy")
+
+
+def test_series_round_trip():
+    from datetime import date
+
+    series = pf.PriceSeries(_frame(), covered_from=date(2025, 9, 28), refreshed_at=1_767_600_000.25)
+    decoded = pc.decode_series(pc.encode_series(series, "zlib"))
+    assert decoded.covered_from == series.covered_from
+    assert decoded.refreshed_at == series.refreshed_at
+    assert decoded.frame.equals(series.frame)
+    with pytest.raises(ValueError):
+        pc.decode_series(pc.encode_frame(series.frame))
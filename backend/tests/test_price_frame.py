@@ -0,0 +1,127 @@
+"""price_frame（float64 内部表現）のユニットテスト"""
+
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.schemas.stock import StockPriceData
+from app.utils import price_frame as pf
+
+
+def _history(n: int = 5) -> pd.DataFrame:
+    idx = pd.date_range("2026-01-05", periods=n, freq="B", tz="Asia/Tokyo")
+    close = np.linspace(1000.0, 1040.0, n)
+    return pd.DataFrame(
+        {"Open": close - 1, "High": close + 5, "Low": close - 5, "Close": close, "Volume": [1000.0] * n},
+        index=idx,
+    )
+
+
+class TestFrameFromHistory:
+    def test_dtypes_and_order(self):
+        frame = pf.frame_from_history(_history())
+        assert list(frame.columns) == list(pf.FRAME_COLUMNS)
+        assert frame["close"].dtype == np.float64
+        assert frame["volume"].dtype == np.int64
+        assert frame["date"].iloc[0] == date(2026, 1, 5)
+
+    def test_date_range_is_sliced(self):
+        frame = pf.frame_from_history(_history(), start=date(2026, 1, 6), end=date(2026, 1, 8))
+        assert frame["date"].tolist() == [date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 8)]
+
+    def test_empty(self):
+        assert pf.frame_from_history(None).empty
+        assert pf.frame_from_history(pd.DataFrame()).empty
+
+
+class TestRoundTrips:
+    def test_records_round_trip(self):
+        frame = pf.frame_from_history(_history())
+        assert pf.frame_from_records(pf.frame_to_records(frame)).equals(frame)
+
+    def test_prices_boundary_uses_decimal(self):
+        frame = pf.frame_from_history(_history(2))
+        prices = pf.frame_to_prices(frame)
+        assert isinstance(prices[0], StockPriceData)
+        assert prices[0].close == Decimal("1000.0")
+        assert prices[0].model_dump()["volume"] == 1000
+
+    def test_from_prices_and_db_rows(self):
+        prices = [
+            StockPriceData(date=date(2026, 1, 6), open=Decimal("2"), high=Decimal("3"), low=Decimal("1"), close=Decimal("2.5"), volume=10),
+            StockPriceData(date=date(2026, 1, 5), open=Decimal("1"), high=Decimal("2"), low=Decimal("0.5"), close=Decimal("1.5"), volume=5),
+        ]
+        frame = pf.frame_from_prices(prices)
+        # 日付昇順に並び替えられ、Decimal は float64 に変換される
+        assert frame["date"].tolist() == [date(2026, 1, 5), date(2026, 1, 6)]
+        assert frame["close"].tolist() == [1.5, 2.5]
+        assert pf.frame_from_rows([]).empty
+
+
+class TestResampleFrame:
+    def _daily(self, n: int = 40) -> pd.DataFrame:
+        idx = pd.bdate_range("2026-01-01", periods=n)
+        base = np.arange(n, dtype=float)
+        return pf.frame_from_history(pd.DataFrame(
+            {"Open": base + 1, "High": base + 2, "Low": base, "Close": base + 1.5, "Volume": [10.0] * n},
+            index=idx,
+        ))
+
+    def test_weekly_ohlcv(self):
+        weekly = pf.resample_frame(self._daily(), "1W")
+        # 2026-01-01(木)〜01-02(金) が 1 本目、以降は月〜金で 1 本
+        first, second = weekly.iloc[0], weekly.iloc[1]
+        assert first["date"] == date(2026, 1, 2)
+        assert (first["open"], first["high"], first["low"], first["close"]) == (1.0, 3.0, 0.0, 2.5)
+        assert first["volume"] == 20
+        assert second["date"] == date(2026, 1, 9)
+        assert second["volume"] == 50
+        assert weekly["close"].dtype == np.float64
+
+    def test_monthly_last_bar_is_latest_day(self):
+        daily = self._daily()
+        monthly = pf.resample_frame(daily, "1M")
+        assert len(monthly) == 2
+        assert monthly["date"].iloc[-1] == daily["date"].iloc[-1]
+        assert monthly["volume"].sum() == daily["volume"].sum()
+
+    def test_daily_passthrough_and_invalid(self):
+        daily = self._daily()
+        assert pf.resample_frame(daily, "1D") is daily
+        with pytest.raises(ValueError):
+            pf.resample_frame(daily, "4H")
+
+
+class TestSliceAndMerge:
+    def _daily(self) -> pd.DataFrame:
+        return pf.frame_from_history(_history(10))
+
+    def test_slice_is_inclusive_and_independent(self):
+        frame = self._daily()
+        sliced = pf.slice_frame(frame, date(2026, 1, 6), date(2026, 1, 8))
+        assert sliced["date"].tolist() == [date(2026, 1, 6), date(2026, 1, 7), date(2026, 1, 8)]
+        assert sliced.index.tolist() == [0, 1, 2]
+        sliced.loc[0, "close"] = -1.0
+        assert (frame["close"] > 0).all()
+        assert pf.slice_frame(frame, date(2027, 1, 1), date(2027, 2, 1)).empty
+
+    def test_merge_prefers_later_frame(self):
+        frame = self._daily()
+        newer = frame.iloc[8:].copy()
+        newer["close"] = 1.0
+        merged = pf.merge_frames(frame.iloc[:9], newer)
+        assert merged["date"].tolist() == frame["date"].tolist()
+        assert merged["close"].tolist()[-2:] == [1.0, 1.0]
+        assert pf.merge_frames(pf.empty_frame()).empty
+
+    def test_series_gaps(self):
+        series = pf.PriceSeries(self._daily(), covered_from=date(2026, 1, 5), refreshed_at=1_767_600_000.0)
+        assert series.needs_older(date(2026, 1, 1))
+        assert not series.needs_older(date(2026, 1, 5))
+        # 取得日より前で終わる範囲は古くても再取得しない
+        assert not series.needs_newer(date(2025, 12, 31), now=series.refreshed_at + 10**6, max_age=3600)
+        assert series.needs_newer(series.refreshed_on, now=series.refreshed_at + 3601, max_age=3600)
+        assert not series.needs_newer(series.refreshed_on, now=series.refreshed_at + 60, max_age=3600)
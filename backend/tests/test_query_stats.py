@@ -0,0 +1,79 @@
+"""SQL クエリ数 / DB 時間の計測フックとミドルウェアのテスト（DB 不要、SQLite で代用）"""
+
+import logging
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+
+from app.core import query_stats
+from app.core.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, install_query_hooks, track_queries
+
+
+@pytest.fixture
+def sqlite_engine():
+    engine = create_engine("sqlite://")
+    install_query_hooks(engine)
+    install_query_hooks(engine)  # 冪等
+    return engine
+
+
+def test_counts_only_inside_tracker(sqlite_engine):
+    with sqlite_engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    assert stats.count == 2
+    assert stats.seconds >= 0
+
+
+def test_nested_trackers_both_count(sqlite_engine):
+    with sqlite_engine.connect() as conn, track_queries() as outer:
+        conn.execute(text("SELECT 1"))
+        with track_queries() as inner:
+            conn.execute(text("SELECT 1"))
+    assert (outer.count, inner.count) == (2, 1)
+
+
+def test_repeated_statements(sqlite_engine):
+    with sqlite_engine.connect() as conn, track_queries() as stats:
+        for i in range(5):
+            conn.execute(text("SELECT :i"), {"i": i})
+        conn.execute(text("SELECT 'other'"))
+    assert stats.repeated(5) == [("SELECT ?", 5)]
+    assert stats.repeated(6) == []
+
+
+def test_max_queries_fixture(sqlite_engine, max_queries):
+    with sqlite_engine.connect() as conn:
+        with max_queries(1):
+            conn.execute(text("SELECT 1"))
+        with pytest.raises(AssertionError, match="expected <= 1 queries, got 2"):
+            with max_queries(1):
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 1"))
+
+
+@pytest.mark.asyncio
+async def test_middleware_headers_and_n_plus_one_log(sqlite_engine, monkeypatch, caplog):
+    monkeypatch.setattr(query_stats.settings, "DEBUG", True)
+    monkeypatch.setattr(query_stats.settings, "DB_REPEATED_QUERY_THRESHOLD", 3)
+    app = FastAPI()
+    app.middleware("http")(query_stats.query_stats_middleware)
+
+    @app.get("/loop")
+    async def loop():
+        with sqlite_engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {}
+
+    with caplog.at_level(logging.WARNING, logger=query_stats.__name__):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            response = await client.get("/loop")
+    assert response.headers[QUERY_COUNT_HEADER] == "3"
+    assert float(response.headers[QUERY_TIME_HEADER]) >= 0
+    assert "N+1 の疑い (3 回): SELECT ?" in caplog.text
+    assert "GET /loop" in caplog.text
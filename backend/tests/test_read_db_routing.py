@@ -0,0 +1,50 @@
+"""参照系エンドポイントが読み取り用セッション（get_read_db）を使うことのテスト（DB 不要）"""
+
+import pytest
+
+from app.core import database
+from app.core.database import get_db, get_read_db
+
+
+def _db_dependencies(router):
+    """(method, path) → そのルートが使う DB dependency"""
+    out = {}
+    for route in router.routes:
+        calls = {d.call for d in route.dependant.dependencies}
+        dep = get_read_db if get_read_db in calls else get_db if get_db in calls else None
+        for method in route.methods:
+            out[(method, route.path)] = dep
+    return out
+
+
+def test_read_factory_shares_primary_without_read_url():
+    if database.settings.DATABASE_READ_URL:
+        pytest.skip("DATABASE_READ_URL が設定されている")
+    assert database.read_engine is database.engine
+
+
+def test_scores_reads_use_read_db():
+    from app.api.v1.scores import router
+
+    deps = _db_dependencies(router)
+    assert deps[("GET", "")] is get_read_db
+    assert deps[("GET", "/{symbol}")] is get_read_db
+    assert deps[("GET", "/{symbol}/axes")] is get_read_db
+
+
+def test_tv_signals_split():
+    from app.api.v1.tradingview_signals import router
+
+    deps = _db_dependencies(router)
+    assert deps[("GET", "")] is get_read_db
+    assert deps[("GET", "/{symbol}")] is get_read_db
+    assert deps[("POST", "/{symbol}")] is get_db
+
+
+def test_paper_trade_split():
+    from app.api.v1.paper_trade import router
+
+    deps = _db_dependencies(router)
+    for path in ("/chart", "/performance", "/symbols/{symbol}/analytics"):
+        assert deps[("GET", path)] is get_read_db
+    assert deps[("POST", "/trades")] is get_db
@@ -0,0 +1,47 @@
+"""orjson レスポンスと一覧の高速シリアライズ経路のテスト"""
+
+from datetime import date, datetime, timedelta, timezone
+
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse, dumps, model_rows
+from app.models.stock_score import LatestStockScore
+from app.schemas.paper_trade import ChartPoint
+from app.schemas.stock_score import StockScoreResponse
+
+
+def _score(**kwargs) -> LatestStockScore:
+    values = dict(
+        id=1, symbol="7203.T", name="トヨタ自動車", scored_at=datetime(2026, 10, 19, 6, tzinfo=timezone.utc),
+        total_score=72.5, kurotenko_criteria={"per_ok": True}, data_quality="ok", run_id=3,
+    )
+    values.update(kwargs)
+    return LatestStockScore(**values)
+
+
+class TestModelRows:
+    def test_matches_pydantic_serialization(self):
+        scores = [_score(), _score(symbol="6758.T", total_score=None)]
+        expected = TypeAdapter(list[StockScoreResponse]).dump_json(
+            [StockScoreResponse.model_validate(s) for s in scores]
+        )
+        assert dumps(model_rows(scores, StockScoreResponse)) == expected
+
+    def test_missing_fields_use_schema_defaults(self):
+        row = model_rows([{"id": 1, "symbol": "7203.T"}], StockScoreResponse)[0]
+        assert list(row) == list(StockScoreResponse.model_fields)
+        assert row["data_quality"] == "ok" and row["profile_score"] is None
+
+    def test_chart_points_match_pydantic(self):
+        points = [
+            {"date": date(2026, 1, 1) + timedelta(days=i), "cash": 1e6 - i, "holdings_value": i * 1.5,
+             "total_value": 1e6 + i * 0.5}
+            for i in range(3)
+        ]
+        assert dumps(points) == TypeAdapter(list[ChartPoint]).dump_json(points)
+
+
+def test_fast_json_response_renders_nan_as_null():
+    response = FastJSONResponse({"v": float("nan"), "名前": "トヨタ"})
+    assert response.body == '{"v":null,"名前":"トヨタ"}'.encode()
+    assert response.media_type == "application/json"
@@ -0,0 +1,148 @@
+"""スコア一覧の応答キャッシュ（score_cache_service）のテスト（DB / Redis 不要）"""
+
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core.database import get_read_db
+from app.models.stock_score import LatestStockScore
+from app.schemas.stock_score import StockScoreResponse
+from app.services import score_cache_service, score_service
+from app.services.scoring_run_service import PUBLISHED_RUN_REDIS_KEY
+
+
+class _FakeAsyncRedis:
+    def __init__(self, store=None):
+        self.store = dict(store or {})
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+class _FakeSyncRedis:
+    def __init__(self, store):
+        self.store = dict(store)
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return [k for k in list(self.store) if k.startswith(prefix)]
+
+    def delete(self, *keys):
+        for k in keys:
+            self.store.pop(k, None)
+        return len(keys)
+
+
+def _score(symbol: str, total: float) -> LatestStockScore:
+    return LatestStockScore(
+        id=1, symbol=symbol, name="テスト", scored_at=datetime(2026, 10, 19, tzinfo=timezone.utc),
+        total_score=total, data_quality="ok", run_id=3,
+    )
+
+
+class TestCacheKey:
+    def test_filters_order_insensitive(self):
+        a = score_service.ScoreFilters(ratings=["買い", "強い買い"], min_per=5.0)
+        b = score_service.ScoreFilters(ratings=["強い買い", "買い"], min_per=5.0)
+        key_a = score_cache_service.cache_key(3, score_cache_service.list_params("total_score", 50, None, None, a))
+        key_b = score_cache_service.cache_key(3, score_cache_service.list_params("total_score", 50, None, None, b))
+        assert key_a == key_b
+        assert key_a.startswith("scores_resp:3:")
+
+    def test_generation_and_params_change_key(self):
+        params = score_cache_service.list_params("total_score", 50, None, None, score_service.ScoreFilters())
+        other = score_cache_service.list_params("total_score", 100, None, None, score_service.ScoreFilters())
+        assert score_cache_service.cache_key(3, params) != score_cache_service.cache_key(4, params)
+        assert score_cache_service.cache_key(3, params) != score_cache_service.cache_key(3, other)
+
+
+class TestEntry:
+    def test_round_trip(self):
+        body = '[{"name":"トヨタ"}]'.encode()
+        assert score_cache_service.decode_entry(score_cache_service.encode_entry(body, "abc")) == (body, "abc")
+        assert score_cache_service.decode_entry(score_cache_service.encode_entry(body, None)) == (body, None)
+
+    def test_serialize_matches_response_model(self):
+        score = _score("7203.T", 80.0)
+        expected = StockScoreResponse.model_validate(score).model_dump_json()
+        assert score_cache_service.serialize_scores([score]) == f"[{expected}]".encode()
+
+
+def test_invalidate_removes_only_score_responses():
+    redis = _FakeSyncRedis({"scores_resp:3:aa": "x", "scores_resp:2:bb": "x", "analysis_axes:7203.T": "{}"})
+    assert score_cache_service.invalidate_score_cache_sync(redis) == 2
+    assert list(redis.store) == ["analysis_axes:7203.T"]
+    assert score_cache_service.invalidate_score_cache_sync(None) == 0
+
+
+@pytest.fixture
+def scores_client(monkeypatch):
+    from app.api.v1.scores import router
+
+    redis = _FakeAsyncRedis({PUBLISHED_RUN_REDIS_KEY: "3"})
+
+    async def _get_redis():
+        return redis
+
+    calls = []
+
+    async def _list_scores(db, sort, limit, filters, after):
+        calls.append(sort)
+        return [_score("7203.T", 80.0), _score("6758.T", 70.0)]
+
+    monkeypatch.setattr(score_cache_service, "get_redis", _get_redis)
+    monkeypatch.setattr(score_service, "list_scores", _list_scores)
+
+    app = FastAPI()
+    app.include_router(router, prefix="/scores")
+    app.dependency_overrides[get_read_db] = lambda: None
+    client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+    return client, redis, calls
+
+
+@pytest.mark.asyncio
+async def test_list_scores_served_from_cache(scores_client):
+    client, redis, calls = scores_client
+    async with client:
+        first = await client.get("/scores", params={"limit": 2})
+        second = await client.get("/scores", params={"limit": 2})
+        assert calls == ["total_score"]
+        assert second.content == first.content
+        assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+        assert [row["symbol"] for row in second.json()] == ["7203.T", "6758.T"]
+
+        # 世代が変われば引き直す
+        redis.store[PUBLISHED_RUN_REDIS_KEY] = "4"
+        await client.get("/scores", params={"limit": 2})
+        assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_scores_cache_disabled(scores_client, monkeypatch):
+    monkeypatch.setattr(score_cache_service.settings, "SCORES_RESPONSE_CACHE_TTL_SEC", 0)
+    client, redis, calls = scores_client
+    async with client:
+        await client.get("/scores", params={"limit": 2})
+        await client.get("/scores", params={"limit": 2})
+    assert len(calls) == 2
+    assert list(redis.store) == [PUBLISHED_RUN_REDIS_KEY]
+
+
+@pytest.mark.asyncio
+async def test_list_scores_etag_304(scores_client):
+    client, redis, calls = scores_client
+    async with client:
+        first = await client.get("/scores", params={"limit": 2})
+        etag = first.headers["ETag"]
+        second = await client.get("/scores", params={"limit": 2}, headers={"If-None-Match": etag})
+        assert second.status_code == 304 and second.content == b""
+
+        redis.store[PUBLISHED_RUN_REDIS_KEY] = "4"
+        third = await client.get("/scores", params={"limit": 2}, headers={"If-None-Match": etag})
+        assert third.status_code == 200 and third.headers["ETag"] != etag
+    assert len(calls) == 2
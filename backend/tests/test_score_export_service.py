@@ -0,0 +1,91 @@
+"""score_export_service（NDJSON / Arrow ストリーミング出力）のテスト（DB 不要）"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import score_export_service as svc
+from app.services.score_service import ScoreFilters
+
+SCORED_AT = datetime(2026, 10, 16, 6, 30, tzinfo=timezone.utc)
+COLUMNS = ["symbol", "total_score", "scored_at", "kurotenko_criteria", "name"]
+ROWS = [
+    ("7203.T", 71.5, SCORED_AT, {"per": True}, "トヨタ自動車"),
+    ("9984.T", None, SCORED_AT, None, None),
+]
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class TestResolveColumns:
+    def test_all_columns_by_default(self):
+        columns = svc.resolve_columns(None)
+        assert columns[0] in ("symbol", "name")
+        assert {"symbol", "id", "total_score", "kurotenko_criteria"} <= set(columns)
+
+    def test_projection_keeps_order_and_dedups(self):
+        assert svc.resolve_columns("total_score, symbol,total_score") == ["total_score", "symbol"]
+
+    def test_unknown_field(self):
+        with pytest.raises(ValueError, match="nope"):
+            svc.resolve_columns("symbol,nope")
+
+
+class TestExportStmt:
+    def test_projection_filters_and_order(self):
+        stmt = svc.build_export_stmt(["symbol", "per"], ScoreFilters(max_per=15), include_invalid=False)
+        sql = _sql(stmt)
+        assert "SELECT latest_stock_scores.symbol, latest_stock_scores.per" in sql
+        assert "NOT IN ('fetch_error', 'missing_tv')" in sql
+        assert "latest_stock_scores.per <= 15" in sql
+        assert sql.endswith("ORDER BY latest_stock_scores.symbol")
+
+    def test_include_invalid(self):
+        sql = _sql(svc.build_export_stmt(["symbol"], None, include_invalid=True))
+        assert "data_quality" not in sql
+
+
+class TestNdjson:
+    def test_one_object_per_line(self):
+        data = svc.encode_ndjson(COLUMNS, ROWS)
+        lines = data.decode().splitlines()
+        assert data.endswith(b"\n") and len(lines) == 2
+        first = json.loads(lines[0])
+        assert first["name"] == "トヨタ自動車"
+        assert first["scored_at"] == SCORED_AT.isoformat()
+        assert json.loads(lines[1])["total_score"] is None
+
+    def test_empty_chunk(self):
+        assert svc.encode_ndjson(COLUMNS, []) == b""
+
+
+class TestArrow:
+    def test_stream_round_trip_across_chunks(self):
+        pa = pytest.importorskip("pyarrow")
+        encoder = svc.ArrowStreamEncoder(COLUMNS)
+        payload = encoder.encode(ROWS[:1]) + encoder.encode(ROWS[1:]) + encoder.close()
+
+        table = pa.ipc.open_stream(payload).read_all()
+        assert table.num_rows == 2
+        assert table.schema.field("total_score").type == pa.float64()
+        assert table.schema.field("scored_at").type == pa.timestamp("us", tz="UTC")
+        assert table.column("symbol").to_pylist() == ["7203.T", "9984.T"]
+        assert json.loads(table.column("kurotenko_criteria")[0].as_py()) == {"per": True}
+        assert table.column("kurotenko_criteria")[1].as_py() is None
+
+
+class TestStreamExport:
+    @pytest.mark.asyncio
+    async def test_yields_one_piece_per_chunk(self, monkeypatch):
+        async def fake_chunks(columns, filters, include_invalid, chunk_size):
+            for row in ROWS:
+                yield [row]
+
+        monkeypatch.setattr(svc, "iter_row_chunks", fake_chunks)
+        pieces = [p async for p in svc.stream_export("ndjson", COLUMNS, chunk_size=1)]
+        assert len(pieces) == 2
+        assert [json.loads(p)["symbol"] for p in pieces] == ["7203.T", "9984.T"]
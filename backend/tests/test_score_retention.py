@@ -0,0 +1,66 @@
+"""score_retention_service（パーティション / 週次間引き）の純粋関数テスト"""
+
+from datetime import date, datetime, timezone
+
+from app.services import score_retention_service as rs
+
+
+class TestPartitions:
+    def test_add_months_rolls_over_year(self):
+        assert rs.add_months(date(2026, 11, 1), 2) == date(2027, 1, 1)
+
+    def test_months_to_ensure(self):
+        assert rs.months_to_ensure(date(2026, 12, 15)) == [
+            date(2026, 12, 1), date(2027, 1, 1), date(2027, 2, 1),
+        ]
+
+    def test_partition_ddl(self):
+        ddl = rs.partition_ddl(date(2026, 10, 1))
+        assert "CREATE TABLE IF NOT EXISTS stock_scores_y2026m10 PARTITION OF stock_scores" in ddl
+        assert "FROM ('2026-10-01 00:00:00+00') TO ('2026-11-01 00:00:00+00')" in ddl
+
+
+class TestDownsampleCutoff:
+    def test_aligned_to_monday_jst(self):
+        # 2026-10-19 (月) の 90 日前 = 2026-07-21 (火) → その週の月曜 2026-07-20 0:00 JST
+        now = datetime(2026, 10, 19, 3, 0, tzinfo=timezone.utc)
+        cutoff = rs.downsample_cutoff(now, 90)
+        assert cutoff == datetime(2026, 7, 19, 15, 0, tzinfo=timezone.utc)
+        assert cutoff.astimezone(rs.RETENTION_TZ).weekday() == 0
+
+
+class _FakeConn:
+    def __init__(self):
+        self.calls = []
+
+    def execute(self, stmt, params=None):
+        self.calls.append((str(stmt), params))
+
+        class _Result:
+            rowcount = 7
+
+        return _Result()
+
+
+class TestDownsample:
+    NOW = datetime(2026, 10, 19, 3, 0, tzinfo=timezone.utc)
+
+    def test_windowed_by_default(self):
+        conn = _FakeConn()
+        assert rs.downsample(conn, now=self.NOW, daily_days=90) == 7
+        sql, params = conn.calls[0]
+        assert "scored_at >= :since" in sql
+        assert params["cutoff"] - params["since"] == rs.timedelta(days=rs.DOWNSAMPLE_WINDOW_DAYS)
+
+    def test_full_has_no_lower_bound(self):
+        conn = _FakeConn()
+        rs.downsample(conn, now=self.NOW, daily_days=90, full=True)
+        sql, params = conn.calls[0]
+        assert ":since" not in sql
+        assert set(params) == {"cutoff"}
+
+    def test_ensure_partitions_is_idempotent_ddl(self):
+        conn = _FakeConn()
+        names = rs.ensure_partitions(conn, today=date(2026, 10, 19))
+        assert names == ["stock_scores_y2026m10", "stock_scores_y2026m11", "stock_scores_y2026m12"]
+        assert all("IF NOT EXISTS" in sql for sql, _ in conn.calls)
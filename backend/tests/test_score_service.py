@@ -0,0 +1,86 @@
+"""score_service（キーセットページング / フィルタ）のテスト（DB 不要）"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import score_service as svc
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class _FakeResult:
+    def scalars(self):
+        return self
+
+    def all(self):
+        return []
+
+
+class _FakeDb:
+    def __init__(self):
+        self.stmts = []
+
+    async def execute(self, stmt):
+        self.stmts.append(stmt)
+        return _FakeResult()
+
+
+class TestCursor:
+    def test_round_trip(self):
+        cursor = svc.encode_cursor("total_score", 71.25, "7203.T")
+        assert svc.decode_cursor(cursor, "total_score") == (71.25, "7203.T")
+
+    def test_rejects_other_sort(self):
+        cursor = svc.encode_cursor("total_score", 71.25, "7203.T")
+        with pytest.raises(ValueError):
+            svc.decode_cursor(cursor, "technical_score")
+
+    def test_rejects_garbage(self):
+        with pytest.raises(ValueError):
+            svc.decode_cursor("not-a-cursor", "total_score")
+
+    def test_next_cursor_only_when_page_full(self):
+        rows = [SimpleNamespace(symbol="A", total_score=90.0), SimpleNamespace(symbol="B", total_score=80.0)]
+        assert svc.next_cursor(rows, "total_score", limit=3) is None
+        cursor = svc.next_cursor(rows, "total_score", limit=2)
+        assert svc.decode_cursor(cursor, "total_score") == (80.0, "B")
+
+
+class TestListScoresQuery:
+    @pytest.mark.asyncio
+    async def test_keyset_and_filters_in_sql(self):
+        db = _FakeDb()
+        filters = svc.ScoreFilters(
+            sector="輸送用機器",
+            ratings=["買い", "強い買い"],
+            min_total_score=60,
+            max_per=15,
+            min_pbr=0.5,
+            min_kurotenko_criteria=6,
+        )
+        await svc.list_scores(db, sort="technical_score", limit=50, filters=filters, after=(30.0, "7203.T"))
+        sql = _sql(db.stmts[0])
+        assert "FROM latest_stock_scores" in sql
+        assert "latest_stock_scores.sector = '輸送用機器'" in sql
+        assert "latest_stock_scores.rating IN ('買い', '強い買い')" in sql
+        assert "latest_stock_scores.total_score >= 60" in sql
+        assert "latest_stock_scores.per <= 15" in sql
+        assert "latest_stock_scores.pbr >= 0.5" in sql
+        assert "latest_stock_scores.kurotenko_score >= 75.0" in sql
+        assert (
+            "latest_stock_scores.technical_score < 30.0 OR "
+            "latest_stock_scores.technical_score = 30.0 AND latest_stock_scores.symbol > '7203.T'"
+        ) in sql
+        assert "ORDER BY latest_stock_scores.technical_score DESC, latest_stock_scores.symbol ASC" in sql
+        assert "LIMIT 50" in sql
+        assert "OFFSET" not in sql
+
+    @pytest.mark.asyncio
+    async def test_unknown_sort_falls_back(self):
+        db = _FakeDb()
+        await svc.list_scores(db, sort="name")
+        assert "ORDER BY latest_stock_scores.total_score DESC" in _sql(db.stmts[0])
@@ -37,3 +37,20 @@ async def test_batch_status():
     data = response.json()
     assert "status" in data
     assert "processed" in data
+
+
+@pytest.mark.asyncio
+async def test_list_scores_query_budget(max_queries):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        # Redis が無い環境では公開世代の取得も DB に行く（一覧 1 + 世代 1）
+        with max_queries(2):
+            response = await client.get("/api/v1/scores", params={"limit": 50})
+    assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_get_axes_query_budget(max_queries):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        with max_queries(1):
+            response = await client.get("/api/v1/scores/9999.T/axes")
+    assert response.status_code == 200
@@ -0,0 +1,140 @@
+"""scoring_run_service（スコアリング世代の開始 / 公開）のテスト（DB 不要）"""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.models.scoring_run import RUN_RUNNING, ScoringRun
+from app.services import scoring_run_service
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+class _FakeResult:
+    def __init__(self, value=None):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class _FakeSession:
+    def __init__(self, scalar=None):
+        self.scalar = scalar
+        self.executed = []
+        self.added = []
+        self.commits = 0
+
+    def execute(self, stmt):
+        self.executed.append(stmt)
+        return _FakeResult(self.scalar)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    def flush(self):
+        for obj in self.added:
+            obj.id = 7
+
+    def commit(self):
+        self.commits += 1
+
+
+class _FakeRedis:
+    def __init__(self, store=None):
+        self.store = dict(store or {})
+
+    def set(self, key, value):
+        self.store[key] = value
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip("*")
+        return [k for k in list(self.store) if k.startswith(prefix)]
+
+    def delete(self, *keys):
+        for k in keys:
+            self.store.pop(k, None)
+        return len(keys)
+
+
+class TestPublishStmts:
+    def test_latest_publish_reads_only_the_run(self):
+        sql = _sql(scoring_run_service.latest_publish_stmt(12))
+        assert sql.startswith("INSERT INTO latest_stock_scores")
+        assert "DISTINCT ON (stock_scores.symbol)" in sql
+        assert "WHERE stock_scores.run_id = 12" in sql
+        assert "ON CONFLICT (symbol) DO UPDATE" in sql
+        assert "run_id = excluded.run_id" in sql
+        # 世代丸ごと差し替えるので scored_at による上書き抑止はしない
+        assert "latest_stock_scores.scored_at <=" not in sql
+
+    def test_publish_swaps_snapshot_and_generation(self):
+        upsert, delete, supersede, publish = [
+            _sql(s) for s in scoring_run_service.publish_stmts(12, total=100, processed=98, failed=2)
+        ]
+        assert upsert.startswith("INSERT INTO latest_stock_scores")
+        assert delete == "DELETE FROM latest_stock_scores WHERE latest_stock_scores.run_id IS DISTINCT FROM 12"
+        assert "SET status='superseded'" in supersede
+        assert "scoring_runs.status = 'published' AND scoring_runs.id != 12" in supersede
+        assert "status='published'" in publish and "published_at=now()" in publish
+        assert "processed=98" in publish and "WHERE scoring_runs.id = 12" in publish
+
+
+class TestRunLifecycle:
+    def test_begin_run_fails_stale_runs_and_commits(self):
+        session = _FakeSession()
+        assert scoring_run_service.begin_run(session, "hybrid") == 7
+        assert "SET status='failed' WHERE scoring_runs.status = 'running'" in _sql(session.executed[0])
+        run = session.added[0]
+        assert isinstance(run, ScoringRun)
+        assert (run.source, run.status) == ("hybrid", RUN_RUNNING)
+        assert session.commits == 1
+
+    def test_resume_run(self):
+        assert scoring_run_service.resume_run(_FakeSession(scalar=5)) == 5
+        assert scoring_run_service.resume_run(_FakeSession()) is None
+
+    def test_publish_run_sets_generation_and_clears_caches(self):
+        session = _FakeSession()
+        redis = _FakeRedis({
+            "analysis_axes:7203.T": "{}", "scores_resp:11:ab": "[]", "macd_state:7203.T": "{}",
+        })
+        scoring_run_service.publish_run(session, 12, total=3, processed=3, failed=0, redis_client=redis)
+        assert len(session.executed) == 4 and session.commits == 1
+        assert redis.store[scoring_run_service.PUBLISHED_RUN_REDIS_KEY] == 12
+        assert "analysis_axes:7203.T" not in redis.store
+        assert "scores_resp:11:ab" not in redis.store
+        assert "macd_state:7203.T" in redis.store
+
+    def test_publish_run_without_redis(self):
+        session = _FakeSession()
+        scoring_run_service.publish_run(session, 12, total=0, processed=0, failed=0)
+        assert session.commits == 1
+
+
+class _FakeAsyncDb:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    async def execute(self, stmt):
+        self.calls += 1
+        return _FakeResult(self.value)
+
+
+class _FakeAsyncRedis:
+    def __init__(self, value):
+        self.value = value
+
+    async def get(self, key):
+        return self.value
+
+
+@pytest.mark.asyncio
+async def test_get_published_run_id_prefers_redis():
+    db = _FakeAsyncDb(3)
+    assert await scoring_run_service.get_published_run_id(db, _FakeAsyncRedis("9")) == 9
+    assert db.calls == 0
+    assert await scoring_run_service.get_published_run_id(db, _FakeAsyncRedis(None)) == 3
+    assert await scoring_run_service.get_published_run_id(db) == 3
@@ -117,3 +117,123 @@ class TestScoreSymbol:
         monkeypatch.setattr("app.external.yfinance_client.fetch_stock_data", lambda s: None)
         monkeypatch.setattr("app.external.tradingview_ta_client.fetch_stock_data_tv", lambda s: None)
         assert scoring_service._score_symbol("X.T", "x", "y", "hybrid") is None
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    def mget(self, keys):
+        return [self.store.get(k) for k in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def execute(self):
+        return []
+
+    def delete(self, *keys):
+        for k in keys:
+            self.store.pop(k, None)
+
+
+class TestMacdStateCache:
+    def test_round_trip(self):
+        from app.analyzer.macd_incremental import seed_from_closes
+
+        redis = _FakeRedis()
+        state = seed_from_closes([1000.0 + i for i in range(40)], as_of="2026-04-02")
+        scoring_service._save_macd_states(redis, {"7203.T": state})
+        loaded = scoring_service._load_macd_states(redis, ["7203.T", "6758.T"])
+        assert list(loaded) == ["7203.T"]
+        assert loaded["7203.T"]["n"] == 40
+
+    def test_no_redis(self):
+        assert scoring_service._load_macd_states(None, ["7203.T"]) == {}
+        scoring_service._save_macd_states(None, {"7203.T": {}})
+
+
+class TestScoreRow:
+    def test_run_id_is_set_at_construction(self):
+        # commit 前に autoflush されても世代に入る（後から session.new を走査しない）
+        row = scoring_service._score_row(42, symbol="7203.T", data_quality="fetch_error")
+        assert (row.symbol, row.run_id, row.data_quality) == ("7203.T", 42, "fetch_error")
+
+
+class TestSnapshotTradingDay:
+    @pytest.mark.parametrize("day, expected", [
+        ("2026-10-19", True),   # 月曜
+        ("2026-10-17", False),  # 土曜
+        ("2026-12-31", False),  # 年末休場（12/31〜1/3）
+        ("2027-01-04", True),   # 大発会
+    ])
+    def test_is_jpx_trading_day(self, day, expected):
+        from datetime import date
+
+        assert scoring_service._is_jpx_trading_day(date.fromisoformat(day)) is expected
+
+    def test_weekday_national_holiday(self):
+        from datetime import date
+
+        pytest.importorskip("jpholiday")
+        assert scoring_service._is_jpx_trading_day(date(2026, 11, 3)) is False  # 文化の日
+
+    def test_holiday_snapshot_is_not_folded_into_macd_state(self, monkeypatch):
+        from datetime import datetime
+
+        pytest.importorskip("jpholiday")
+
+        class _Holiday(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2026, 11, 3, 18, 0, tzinfo=tz)
+
+        monkeypatch.setattr(scoring_service, "datetime", _Holiday)
+        assert scoring_service._snapshot_trading_day() is None
+
+
+class TestMacdSeed:
+    def test_needs_seed_when_missing_or_interrupted(self):
+        from app.analyzer.macd_incremental import seed_from_closes
+
+        closes = [1000.0 + i for i in range(40)]
+        assert scoring_service._needs_macd_seed(None, "2026-10-20")
+        # 前営業日（月曜から見た金曜）まで積んであれば続きから
+        assert not scoring_service._needs_macd_seed(seed_from_closes(closes, as_of="2026-10-16"), "2026-10-19")
+        assert not scoring_service._needs_macd_seed(seed_from_closes(closes, as_of="2026-10-19"), "2026-10-19")
+        # 1 営業日以上抜けている
+        assert scoring_service._needs_macd_seed(seed_from_closes(closes, as_of="2026-10-15"), "2026-10-19")
+
+    def test_seed_from_stock_prices(self):
+        from datetime import date, timedelta
+
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+
+        from app.analyzer.macd_incremental import seed_from_closes
+        from app.models.stock import Stock
+        from app.models.stock_price import StockPrice
+
+        engine = create_engine("sqlite://")
+        Stock.__table__.create(engine)
+        StockPrice.__table__.create(engine)
+        start = date(2026, 1, 5)
+        closes = [1000.0 + (i % 7) * 3 for i in range(120)]
+        with Session(engine) as session:
+            session.add(Stock(code="7203", name="トヨタ"))
+            for i, close in enumerate(closes):
+                session.add(StockPrice(
+                    stock_code="7203", date=start + timedelta(days=i),
+                    open=close, high=close, low=close, close=close, volume=1,
+                ))
+            session.commit()
+
+            last = start + timedelta(days=len(closes) - 1)
+            # 当日分（trading_day 以降）は snapshot から積むので seed に含めない
+            seeds = scoring_service._load_macd_seeds(session, ["7203.T", "6758.T"], last.isoformat())
+        assert list(seeds) == ["7203.T"]
+        expected = seed_from_closes(closes[:-1], as_of=(last - timedelta(days=1)).isoformat())
+        assert seeds["7203.T"] == expected
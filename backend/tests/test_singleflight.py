@@ -0,0 +1,175 @@
+"""singleflight（キャッシュミス時の取得の合流）のテスト（Redis 不要）"""
+
+import asyncio
+
+import pytest
+
+from app.core import singleflight
+from app.core.singleflight import SingleFlight
+
+
+class _FakeRedis:
+    """SET NX PX / EXISTS / 解放スクリプトだけを持つ Redis の代用"""
+
+    def __init__(self):
+        self.store = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.store)
+
+    async def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get_redis():
+        return redis
+
+    monkeypatch.setattr(singleflight, "get_redis", _get_redis)
+    monkeypatch.setattr(singleflight.settings, "SINGLEFLIGHT_POLL_INTERVAL_SEC", 0.01)
+    monkeypatch.setattr(singleflight.settings, "SINGLEFLIGHT_WAIT_TIMEOUT_SEC", 1.0)
+    return redis
+
+
+def _slow_fetch(calls, value="v", delay=0.05):
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_fetch():
+    flight, calls = SingleFlight("t"), []
+    results = await asyncio.gather(*[flight.do("k", _slow_fetch(calls)) for _ in range(5)])
+    assert len(calls) == 1
+    assert [r for r, _ in results] == ["v"] * 5
+    assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+    assert flight.stats["leader"] == 1 and flight.stats["shared"] == 4
+    # 完了後は次の呼び出しで取り直す
+    await flight.do("k", _slow_fetch(calls, delay=0))
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_all_waiters():
+    flight = SingleFlight("t")
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("fetch failed")
+
+    results = await asyncio.gather(flight.do("k", boom), flight.do("k", boom), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_cancel_fetch():
+    flight, calls = SingleFlight("t"), []
+    leader = asyncio.ensure_future(flight.do("k", _slow_fetch(calls)))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(flight.do("k", _slow_fetch(calls)))
+    await asyncio.sleep(0)
+    leader.cancel()
+    assert await follower == ("v", True)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_remote_lock_holder_result_is_used(fake_redis):
+    flight, calls, cache = SingleFlight("t"), [], {}
+    # 別プロセスがロックを持って取得中
+    fake_redis.store[singleflight.LOCK_KEY_FMT.format(key="k")] = "other"
+
+    async def probe():
+        return cache.get("k")
+
+    async def other_process_finishes():
+        await asyncio.sleep(0.03)
+        cache["k"] = "remote"
+
+    asyncio.ensure_future(other_process_finishes())
+    result, shared = await flight.do("k", _slow_fetch(calls), probe=probe)
+    assert (result, shared) == ("remote", False)
+    assert calls == [] and flight.stats["remote_hit"] == 1
+
+
+@pytest.mark.asyncio
+async def test_remote_failure_falls_back_to_own_fetch(fake_redis):
+    flight, calls = SingleFlight("t"), []
+    lock_key = singleflight.LOCK_KEY_FMT.format(key="k")
+    fake_redis.store[lock_key] = "other"
+
+    async def probe():
+        return None
+
+    async def other_process_gives_up():
+        await asyncio.sleep(0.03)
+        del fake_redis.store[lock_key]
+
+    asyncio.ensure_future(other_process_gives_up())
+    assert await flight.do("k", _slow_fetch(calls, delay=0), probe=probe) == ("v", False)
+    assert len(calls) == 1 and flight.stats["remote_fallback"] == 1
+
+
+@pytest.mark.asyncio
+async def test_lock_is_released_after_fetch(fake_redis):
+    flight, calls = SingleFlight("t"), []
+
+    async def probe():
+        return None
+
+    assert await flight.do("k", _slow_fetch(calls, delay=0), probe=probe) == ("v", False)
+    assert fake_redis.store == {}
+
+
+@pytest.mark.asyncio
+async def test_stock_service_coalesces_price_misses(monkeypatch):
+    from datetime import date, timedelta
+
+    from app.services import stock_service
+    from app.services.stock_service import StockService
+    from app.utils.price_frame import frame_from_rows
+
+    calls = []
+
+    async def _no_cache(self, key):
+        return None
+
+    async def _no_store(self, key, series):
+        return None
+
+    async def _load(self, code, start, end, period=None):
+        calls.append((code, start, end))
+        await asyncio.sleep(0.02)
+        today = date.today()
+        return frame_from_rows([(today - timedelta(days=1), 1, 1, 1, 1.0, 1), (today, 2, 2, 2, 2.0, 2)])
+
+    async def _no_redis():
+        raise ConnectionError("no redis")
+
+    monkeypatch.setattr(StockService, "_get_cached_series", _no_cache)
+    monkeypatch.setattr(StockService, "_set_cached_series", _no_store)
+    monkeypatch.setattr(StockService, "_load_price_frame", _load)
+    monkeypatch.setattr(singleflight, "get_redis", _no_redis)
+    monkeypatch.setattr(stock_service, "_price_flight", SingleFlight("stock_prices"))
+
+    frames = await asyncio.gather(*[StockService(None).get_price_frame("7203", period="1y") for _ in range(3)])
+    assert len(calls) == 1
+    # 返す frame は呼び出しごとに別物（呼び出し側の書き換えが他に波及しない）
+    assert len({id(f) for f in frames}) == 3
+    assert [f["close"].tolist() for f in frames] == [[1.0, 2.0]] * 3
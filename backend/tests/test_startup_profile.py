@@ -0,0 +1,55 @@
+"""起動時間の内訳（startup_profile）と、起動時に重い依存を読み込まないことのテスト"""
+
+import json
+import subprocess
+import sys
+import types
+from pathlib import Path
+
+from app.core import startup_profile
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_phase_records_time_and_new_heavy_imports(monkeypatch):
+    monkeypatch.setattr(startup_profile, "HEAVY_MODULES", ("_fake_heavy_a", "_fake_heavy_b"))
+    monkeypatch.setattr(startup_profile, "_phases", [])
+    monkeypatch.setitem(sys.modules, "_fake_heavy_a", types.ModuleType("_fake_heavy_a"))
+
+    with startup_profile.phase("router:x"):
+        sys.modules["_fake_heavy_b"] = types.ModuleType("_fake_heavy_b")
+    del sys.modules["_fake_heavy_b"]
+
+    (recorded,) = startup_profile.report()["phases"]
+    assert recorded["name"] == "router:x"
+    assert recorded["ms"] >= 0
+    # 区間の前から読み込まれていたものは数えない
+    assert recorded["heavy_imports"] == ["_fake_heavy_b"]
+
+
+def test_mark_ready_logs_breakdown(monkeypatch, caplog):
+    monkeypatch.setattr(startup_profile, "_phases", [{"name": "import:core", "ms": 12.0, "heavy_imports": []}])
+    monkeypatch.setattr(startup_profile, "_ready_ms", None)
+    with caplog.at_level("INFO", logger=startup_profile.__name__):
+        startup_profile.mark_ready()
+    assert startup_profile.report()["ready_ms"] > 0
+    assert "import:core" in caplog.text
+
+
+def test_app_import_does_not_load_heavy_dependencies():
+    """app.main の import（= コールドスタート）で pandas / pandas_ta / yfinance 等を読み込まない"""
+    code = (
+        "import json, sys\n"
+        "import app.main\n"
+        "from app.core import startup_profile\n"
+        "paths = sorted({r.path for r in app.main.app.routes})\n"
+        "print(json.dumps({'heavy': startup_profile.loaded_heavy_modules(), 'paths': paths}))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["heavy"] == []
+    # ルーターは重いサービスを読み込まずに登録されている
+    for path in ("/api/v1/stocks/{code}/prices", "/api/v1/stocks/prices:batch", "/api/v1/chart-analysis/{symbol}/generate"):
+        assert path in result["paths"]
@@ -0,0 +1,234 @@
+"""StockService の正準株価系列（期間ごとのキーを使わず 1 系列から切り出す）のテスト（DB / Redis 不要）"""
+
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from app.core import tiered_cache
+from app.services import stock_service
+from app.services.stock_service import StockService
+from app.utils import price_codec
+from app.utils.price_frame import frame_from_history
+
+CODE = "TEST9"
+SERIES_KEY = f"stock:{CODE}:prices:v3:series"
+
+
+def _bars(start: date, end: date) -> pd.DataFrame:
+    idx = pd.bdate_range(start, end)
+    close = [float(d.toordinal() % 1000) for d in idx]
+    return frame_from_history(pd.DataFrame(
+        {"Open": close, "High": close, "Low": close, "Close": close, "Volume": [100.0] * len(idx)}, index=idx,
+    ))
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get_redis():
+        return redis
+
+    monkeypatch.setattr(tiered_cache, "get_redis_binary", _get_redis)
+    return redis
+
+
+@pytest.fixture
+def loads(monkeypatch, fake_redis):
+    calls = []
+
+    async def _load(self, code, start, end, period=None):
+        calls.append((start, end))
+        return _bars(start, end)
+
+    monkeypatch.setattr(StockService, "_load_price_frame", _load)
+    stock_service._price_cache.local.clear()
+    yield calls
+    stock_service._price_cache.local.clear()
+
+
+@pytest.mark.asyncio
+async def test_periods_are_sliced_from_one_series(loads):
+    service = StockService(None)
+    today = date.today()
+
+    three = await service.get_price_frame(CODE, period="3m")
+    assert loads == [(today - timedelta(days=90), today)]
+
+    one = await service.get_price_frame(CODE, period="1m")
+    assert len(loads) == 1
+    assert one["date"].iloc[0] >= today - timedelta(days=30)
+    assert one["date"].tolist() == three["date"].tolist()[-len(one):]
+
+    # 系列の内側の日付範囲もヒットする
+    custom = await service.get_price_frame(CODE, start_date=today - timedelta(days=60), end_date=today - timedelta(days=40))
+    assert len(loads) == 1
+    assert custom["date"].iloc[0] >= today - timedelta(days=60)
+    assert custom["date"].iloc[-1] <= today - timedelta(days=40)
+
+
+@pytest.mark.asyncio
+async def test_longer_period_fetches_only_older_part(loads, fake_redis):
+    service = StockService(None)
+    today = date.today()
+    await service.get_price_frame(CODE, period="3m")
+    year = await service.get_price_frame(CODE, period="1y")
+    assert loads[1] == (today - timedelta(days=365), today - timedelta(days=91))
+    assert year["date"].tolist() == _bars(today - timedelta(days=365), today)["date"].tolist()
+
+    # Redis に書かれた系列は拡張後の範囲を持つ（他プロセスもこの 1 キーから切り出す）
+    stored = price_codec.decode_series(fake_redis.store[SERIES_KEY])
+    assert stored.covered_from == today - timedelta(days=365)
+    assert stored.frame["date"].tolist() == year["date"].tolist()
+    assert list(fake_redis.store) == [SERIES_KEY]
+
+
+@pytest.mark.asyncio
+async def test_stale_series_fetches_only_recent_bars(loads, monkeypatch):
+    service = StockService(None)
+    today = date.today()
+    await service.get_price_frame(CODE, period="3m")
+    last = (await service._get_cached_series(SERIES_KEY)).frame["date"].iloc[-1]
+
+    monkeypatch.setattr(stock_service.settings, "PRICE_SERIES_REFRESH_SEC", -1.0)
+    await service.get_price_frame(CODE, period="1m")
+    assert loads[1] == (last, today)
+
+    # 過去だけの範囲は直近の鮮度に関係なくヒットする
+    await service.get_price_frame(CODE, start_date=today - timedelta(days=80), end_date=today - timedelta(days=70))
+    assert len(loads) == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_result_is_not_cached(monkeypatch):
+    calls = []
+
+    async def _load(self, code, start, end, period=None):
+        calls.append(1)
+        return _bars(start, start - timedelta(days=1))
+
+    async def _no_redis():
+        raise ConnectionError("no redis")
+
+    monkeypatch.setattr(StockService, "_load_price_frame", _load)
+    monkeypatch.setattr(tiered_cache, "get_redis_binary", _no_redis)
+    service = StockService(None)
+    assert (await service.get_price_frame("NONE9", period="1m")).empty
+    assert (await service.get_price_frame("NONE9", period="1m")).empty
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_historical_range_then_period_returns_recent_bars(loads):
+    service = StockService(None)
+    today = date.today()
+    past = await service.get_price_frame(
+        CODE, start_date=today - timedelta(days=400), end_date=today - timedelta(days=300)
+    )
+    assert past["date"].iloc[-1] <= today - timedelta(days=300)
+    # 系列を作るときは今日まで取得する（refreshed_at 以前のバーは取得済みとみなされるため）
+    assert loads == [(today - timedelta(days=400), today)]
+
+    three = await service.get_price_frame(CODE, period="3m")
+    assert len(loads) == 1
+    assert three["date"].tolist() == _bars(today - timedelta(days=90), today)["date"].tolist()
+
+
+@pytest.mark.asyncio
+async def test_waiter_sees_other_process_write_despite_stale_local(loads, fake_redis, monkeypatch):
+    """ローカルに古い系列があっても、待機中は他プロセスが Redis に書いた系列を拾う"""
+    import asyncio
+
+    from app.core import singleflight
+    from app.core.singleflight import SingleFlight
+    from app.utils.price_frame import PriceSeries
+
+    class _Lock:
+        def __init__(self):
+            self.held = set()
+
+        async def set(self, key, value, nx=False, px=None):
+            if nx and key in self.held:
+                return None
+            self.held.add(key)
+            return True
+
+        async def exists(self, key):
+            return int(key in self.held)
+
+    async def _get_lock():
+        return lock
+
+    lock = _Lock()
+    monkeypatch.setattr(singleflight, "get_redis", _get_lock)
+    monkeypatch.setattr(singleflight.settings, "SINGLEFLIGHT_POLL_INTERVAL_SEC", 0.01)
+    monkeypatch.setattr(singleflight.settings, "SINGLEFLIGHT_WAIT_TIMEOUT_SEC", 1.0)
+    monkeypatch.setattr(stock_service, "_price_flight", SingleFlight("stock_prices"))
+
+    service = StockService(None)
+    today = date.today()
+    await service.get_price_frame(CODE, period="3m")  # ローカルと Redis に 3 か月分
+    assert len(loads) == 1
+
+    # 別プロセスが 1 年分の拡張を取得中（ロック保持）で、終わると Redis だけに書く
+    start = today - timedelta(days=365)
+    lock.held.add(singleflight.LOCK_KEY_FMT.format(key=f"{SERIES_KEY}:{start}:{today}"))
+
+    async def other_process_finishes():
+        await asyncio.sleep(0.03)
+        extended = PriceSeries(frame=_bars(start, today), covered_from=start, refreshed_at=time.time())
+        fake_redis.store[SERIES_KEY] = price_codec.encode_series(extended)
+
+    asyncio.ensure_future(other_process_finishes())
+    year = await service.get_price_frame(CODE, period="1y")
+    assert len(loads) == 1
+    assert stock_service._price_flight.stats["remote_hit"] == 1
+    assert year["date"].iloc[0] >= start and len(year) == len(_bars(start, today))
+    # 拾った系列でローカルも置き換わる
+    assert (await service._get_cached_series(SERIES_KEY)).covered_from == start
+
+
+@pytest.mark.asyncio
+async def test_resampled_cache_follows_series_refresh(loads, fake_redis, monkeypatch):
+    service = StockService(None)
+    weekly = await service.get_resampled_frame(CODE, "1W", period="3m")
+    assert not weekly.empty and len(loads) == 1
+    # 同じ系列のうちは集約結果のキャッシュを使う
+    await service.get_resampled_frame(CODE, "1W", period="3m")
+    resampled = [k for k in fake_redis.store if k.startswith(f"stock:{CODE}:prices:v3:3m:1W:")]
+    assert len(resampled) == 1
+
+    # 直近バーを取り直すと（refreshed_at が変わると）別キーで集約し直す
+    now = time.time()
+    monkeypatch.setattr(stock_service.settings, "PRICE_SERIES_REFRESH_SEC", -1.0)
+    monkeypatch.setattr(stock_service.time, "time", lambda: now + 60)
+    await service.get_resampled_frame(CODE, "1W", period="3m")
+    assert len(loads) == 2
+    assert len([k for k in fake_redis.store if k.startswith(f"stock:{CODE}:prices:v3:3m:1W:")]) == 2
+
+
+@pytest.mark.asyncio
+async def test_chart_daily_analysis_uses_one_year_source(loads):
+    from app.services.chart_analysis_service import ChartAnalysisService
+
+    service = ChartAnalysisService(None)
+    today = date.today()
+    daily = await service._load_frame(CODE, "1D")
+    # 日足は 1 年分だけ取得する（DB の 1 年分で足りる）。週足だけが 5 年分を使う
+    assert loads == [(today - timedelta(days=365), today)]
+    assert daily["date"].iloc[0] >= today - timedelta(days=365)
+    await service._load_frame(CODE, "1W")
+    assert loads[1] == (today - timedelta(days=1825), today - timedelta(days=366))
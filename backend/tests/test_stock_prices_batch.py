@@ -0,0 +1,173 @@
+"""一括株価 API（POST /stocks/prices:batch）のテスト（DB / Redis / 外部 API 不要）"""
+
+import asyncio
+import json
+import time
+from datetime import date, timedelta
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.core import database, tiered_cache
+from app.repositories.stock_repository import StockRepository
+from app.services import stock_service
+from app.services.stock_service import StockService
+from app.utils import price_codec
+from app.utils.price_frame import PriceSeries, frame_from_rows
+
+
+def _rows(days: int = 40) -> list:
+    today = date.today()
+    return [(today - timedelta(days=i), 100.0, 110.0, 90.0, 100.0 + i, 1000) for i in range(days, -1, -1)]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.mgets = []
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        self.mgets.append(list(keys))
+        return [self.store.get(k) for k in keys]
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.fixture
+def env(monkeypatch):
+    redis = _FakeRedis()
+    calls = {"rows": [], "fetch": [], "active": 0, "max_active": 0, "sessions": 0}
+
+    async def _get_redis():
+        return redis
+
+    class _Session:
+        async def __aenter__(self):
+            calls["sessions"] += 1
+            return None
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def _rows_many(self, codes, start, end):
+        calls["rows"].append(list(codes))
+        return {"A1": _rows()}
+
+    async def _names(self, codes):
+        return {"A1": "銘柄A"}
+
+    async def _fetch(self, code, start, end, period=None):
+        calls["fetch"].append(code)
+        calls["active"] += 1
+        calls["max_active"] = max(calls["max_active"], calls["active"])
+        await asyncio.sleep(0.02)
+        calls["active"] -= 1
+        return frame_from_rows([] if code == "ZZ" else _rows())
+
+    monkeypatch.setattr(database, "AsyncSessionLocal", _Session)
+    monkeypatch.setattr(tiered_cache, "get_redis", _get_redis)
+    monkeypatch.setattr(tiered_cache, "get_redis_binary", _get_redis)
+    monkeypatch.setattr(StockRepository, "get_price_rows_many", _rows_many)
+    monkeypatch.setattr(StockRepository, "get_names", _names)
+    monkeypatch.setattr(StockService, "_fetch_price_frame", _fetch)
+    monkeypatch.setattr(stock_service.settings, "PRICES_BATCH_CONCURRENCY", 2)
+    stock_service._price_cache.local.clear()
+    stock_service._info_cache.local.clear()
+
+    # C3 は正準系列がキャッシュ済み
+    cached = PriceSeries(
+        frame=frame_from_rows(_rows(400)), covered_from=date.today() - timedelta(days=400), refreshed_at=time.time()
+    )
+    redis.store["stock:C3:prices:v3:series"] = price_codec.encode_series(cached)
+    yield redis, calls
+    stock_service._price_cache.local.clear()
+    stock_service._info_cache.local.clear()
+
+
+def _client():
+    from app.api.v1.stocks import router
+
+    app = FastAPI()
+    app.include_router(router, prefix="/stocks")
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_batch_streams_cache_db_then_remote(env):
+    redis, calls = env
+    codes = ["C3", "A1", "B2", "D4", "ZZ", "A1"]
+    async with _client() as client:
+        response = await client.post("/stocks/prices:batch", json={"codes": codes, "period": "1m"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    # 重複は 1 行、キャッシュ → DB の順に先に返る
+    assert [line["stock_code"] for line in lines[:2]] == ["C3", "A1"]
+    assert sorted(line["stock_code"] for line in lines[2:]) == ["B2", "D4", "ZZ"]
+    by_code = {line["stock_code"]: line for line in lines}
+    assert by_code["A1"]["stock_name"] == "銘柄A"
+    assert by_code["B2"]["stock_name"] == "B2"
+    assert by_code["A1"]["period"] == "1m"
+    assert by_code["A1"]["prices"][0]["date"] >= (date.today() - timedelta(days=30)).isoformat()
+    assert by_code["ZZ"]["error"]["status_code"] == 404
+    # ストリーム生成中に使うセッションはハンドラの外（generator 内）で 1 つ開く
+    assert calls["sessions"] == 1
+
+    # キャッシュは 1 回の MGET、DB は 1 クエリ、外部 API は同時数の上限内で並行
+    unique = ["C3", "A1", "B2", "D4", "ZZ"]
+    assert redis.mgets[:2] == [[f"stock:{c}:info:v2" for c in unique], [f"stock:{c}:prices:v3:series" for c in unique]]
+    assert calls["rows"] == [["A1", "B2", "D4", "ZZ"]]
+    assert sorted(calls["fetch"]) == ["B2", "D4", "ZZ"]
+    assert calls["max_active"] == 2
+
+    # 取得した系列は単一銘柄の API と同じキーに載る
+    assert "stock:B2:prices:v3:series" in redis.store
+    assert "stock:ZZ:prices:v3:series" not in redis.store
+
+
+@pytest.mark.asyncio
+async def test_closing_the_stream_cancels_pending_fetches(env, monkeypatch):
+    """クライアント切断（generator を閉じる）で、まだ始まっていない外部取得は走らない"""
+    _, calls = env
+    monkeypatch.setattr(stock_service.settings, "PRICES_BATCH_CONCURRENCY", 1)
+    codes = [f"R{i}" for i in range(6)]
+    frames = StockService(None).iter_price_frames(codes, period="1m")
+    code, frame, error = await frames.__anext__()
+    assert error is None and code in codes
+    await frames.aclose()
+    await asyncio.sleep(0.1)
+    # 1 本目と、閉じる時点で走っていた 1 本だけ
+    assert len(calls["fetch"]) == 2
+    assert calls["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_invalid_requests_up_front(env):
+    _, calls = env
+    too_many = [f"C{i}" for i in range(stock_service.settings.PRICES_BATCH_MAX_CODES + 1)]
+    async with _client() as client:
+        responses = [
+            await client.post("/stocks/prices:batch", json={"codes": too_many}),
+            await client.post("/stocks/prices:batch", json={"codes": []}),
+            await client.post("/stocks/prices:batch", json={"codes": ["A1", "B2"], "period": "7y"}),
+        ]
+    assert [r.status_code for r in responses] == [422, 422, 422]
+    # 銘柄ごとのエラー行にはならず、取得も始まらない
+    assert calls["sessions"] == 0 and calls["fetch"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_many_uses_local_tier_first(env):
+    redis, _ = env
+    cache = tiered_cache.TieredCache("test_get_many", local_maxsize=8, local_ttl=30)
+    redis.store.update({"a": "1", "b": "2"})
+    assert await cache.get_many(["a", "b", "c"], int) == {"a": 1, "b": 2}
+    assert await cache.get_many(["a", "b", "c"], int) == {"a": 1, "b": 2}
+    assert redis.mgets[-2:] == [["a", "b", "c"], ["c"]]
+    assert cache.stats()["redis"] == {"hits": 2, "misses": 2, "errors": 0, "hit_ratio": 0.5}
@@ -0,0 +1,91 @@
+"""StockRepository の一括 upsert のテスト（DB 不要、発行文を数える）"""
+
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.repositories import stock_repository as repo_mod
+from app.repositories.stock_repository import StockRepository
+from app.schemas.stock import StockInfo
+
+
+class _FakeResult:
+    def __init__(self, obj=None):
+        self.obj = obj
+
+    def scalar_one(self):
+        return self.obj
+
+
+class _FakeDb:
+    def __init__(self):
+        self.stmts = []
+        self.commits = 0
+
+    async def execute(self, stmt):
+        self.stmts.append(stmt)
+        return _FakeResult(SimpleNamespace(code="7203"))
+
+    async def commit(self):
+        self.commits += 1
+
+    async def refresh(self, obj):  # pragma: no cover - 呼ばれないことを確認する
+        raise AssertionError("refresh should not be called")
+
+
+def _bars(n, start=date(2024, 1, 1)):
+    return [
+        SimpleNamespace(date=start + timedelta(days=i), open=100.0, high=101.0, low=99.0, close=100.5, volume=1000.0)
+        for i in range(n)
+    ]
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+
+class TestSavePrices:
+    @pytest.mark.asyncio
+    async def test_one_year_is_one_statement(self):
+        db = _FakeDb()
+        saved = await StockRepository(db).save_prices("7203", _bars(250))
+        assert saved == 250
+        assert len(db.stmts) == 1 and db.commits == 1
+        sql = _sql(db.stmts[0])
+        assert "ON CONFLICT (stock_code, date) DO UPDATE" in sql
+        assert "IS DISTINCT FROM excluded.close" in sql
+
+    @pytest.mark.asyncio
+    async def test_batches_large_inputs(self, monkeypatch):
+        monkeypatch.setattr(repo_mod, "PRICE_UPSERT_BATCH_SIZE", 100)
+        db = _FakeDb()
+        assert await StockRepository(db).save_prices("7203", _bars(250)) == 250
+        assert len(db.stmts) == 3 and db.commits == 1
+
+    @pytest.mark.asyncio
+    async def test_duplicate_dates_last_wins(self):
+        db = _FakeDb()
+        bars = _bars(2)
+        bars.append(SimpleNamespace(date=bars[0].date, open=1, high=1, low=1, close=7, volume=5))
+        assert await StockRepository(db).save_prices("7203", bars) == 2
+        params = db.stmts[0].compile(dialect=postgresql.dialect()).params
+        assert str(params["close_m0"]) == "7"
+
+    @pytest.mark.asyncio
+    async def test_empty_is_noop(self):
+        db = _FakeDb()
+        assert await StockRepository(db).save_prices("7203", []) == 0
+        assert db.stmts == [] and db.commits == 0
+
+
+class TestCreateOrUpdate:
+    @pytest.mark.asyncio
+    async def test_single_upsert_returning(self):
+        db = _FakeDb()
+        stock = await StockRepository(db).create_or_update(StockInfo(code="7203", name="トヨタ自動車"))
+        assert stock.code == "7203"
+        assert len(db.stmts) == 1 and db.commits == 1
+        sql = _sql(db.stmts[0])
+        assert "ON CONFLICT (code) DO UPDATE" in sql and "RETURNING" in sql
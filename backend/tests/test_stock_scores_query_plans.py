@@ -0,0 +1,94 @@
+"""stock_scores / latest_stock_scores のホットクエリが Seq Scan に落ちないことを EXPLAIN で確認する
+
+migration 012 まで適用済みの PostgreSQL（settings.DATABASE_URL）が必要。接続できない、
+または stock_scores がパーティション化されていない場合は skip する。
+
+テーブルが小さいとプランナは索引があっても Seq Scan を選ぶため、
+`enable_seqscan = off` で「使える索引が存在するか」を判定する（索引が無ければ
+それでも Seq Scan になる）。
+"""
+
+import pytest
+from sqlalchemy import create_engine, desc, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.core.config import settings
+from app.models.stock_score import StockScore
+
+SYMBOL = "7203.T"
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+HOT_QUERIES = {
+    # score_service.get_score / stock_service
+    "latest_for_symbol": _sql(
+        select(StockScore).where(StockScore.symbol == SYMBOL).order_by(desc(StockScore.scored_at)).limit(1)
+    ),
+    "latest_valid_for_symbol": _sql(
+        select(StockScore)
+        .where(StockScore.symbol == SYMBOL)
+        .where(StockScore.data_quality.notin_(["fetch_error", "missing_tv"]))
+        .order_by(desc(StockScore.scored_at))
+        .limit(1)
+    ),
+    # scoring_run_service.latest_publish_stmt（公開時に世代の行だけを読む）
+    "rows_for_run": (
+        "SELECT DISTINCT ON (symbol) symbol, total_score FROM stock_scores "
+        "WHERE run_id = 1 ORDER BY symbol, scored_at DESC, id DESC"
+    ),
+    # score_service.list_scores の 2 ページ目以降（キーセット + フィルタ）
+    "scores_page_after_cursor": (
+        "SELECT symbol FROM latest_stock_scores "
+        "WHERE data_quality NOT IN ('fetch_error', 'missing_tv') AND total_score IS NOT NULL "
+        "AND (total_score < 60 OR (total_score = 60 AND symbol > '7203.T')) "
+        "ORDER BY total_score DESC, symbol ASC LIMIT 100"
+    ),
+    "history_for_symbol": (
+        "SELECT scored_at, total_score FROM stock_scores "
+        f"WHERE symbol = '{SYMBOL}' AND scored_at >= now() - interval '90 days' "
+        "ORDER BY scored_at DESC"
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def sync_conn():
+    engine = create_engine(
+        settings.DATABASE_URL.replace("+asyncpg", "+psycopg2"),
+        connect_args={"connect_timeout": 2},
+    )
+    try:
+        conn = engine.connect()
+    except Exception as e:
+        pytest.skip(f"PostgreSQL に接続できません: {e}")
+    relkind = conn.execute(
+        text("SELECT relkind FROM pg_class WHERE relname = 'stock_scores'")
+    ).scalar()
+    if relkind != "p":
+        conn.close()
+        pytest.skip("stock_scores が未パーティション（migration 010 未適用）")
+    yield conn
+    conn.close()
+    engine.dispose()
+
+
+def _seq_scans(plan: dict) -> list:
+    found = []
+    relation = plan.get("Relation Name", "")
+    if plan.get("Node Type") == "Seq Scan" and relation.startswith(("stock_scores", "latest_stock_scores")):
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found.extend(_seq_scans(child))
+    return found
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_uses_index(sync_conn, name):
+    with sync_conn.begin():
+        sync_conn.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = sync_conn.execute(text(f"EXPLAIN (FORMAT JSON) {HOT_QUERIES[name]}")).scalar()
+    root = plan[0]["Plan"]
+    assert _seq_scans(root) == [], f"{name} が Seq Scan: {root}"
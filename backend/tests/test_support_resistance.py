@@ -0,0 +1,93 @@
+"""support_resistance（ピボット検出・水準クラスタリング）のユニットテスト"""
+
+import numpy as np
+import pytest
+
+from app.utils import support_resistance as sr
+
+
+def _brute_pivots(high, low, k):
+    highs, lows = [], []
+    for i in range(k, len(high) - k):
+        if high[i] >= max(high[i - k:i + k + 1]):
+            highs.append(i)
+        if low[i] <= min(low[i - k:i + k + 1]):
+            lows.append(i)
+    return highs, lows
+
+
+class TestRollingExtrema:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed):
+        rng = np.random.default_rng(seed)
+        values = rng.normal(100, 5, 300)
+        window = 7
+        mins, maxs = sr.rolling_extrema(values, window)
+        for i in range(len(values)):
+            lo = max(0, i - window + 1)
+            assert mins[i] == values[lo:i + 1].min()
+            assert maxs[i] == values[lo:i + 1].max()
+
+
+class TestFindPivots:
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed):
+        rng = np.random.default_rng(seed)
+        close = 1000 * np.exp(np.cumsum(rng.normal(0, 0.02, 250)))
+        high, low = close * 1.01, close * 0.99
+        pivot_high, pivot_low = sr.find_pivots(high, low, width=5)
+        expected_high, expected_low = _brute_pivots(high, low, 5)
+        assert pivot_high.tolist() == expected_high
+        assert pivot_low.tolist() == expected_low
+
+    def test_too_short(self):
+        pivot_high, pivot_low = sr.find_pivots([1.0] * 5, [1.0] * 5, width=5)
+        assert len(pivot_high) == 0 and len(pivot_low) == 0
+
+
+class TestClusterLevels:
+    def test_nearby_prices_merge(self):
+        levels = sr.cluster_levels([100.0, 100.5, 101.0, 120.0], tolerance=0.015)
+        assert len(levels) == 2
+        assert levels[0]["touches"] == 3.0
+        assert levels[0]["level"] == pytest.approx(100.5)
+        assert levels[1] == {"level": 120.0, "touches": 1.0}
+
+    def test_ignores_invalid(self):
+        assert sr.cluster_levels([0.0, float("nan"), -1.0]) == []
+
+    def test_trending_series_is_not_chained_into_one_level(self):
+        # 1.2% 刻みの上昇: 隣同士は tolerance 内だが、全体を 1 本にまとめてはいけない
+        prices = [100 * 1.012 ** i for i in range(40)]
+        levels = sr.cluster_levels(prices, tolerance=0.015)
+        assert len(levels) >= 20
+        for lv in levels:
+            assert lv["touches"] <= 2.0
+        assert sum(lv["touches"] for lv in levels) == 40.0
+
+
+class TestSupportResistanceLevels:
+    def _range_bound(self):
+        # 100〜120 のレンジを 3 往復し、最後は 110 付近
+        leg = np.concatenate([np.linspace(100, 120, 10), np.linspace(120, 100, 10)])
+        close = np.concatenate([leg, leg, leg, np.linspace(100, 110, 6)])
+        return close + 0.5, close - 0.5, close
+
+    def test_levels_bracket_current_price(self):
+        high, low, close = self._range_bound()
+        levels = sr.support_resistance_levels(high, low, close, width=3)
+        assert levels["support"] == pytest.approx(99.5, abs=1.0)
+        assert levels["resistance"] == pytest.approx(120.5, abs=1.0)
+        assert levels["support_touches"] >= 2
+        assert levels["resistance_touches"] >= 2
+        assert levels["support"] <= close[-1] < levels["resistance"]
+
+    def test_fallback_when_no_level_above(self):
+        close = np.linspace(100, 200, 60)  # 単調上昇: 上側のピボットなし
+        levels = sr.support_resistance_levels(close + 1, close - 1, close, width=3)
+        assert levels["resistance"] == pytest.approx(201.0)
+        assert levels["resistance_touches"] == 0.0
+
+    def test_empty(self):
+        levels = sr.support_resistance_levels([], [], [])
+        assert levels["support"] == 0.0 and levels["resistances"] == []
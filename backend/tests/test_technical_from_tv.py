@@ -96,3 +96,26 @@ class TestCalcTechnicalScoreFromTv:
         assert result["rsi_score"] == 8.0
         assert result["macd_score"] == 3.0
         assert result["technical_score"] == 17.0
+
+
+class TestCalcTechnicalScoreWithMacdFlags:
+    @pytest.mark.parametrize(
+        "flags,expected",
+        [
+            ((True, True), 15.0),
+            ((False, True), 8.0),
+            ((True, False), 0.0),
+            ((False, False), 3.0),
+        ],
+    )
+    def test_cross_semantics_restored(self, flags, expected):
+        result = calc_technical_score_from_tv(
+            {"close": 1100, "sma25": 1000, "sma75": 900, "rsi": 25, "macd": 10, "macd_signal": 5},
+            macd_flags=flags,
+        )
+        assert result["macd_score"] == expected
+        assert result["technical_score"] == 35.0 + expected
+
+    def test_none_flags_falls_back_to_snapshot(self):
+        result = calc_technical_score_from_tv({"macd": 10, "macd_signal": 5}, macd_flags=None)
+        assert result["macd_score"] == 8.0
@@ -0,0 +1,166 @@
+"""2 段キャッシュ（プロセス内 LRU → Redis）のテスト（Redis 不要）"""
+
+import json
+
+import pytest
+
+from app.core import tiered_cache
+from app.core.tiered_cache import LocalLRU, TieredCache, cache_stats
+
+
+class _FakeRedis:
+    """GET / SETEX だけを持つ Redis の代用（decode_responses=True 相当で str を返す）"""
+
+    def __init__(self):
+        self.store = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+
+    async def _get_redis():
+        return redis
+
+    monkeypatch.setattr(tiered_cache, "get_redis", _get_redis)
+    monkeypatch.setattr(tiered_cache, "get_redis_binary", _get_redis)
+    return redis
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(tiered_cache.time, "monotonic", clock)
+    return clock
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LocalLRU(maxsize=2, ttl=60)
+    lru.set("a", 1)
+    lru.set("b", 2)
+    assert lru.get("a") == 1  # a を最近使った側にする
+    lru.set("c", 3)
+    assert lru.get("b") is None
+    assert lru.get("a") == 1 and lru.get("c") == 3
+    assert len(lru) == 2
+
+
+def test_lru_ttl_is_capped_by_local_ttl(clock):
+    lru = LocalLRU(maxsize=10, ttl=30)
+    lru.set("long", 1, ttl=3600)
+    lru.set("short", 2, ttl=5)
+    clock.now += 10
+    assert lru.get("short") is None
+    assert lru.get("long") == 1
+    clock.now += 25
+    assert lru.get("long") is None
+    assert len(lru) == 0
+
+
+def test_lru_disabled_with_zero_maxsize():
+    lru = LocalLRU(maxsize=0, ttl=30)
+    lru.set("a", 1)
+    assert lru.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_hit_is_decoded_once_then_served_locally(fake_redis):
+    cache = TieredCache("test_redis_hit", local_maxsize=8, local_ttl=30)
+    fake_redis.store["k"] = json.dumps({"v": 1})
+    decoded = []
+
+    def decode(raw):
+        decoded.append(raw)
+        return json.loads(raw)
+
+    assert await cache.get("k", decode) == {"v": 1}
+    assert await cache.get("k", decode) == {"v": 1}
+    assert len(decoded) == 1
+    assert fake_redis.gets == 1
+
+    stats = cache.stats()
+    assert stats["local"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5, "size": 1, "maxsize": 8, "ttl_sec": 30}
+    assert stats["redis"] == {"hits": 1, "misses": 0, "errors": 0, "hit_ratio": 1.0}
+    assert cache_stats()["test_redis_hit"] == stats
+
+
+@pytest.mark.asyncio
+async def test_local_hit_returns_copy(fake_redis):
+    cache = TieredCache("test_copy", local_maxsize=8, local_ttl=30)
+    value = {"v": [1, 2]}
+    await cache.set("k", value, json.dumps, ttl=60)
+
+    got = await cache.get("k", json.loads, copy=lambda v: {"v": list(v["v"])})
+    got["v"].append(3)
+    again = await cache.get("k", json.loads, copy=lambda v: {"v": list(v["v"])})
+    assert again == {"v": [1, 2]}
+    assert fake_redis.store["k"] == json.dumps(value)
+    assert fake_redis.gets == 0
+
+
+@pytest.mark.asyncio
+async def test_miss_and_undecodable_value(fake_redis):
+    cache = TieredCache("test_miss", local_maxsize=8, local_ttl=30)
+    fake_redis.store["bad"] = "not json"
+    assert await cache.get("none", json.loads) is None
+    assert await cache.get("bad", json.loads) is None
+    assert cache.stats()["redis"]["misses"] == 2
+    assert len(cache.local) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_unavailable_still_uses_local(monkeypatch):
+    async def _no_redis():
+        raise ConnectionError("no redis")
+
+    monkeypatch.setattr(tiered_cache, "get_redis", _no_redis)
+    cache = TieredCache("test_no_redis", local_maxsize=8, local_ttl=30)
+    assert await cache.get("k", json.loads) is None
+    await cache.set("k", {"v": 1}, json.dumps, ttl=60)
+    assert await cache.get("k", json.loads) == {"v": 1}
+    assert cache.stats()["redis"]["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stock_service_frame_cache_round_trip(fake_redis):
+    from datetime import date
+
+    from app.services import stock_service
+    from app.services.stock_service import StockService
+    from app.utils.price_frame import frame_from_rows
+
+    service = StockService(None)
+    stock_service._price_cache.local.clear()
+    frame = frame_from_rows(
+        [(date(2026, 10, 15), 1.0, 1.5, 0.5, 1.2, 100), (date(2026, 10, 16), 2.0, 2.5, 1.5, 2.2, 200)]
+    )
+    await service._set_cached_frame("stock:test:prices", frame)
+    frame.loc[frame.index[0], "close"] = 99.0  # 保存後の書き換えはキャッシュに波及しない
+
+    local = await service._get_cached_frame("stock:test:prices")
+    assert local["close"].tolist() == [1.2, 2.2]
+    local.loc[local.index[1], "close"] = 99.0
+    assert (await service._get_cached_frame("stock:test:prices"))["close"].tolist() == [1.2, 2.2]
+
+    # 他プロセス相当: ローカルが空なら Redis のバイナリからデコードする
+    stock_service._price_cache.local.clear()
+    assert isinstance(fake_redis.store["stock:test:prices"], bytes)
+    from_redis = await service._get_cached_frame("stock:test:prices")
+    assert from_redis["close"].tolist() == [1.2, 2.2]
+    stock_service._price_cache.local.clear()
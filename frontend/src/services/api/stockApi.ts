@@ -3,7 +3,7 @@
  */
 
 import { apiClient } from '@/lib/apiClient';
-import type { StockInfo, StockPriceResponse } from '@/types/stock';
+import type { StockInfo, StockPriceBatchItem, StockPriceResponse } from '@/types/stock';
 
 export const stockApi = {
   /**
@@ -29,4 +29,22 @@ export const stockApi = {
     );
     return response.data;
   },
+
+  /**
+   * 複数銘柄の株価データを一括取得（NDJSON を銘柄ごとの結果に分解する）
+   */
+  async getPricesBatch(
+    codes: string[],
+    period: string = '1y'
+  ): Promise<StockPriceBatchItem[]> {
+    const response = await apiClient.post<string>(
+      '/stocks/prices:batch',
+      { codes, period },
+      { responseType: 'text', transformResponse: (data) => data }
+    );
+    return response.data
+      .split('\n')
+      .filter((line) => line.trim() !== '')
+      .map((line) => JSON.parse(line) as StockPriceBatchItem);
+  },
 };
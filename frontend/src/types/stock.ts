@@ -27,3 +27,10 @@ export interface StockPriceResponse {
   period: string;
   prices: StockPriceData[];
 }
+
+export interface StockPriceBatchError {
+  stock_code: string;
+  error: { status_code: number; detail: string };
+}
+
+export type StockPriceBatchItem = StockPriceResponse | StockPriceBatchError;